@@ -0,0 +1,190 @@
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.aggregates import cached_for_frame, get_aggregates
+
+# ---------------------------------------------
+# CHART REGISTRY (chart name -> plot function, input frame, input kind)
+# "agg" charts only need the frame's small get_aggregates() result, so the
+# frame itself is never shipped to the render worker for them.
+# ---------------------------------------------
+CHART_JOBS = {
+    "1_clean_daily_profile.png": ("plot_clean_daily_profile", "past", "agg"),
+    "2_clean_peak_distribution.png": ("plot_clean_peak_distribution", "past", "agg"),
+    "3_clean_full_pattern.png": ("plot_clean_full_pattern", "past", "raw"),
+    "4_clean_temp_correlation.png": ("plot_clean_temp_correlation", "past", "agg"),
+    "5_clean_heatmap.png": ("plot_clean_heatmap", "past", "agg"),
+    "6_pred_daily_profile.png": ("plot_pred_daily_profile", "future", "agg"),
+    "7_pred_peak_distribution.png": ("plot_pred_peak_distribution", "future", "agg"),
+    "8_pred_full_forecast.png": ("plot_pred_full_forecast", "future", "raw"),
+    "9_pred_temp_forecast.png": ("plot_pred_temp_forecast", "future", "raw"),
+    "10_pred_heatmap.png": ("plot_pred_heatmap", "future", "agg"),
+}
+USAGE_COLUMNS = {"past": "usage_kwh", "future": "predicted_usage_kwh"}
+
+MAX_WORKERS = 4
+MAX_CACHED_CHARTS = 24  # Per session; ~60 KB each, so a few MB at most
+
+_POOL = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _init_worker():
+    """
+    Runs once per worker: select the non-interactive Agg backend before
+    pyplot is imported, and pay the matplotlib/seaborn import cost up front.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from analysis import visualization
+
+    visualization.setup_plotting()
+
+
+def _render(func_name, df, agg=None):
+    """
+    Draws one chart in the current process and returns its PNG bytes.
+    """
+    from analysis import visualization as viz
+
+    if agg is not None:
+        return getattr(viz, func_name)(None, agg=agg)
+    return getattr(viz, func_name)(df)
+
+
+def _shutdown_pool():
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pool)
+
+
+def get_pool(n_workers=None):
+    """
+    One render pool per server process, kept warm across Streamlit reruns.
+    'spawn' avoids forking the multi-threaded Streamlit server.
+    """
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL_SIZE = n_workers or min(MAX_WORKERS, os.cpu_count() or 1)
+            _POOL = ProcessPoolExecutor(
+                max_workers=_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _POOL
+
+
+def _discard_pool(pool):
+    """
+    Drops a broken pool (a worker died), so the next get_pool() starts fresh.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args):
+    """
+    Submits to the render pool, rebuilding it once if it is broken. If that
+    fails too, returns a future holding the error instead of raising.
+    """
+    for _ in range(2):
+        pool = get_pool()
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool as e:
+            _discard_pool(pool)
+            error = e
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+def warm_up():
+    """
+    Starts the workers in the background (e.g. while the user picks a file),
+    so the first chart does not wait for matplotlib imports.
+    """
+    get_pool()
+    return [_submit(os.getpid) for _ in range(_POOL_SIZE)]
+
+
+def data_fingerprint(df):
+    """
+    Content hash of a frame (values, index and column names), so a chart is
+    re-rendered only when the data behind it actually changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update("|".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+def new_chart_cache():
+    """
+    Per-session LRU of (data fingerprint, chart name) -> Future[PNG bytes].
+    Keep one in st.session_state so sessions never see each other's charts.
+    """
+    return OrderedDict()
+
+
+def request_chart(cache, chart_name, past_df, future_df, parallel=True):
+    """
+    Returns a Future of the chart's PNG bytes, rendering it only on the first
+    request for this data. In-flight renders are shared, failed ones retried.
+    With parallel=False the chart is drawn right here and the future is done.
+    """
+    func_name, source, kind = CHART_JOBS[chart_name]
+    df = past_df if source == "past" else future_df
+    fingerprint = cached_for_frame(df, "fingerprint", lambda: data_fingerprint(df))
+    key = (fingerprint, chart_name)
+
+    future = cache.get(key)
+    if future is not None and not (future.done() and future.exception()):
+        cache.move_to_end(key)
+        return future
+
+    if kind == "raw":
+        args = (func_name, df)
+    else:
+        args = (func_name, None, get_aggregates(df, USAGE_COLUMNS[source]))
+
+    if parallel:
+        future = _submit(_render, *args)
+    else:
+        future = Future()
+        try:
+            future.set_result(_render(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    cache[key] = future
+    while len(cache) > MAX_CACHED_CHARTS:
+        cache.popitem(last=False)
+    return future
+
+
+def chart_png(future, timeout=None):
+    """
+    Waits for a rendered chart. Returns its PNG bytes, or None if rendering failed.
+    """
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:
+        print(f"⚠️ Chart rendering failed: {e}")
+        return None
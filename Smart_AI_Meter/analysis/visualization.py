@@ -1,55 +1,71 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import os
+import io
+
+from src.aggregates import get_aggregates
+from src.downsample import MAX_PLOT_POINTS, downsample_positions
 
 # ---------------------------------------------
 # GLOBAL CONFIG
 # ---------------------------------------------
-os.makedirs("graphs", exist_ok=True)
-
-sns.set_theme(style="whitegrid", context="paper")
-plt.rcParams["figure.autolayout"] = False
+# matplotlib/seaborn load on the first chart (see setup_plotting), so
+# importing this module costs nothing at app start.
+plt = None
+sns = None
 
 FIG_STD = (5, 3)
 FIG_WIDE = (6, 3)
 FIG_HEAT = (6, 4)
 DPI = 120
 
-PEAK_START = 7
-PEAK_END = 19
+
+def setup_plotting():
+    """
+    Imports pyplot and seaborn and applies the shared theme, once per process.
+    """
+    global plt, sns
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        import seaborn
+
+        seaborn.set_theme(style="whitegrid", context="paper")
+        pyplot.rcParams["figure.autolayout"] = False
+        plt, sns = pyplot, seaborn
 
 
 def save_plot(name):
     """
-    Saves the current matplotlib figure to the graphs directory
-    and closes it to free memory.
+    Renders the current matplotlib figure to in-memory PNG bytes and closes
+    it to free memory. Nothing is written to disk, so sessions never share
+    files; `name` is kept as the chart's identifier.
     """
     plt.tight_layout()
-    plt.savefig(f"graphs/{name}", dpi=DPI, bbox_inches="tight")
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format="png", dpi=DPI, bbox_inches="tight")
     plt.close()
+    return buffer.getvalue()
 
 
 # ---------------------------------------------
 # HISTORICAL DATA PLOTS
 # ---------------------------------------------
-def plot_clean_daily_profile(df):
-    avg = df.groupby("hour")["usage_kwh"].mean()
+# Aggregate-based plots take the frame or, when already computed,
+# its get_aggregates() result (then df may be None).
+def plot_clean_daily_profile(df, agg=None):
+    setup_plotting()
+    agg = agg or get_aggregates(df, "usage_kwh")
+    avg = agg["hourly"]["usage_kwh"]
     plt.figure(figsize=FIG_STD)
     plt.plot(avg.index, avg.values, color="#1f77b4", linewidth=2)
     plt.title("Average Daily Load Profile")
     plt.xlabel("Hour of Day")
     plt.ylabel("Avg Usage (kWh)")
     plt.xticks(range(0, 24, 3))
-    save_plot("1_clean_daily_profile.png")
+    return save_plot("1_clean_daily_profile.png")
 
 
-def plot_clean_peak_distribution(df):
-    df = df.copy()
-    df["period"] = df["hour"].apply(
-        lambda h: "Peak" if PEAK_START <= h < PEAK_END else "Off-Peak"
-    )
-    usage = df.groupby("period")["usage_kwh"].sum()
+def plot_clean_peak_distribution(df, agg=None):
+    setup_plotting()
+    agg = agg or get_aggregates(df, "usage_kwh")
+    usage = agg["peak"]
 
     plt.figure(figsize=(4, 4))
     plt.pie(
@@ -61,20 +77,25 @@ def plot_clean_peak_distribution(df):
         wedgeprops=dict(width=0.35),
     )
     plt.title("Energy Usage Distribution")
-    save_plot("2_clean_peak_distribution.png")
+    return save_plot("2_clean_peak_distribution.png")
 
 
-def plot_clean_full_pattern(df):
+def plot_clean_full_pattern(df, max_points=MAX_PLOT_POINTS):
+    setup_plotting()
+    # Long histories are LTTB-downsampled: same peaks, a fraction of the points
+    x, y = downsample_positions(df["usage_kwh"].to_numpy(), max_points)
     plt.figure(figsize=FIG_WIDE)
-    plt.plot(range(len(df)), df["usage_kwh"], linewidth=1, color="#2ca02c")
+    plt.plot(x, y, linewidth=1, color="#2ca02c")
     plt.title("Full Usage Pattern (Relative Time)")
     plt.xlabel("Time Index")
     plt.ylabel("Usage (kWh)")
-    save_plot("3_clean_full_pattern.png")
+    return save_plot("3_clean_full_pattern.png")
 
 
-def plot_clean_temp_correlation(df):
-    avg = df.groupby("hour")[["usage_kwh", "temperature_c"]].mean()
+def plot_clean_temp_correlation(df, agg=None):
+    setup_plotting()
+    agg = agg or get_aggregates(df, "usage_kwh")
+    avg = agg["hourly"]
 
     fig, ax1 = plt.subplots(figsize=FIG_STD)
     ax1.plot(avg.index, avg["usage_kwh"], color="#1f77b4", linewidth=2)
@@ -89,18 +110,14 @@ def plot_clean_temp_correlation(df):
 
     plt.title("Temperature vs Energy Usage")
     plt.xticks(range(0, 24, 3))
-    save_plot("4_clean_temp_correlation.png")
+    return save_plot("4_clean_temp_correlation.png")
 
 
-def plot_clean_heatmap(df):
+def plot_clean_heatmap(df, agg=None):
+    setup_plotting()
     # Pivot table: Day of Month x Hour
-    pivot = (
-        df.pivot_table(
-            index="day_of_month", columns="hour", values="usage_kwh", aggfunc="mean"
-        )
-        .sort_index()
-        .fillna(0)
-    )
+    agg = agg or get_aggregates(df, "usage_kwh")
+    pivot = agg["heat_month"].fillna(0)
 
     plt.figure(figsize=FIG_HEAT)
     sns.heatmap(
@@ -113,29 +130,29 @@ def plot_clean_heatmap(df):
     plt.title("Usage Intensity Heatmap")
     plt.xlabel("Hour")
     plt.ylabel("Day of Month")
-    save_plot("5_clean_heatmap.png")
+    return save_plot("5_clean_heatmap.png")
 
 
 # ---------------------------------------------
 # PREDICTED DATA PLOTS
 # ---------------------------------------------
-def plot_pred_daily_profile(df):
-    avg = df.groupby("hour")["predicted_usage_kwh"].mean()
+def plot_pred_daily_profile(df, agg=None):
+    setup_plotting()
+    agg = agg or get_aggregates(df, "predicted_usage_kwh")
+    avg = agg["hourly"]["predicted_usage_kwh"]
     plt.figure(figsize=FIG_STD)
     plt.plot(avg.index, avg.values, color="#ff7f0e", linewidth=2)
     plt.title("Predicted Daily Profile")
     plt.xlabel("Hour")
     plt.ylabel("Predicted Usage (kWh)")
     plt.xticks(range(0, 24, 3))
-    save_plot("6_pred_daily_profile.png")
+    return save_plot("6_pred_daily_profile.png")
 
 
-def plot_pred_peak_distribution(df):
-    df = df.copy()
-    df["period"] = df["hour"].apply(
-        lambda h: "Peak" if PEAK_START <= h < PEAK_END else "Off-Peak"
-    )
-    usage = df.groupby("period")["predicted_usage_kwh"].sum()
+def plot_pred_peak_distribution(df, agg=None):
+    setup_plotting()
+    agg = agg or get_aggregates(df, "predicted_usage_kwh")
+    usage = agg["peak"]
 
     plt.figure(figsize=(4, 4))
     plt.pie(
@@ -147,19 +164,22 @@ def plot_pred_peak_distribution(df):
         wedgeprops=dict(width=0.35),
     )
     plt.title("Predicted Energy Distribution")
-    save_plot("7_pred_peak_distribution.png")
+    return save_plot("7_pred_peak_distribution.png")
 
 
-def plot_pred_full_forecast(df):
+def plot_pred_full_forecast(df, max_points=MAX_PLOT_POINTS):
+    setup_plotting()
+    x, y = downsample_positions(df["predicted_usage_kwh"].to_numpy(), max_points)
     plt.figure(figsize=FIG_WIDE)
-    plt.plot(range(len(df)), df["predicted_usage_kwh"], linewidth=1.5, color="#9467bd")
+    plt.plot(x, y, linewidth=1.5, color="#9467bd")
     plt.title("7-Day Forecast (Relative Time)")
     plt.xlabel("Forecast Hour Index")
     plt.ylabel("Predicted Usage (kWh)")
-    save_plot("8_pred_full_forecast.png")
+    return save_plot("8_pred_full_forecast.png")
 
 
 def plot_pred_temp_forecast(df):
+    setup_plotting()
     fig, ax1 = plt.subplots(figsize=FIG_WIDE)
 
     ax1.plot(range(len(df)), df["predicted_usage_kwh"], color="#ff7f0e", linewidth=2)
@@ -173,27 +193,14 @@ def plot_pred_temp_forecast(df):
 
     ax1.set_xlabel("Forecast Hour Index")
     plt.title("Forecast: Usage vs Temperature")
-    save_plot("9_pred_temp_forecast.png")
-
-
-def plot_pred_heatmap(df):
-    df = df.copy()
-
-    # Ensure timestamp is datetime type for calculation
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return save_plot("9_pred_temp_forecast.png")
 
-    # Calculate a "Forecast Day" (Day 1, Day 2, etc.)
-    df["forecast_day"] = (
-        df["timestamp"].dt.date - df["timestamp"].dt.date.min()
-    ).apply(lambda x: x.days + 1)
 
-    # Pivot table: Forecast Day x Hour
-    pivot = df.pivot_table(
-        index="forecast_day",
-        columns="hour",
-        values="predicted_usage_kwh",
-        aggfunc="mean",
-    ).sort_index()
+def plot_pred_heatmap(df, agg=None):
+    setup_plotting()
+    # Pivot table: Forecast Day (Day 1, Day 2, etc.) x Hour
+    agg = agg or get_aggregates(df, "predicted_usage_kwh")
+    pivot = agg["heat_days"]
 
     # Scale colors robustly (ignoring extreme outliers for better visual contrast)
     vmin = pivot.stack().quantile(0.05)
@@ -212,4 +219,4 @@ def plot_pred_heatmap(df):
     plt.title("Predicted Usage Heatmap (7-Day Forecast)")
     plt.xlabel("Hour of Day")
     plt.ylabel("Forecast Day")
-    save_plot("10_pred_heatmap.png")
+    return save_plot("10_pred_heatmap.png")
@@ -3,29 +3,105 @@ import pandas as pd
 import numpy as np
 import os
 import time
-from fpdf import FPDF
-from huggingface_hub import InferenceClient
 
 # --- IMPORTING MODULES ---
-from src.processor import clean_data
-from src.predictor import train_model
-from src.forecaster import predict_next_week
+from src.jobs import ANALYSIS_STAGES, job_result, job_status, submit_analysis
 from src.recommender import get_ai_energy_plan
+from src.scheduler import scheduler_stats
 from src.solar import calculate_solar_roi
+from src.solar_montecarlo import simulate_solar_roi
+from src.solar_sim import build_hourly_load, recommend_solar_size
 from src.budget import calculate_budget_plan, calculate_cost_from_units
+from src.budget_sweep import sweep_budget_plans
+from src.chat_context import build_chat_context
+from src.disaggregation import MIN_RUNTIME_H, devices_that_ran, disaggregate_frame
+from src.downsample import downsample_frame
+from src.anomaly_detector import (
+    detector_stats,
+    live_records,
+    new_detector,
+    score_readings,
+)
+from src.meter_simulator import (
+    inject_faults,
+    new_fleet,
+    records_frame,
+    simulate_batch,
+)
+from src.ring_buffer import (
+    LIVE_CAPACITY,
+    LIVE_CHANNELS,
+    new_ring_buffer,
+    ring_extend,
+    ring_frame,
+    ring_window,
+)
+from src.stream_follower import (
+    STREAM_PATH,
+    close_follower,
+    follow_into_buffer,
+    follow_poll,
+    new_follower,
+)
+from src.tariff import (
+    PEAK_START,
+    PEAK_END,
+    PEAK_RATE,
+    OFF_PEAK_RATE,
+    build_tou_matrix,
+    price_forecast_tou,
+)
 
 try:
-    from analysis import visualization as viz
+    from analysis import chart_renderer
 except ImportError:
     st.error(
-        "⚠️ Could not import 'visualization'. Ensure 'visualization.py' is in the 'analysis' folder."
+        "⚠️ Could not import 'chart_renderer'. Ensure it is in the 'analysis' folder."
     )
 
 
 # ---------------------------------------------
-# 0. PDF Generator Function
+# 0. Analysis Job Tracker
+# ---------------------------------------------
+@st.fragment(run_every=1)
+def track_analysis_job(job_id):
+    """
+    Polls a background analysis job once a second (only this fragment reruns).
+    When it finishes, loads the results into the session and refreshes the app.
+    """
+    status = job_status(job_id)
+    if status is None or status["state"] in ("done", "failed"):
+        st.session_state["loaded_job"] = job_id
+        if status is None:
+            st.session_state["job_error"] = "Analysis job not found."
+        elif status["state"] == "failed":
+            st.session_state["job_error"] = status["error"]
+        else:
+            results = job_result(job_id)
+            st.session_state["df_clean"] = results["df_clean"]
+            st.session_state["model_metrics"] = results["metrics"]
+            st.session_state["future_df"] = results["future_df"]
+            st.session_state["household_profile"] = status["household_profile"]
+            st.session_state["analysis_done"] = True
+        st.rerun()
+
+    step = f"Step {status['step']}/{len(ANALYSIS_STAGES)}: " if status["step"] else ""
+    st.progress(status["progress"], text=f"⚙️ {step}{status['stage_label']}...")
+    queued = scheduler_stats()["queued"]
+    if status["stage"] == "train" and queued:
+        st.caption(f"⏳ Server busy: {queued} training job(s) waiting for free CPU.")
+    st.caption(
+        f"Job `{job_id}` keeps running if you close this tab. "
+        "Reopen this page's URL to pick it up again."
+    )
+
+
+# ---------------------------------------------
+# 0.5 PDF Generator Function
 # ---------------------------------------------
 def create_pdf(report_text):
+    from fpdf import FPDF  # Lazy: only loaded once a report exists
+
     class PDF(FPDF):
         def header(self):
             self.set_font("Arial", "B", 15)
@@ -158,33 +234,59 @@ st.caption(
     "Real-time stream from Smart Meter (DEMO MODE: Simulating Hardware Connection)"
 )
 
-if "live_data" not in st.session_state:
-    st.session_state.live_data = pd.DataFrame(
-        columns=["timestamp", "voltage", "current", "power_kw"]
-    )
+SIMULATED_SOURCE = "🎲 Simulated in the app"
+STREAM_SOURCE = f"📄 Sensor stream ({STREAM_PATH})"
+LIVE_FAULT_RATE = 0.02  # Share of in-app readings turned into spikes / sags
+DETECT_BYTES = 3 * 2**20  # About a day of sensor CSV, for device detection
+source = st.radio("Data source", [SIMULATED_SOURCE, STREAM_SOURCE], horizontal=True)
+
+# A fresh window (and file position, detector baselines) whenever the source changes
+if st.session_state.get("live_source") != source:
+    if "live_follower" in st.session_state:
+        close_follower(st.session_state.live_follower)
+    st.session_state.live_source = source
+    st.session_state.live_buffer = new_ring_buffer(LIVE_CAPACITY)
+    st.session_state.live_follower = new_follower()
+    st.session_state.live_fleet = new_fleet(1, seed=None)
+    st.session_state.live_detector = new_detector()
+    st.session_state.live_events = []
 
 if st.toggle("🔌 Activate IoT Simulation Mode"):
     placeholder = st.empty()
+    buf = st.session_state.live_buffer
     for _ in range(50):
-        now = pd.Timestamp.now()
-        voltage = np.random.normal(220, 2)
-        current = np.random.normal(8, 3)
-        if np.random.random() > 0.8:
-            current += 10
-        power = (voltage * current) / 1000
-        new_row = pd.DataFrame(
-            [[now, voltage, current, power]],
-            columns=["timestamp", "voltage", "current", "power_kw"],
-        )
-        st.session_state.live_data = pd.concat(
-            [st.session_state.live_data, new_row], ignore_index=True
-        )
-
-        if len(st.session_state.live_data) > 50:
-            st.session_state.live_data = st.session_state.live_data.tail(50)
+        if source == STREAM_SOURCE:
+            # Reads only what simulate_sensor.py appended since the last tick
+            n_new = follow_into_buffer(st.session_state.live_follower, buf)
+            new_records = live_records(*ring_window(buf, n_new))
+        else:
+            fleet = st.session_state.live_fleet
+            new_records = simulate_batch(fleet, pd.Timestamp.now().value, 1, 2.0)
+            inject_faults(fleet, new_records, LIVE_FAULT_RATE)
+            new_frame = records_frame(new_records)
+            ring_extend(buf, new_frame["timestamp"], new_frame[list(LIVE_CHANNELS)])
+
+        # Every new reading is scored against this meter's learned baselines
+        events = score_readings(st.session_state.live_detector, new_records)
+        st.session_state.live_events = (
+            st.session_state.live_events + events.to_dict("records")
+        )[-5:]
+
+        if buf["size"] == 0:
+            placeholder.info(
+                "⏳ Waiting for sensor data... "
+                "Start the sensor with `python simulate_sensor.py`."
+            )
+            time.sleep(0.5)
+            continue
 
         with placeholder.container():
-            df_display = st.session_state.live_data
+            df_display = ring_frame(buf)
+            recent = [
+                e
+                for e in st.session_state.live_events
+                if df_display.index[-1] - e["timestamp"] < pd.Timedelta(seconds=30)
+            ]
             k1, k2, k3 = st.columns(3)
             k1.metric(
                 "Live Load",
@@ -192,8 +294,26 @@ if st.toggle("🔌 Activate IoT Simulation Mode"):
                 delta_color="inverse",
             )
             k2.metric("Voltage", f"{df_display['voltage'].iloc[-1]:.1f} V")
-            k3.metric("Grid Status", "ONLINE ⚡")
-            st.area_chart(df_display["power_kw"], color="#00f5d4", height=200)
+            k3.metric(
+                "Grid Status",
+                f"⚠️ {recent[-1]['kind'].upper()}" if recent else "ONLINE ⚡",
+            )
+            st.area_chart(
+                downsample_frame(df_display, "power_kw")["power_kw"],
+                color="#00f5d4",
+                height=200,
+            )
+            for e in reversed(st.session_state.live_events):
+                unit = "A" if e["kind"] == "spike" else "V"
+                st.warning(
+                    f"⚠️ {e['timestamp']:%H:%M:%S} — {e['kind']}: "
+                    f"{e['value']:.1f} {unit} ({abs(e['score']):.1f}σ from normal)"
+                )
+            stats = detector_stats(st.session_state.live_detector)
+            st.caption(
+                f"🛡️ Anomaly detector: {stats['scored']:,} readings scored, "
+                f"{stats['events']} events, p99 {stats['p99_ms']:.1f} ms per batch"
+            )
         time.sleep(0.5)
 
 st.markdown("---")
@@ -225,9 +345,10 @@ with tab1:
             st.session_state[key] = None
 
     if uploaded_file:
+        if not st.session_state.get("analysis_done"):
+            chart_renderer.warm_up()  # Workers start while the form is filled in
         os.makedirs("data/raw", exist_ok=True)
         os.makedirs("data/processed", exist_ok=True)
-        os.makedirs("graphs", exist_ok=True)
 
         # Save file
         raw_file_path = os.path.join("data/raw", uploaded_file.name)
@@ -244,61 +365,80 @@ with tab1:
                 index=1,
             )
         with c2:
+            device_options = [
+                "AC",
+                "Heater",
+                "Motor",
+                "Iron",
+                "Microwave",
+                "Washing Machine",
+                "Geyser",
+                "EV Charger",
+                "Refrigerator",
+                "Gaming PC",
+            ]
+            if "heavy_devices" not in st.session_state:
+                st.session_state["heavy_devices"] = ["Iron", "Motor"]
+            if st.button(
+                "🔍 Detect from meter data",
+                help="Finds appliances by their switch-on/off steps in the "
+                "sensor stream instead of ticking them by hand.",
+            ):
+                # The latest ~day of readings from simulate_sensor.py
+                follower = new_follower(STREAM_PATH, backfill_bytes=DETECT_BYTES)
+                times, values = follow_poll(follower)
+                close_follower(follower)
+                readings = pd.DataFrame(
+                    {
+                        "timestamp": times,
+                        "power_kw": values[:, LIVE_CHANNELS.index("power_kw")],
+                    }
+                )
+                usage = disaggregate_frame(readings)
+                detected = devices_that_ran(usage, device_options)
+                if detected:
+                    st.session_state["heavy_devices"] = detected
+                    ran = usage[usage["runtime_h"] >= MIN_RUNTIME_H]
+                    st.caption(
+                        "Detected: "
+                        + ", ".join(
+                            f"{row.device} ~{row.runtime_h:.1f} h"
+                            for row in ran.itertuples()
+                        )
+                    )
+                else:
+                    st.info(
+                        "⏳ Not enough meter data yet. "
+                        "Start the sensor with `python simulate_sensor.py`."
+                    )
             heavy_devices = st.multiselect(
-                "🔌 High-Load Devices",
-                [
-                    "AC",
-                    "Heater",
-                    "Motor",
-                    "Iron",
-                    "Microwave",
-                    "Washing Machine",
-                    "Geyser",
-                    "EV Charger",
-                    "Refrigerator",
-                    "Gaming PC",
-                ],
-                default=["Iron", "Motor"],
+                "🔌 High-Load Devices", device_options, key="heavy_devices"
             )
 
         # --- STEP 1: THE DIAGNOSIS (Prediction) ---
         if st.button("🚀 Analyze Current Status"):
-            st.session_state["household_profile"] = {
-                "residents": num_people,
-                "devices": heavy_devices,
-                "season": season_input,
-            }
-
-            with st.spinner("⚙️ Running AI Diagnostics..."):
-                # Cleaning
-                df_raw = pd.read_csv(raw_file_path)
-                df_clean = clean_data(df_raw)
-                st.session_state["df_clean"] = df_clean
-
-                # Training
-                model, feature_list, metrics = train_model(df_clean)
-                st.session_state["model_metrics"] = metrics
-
-                # Forecasting
-                full_future_df = predict_next_week(model, feature_list)
-                st.session_state["future_df"] = full_future_df
-
-                # --- VISUALIZATION GENERATION (RESTORED) ---
-                # We create all plots defined in visualization.py and save them
-                viz.plot_clean_daily_profile(df_clean)
-                viz.plot_clean_peak_distribution(df_clean)
-                viz.plot_clean_full_pattern(df_clean)
-                viz.plot_clean_temp_correlation(df_clean)
-                viz.plot_clean_heatmap(df_clean)
-
-                viz.plot_pred_daily_profile(full_future_df)
-                viz.plot_pred_peak_distribution(full_future_df)
-                viz.plot_pred_full_forecast(full_future_df)
-                viz.plot_pred_temp_forecast(full_future_df)
-                viz.plot_pred_heatmap(full_future_df)
-
-                st.session_state["analysis_done"] = True
-                st.rerun()  # Refresh to show results
+            # Clean -> train -> forecast runs as a background job; the ID goes
+            # in the URL so a rerun or reconnect reattaches instead of restarting.
+            job_id = submit_analysis(
+                raw_file_path,
+                {
+                    "residents": num_people,
+                    "devices": heavy_devices,
+                    "season": season_input,
+                },
+            )
+            st.session_state["job_id"] = job_id
+            st.session_state["job_error"] = None
+            st.session_state["analysis_done"] = None
+            st.query_params["job"] = job_id
+
+    # --- BACKGROUND ANALYSIS JOB ---
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    if job_id and st.session_state.get("loaded_job") != job_id:
+        st.session_state["job_id"] = job_id
+        track_analysis_job(job_id)
+    if st.session_state.get("job_error"):
+        st.error(f"❌ Analysis failed: {st.session_state['job_error']}")
 
     # --- RESULTS & OPTIMIZATION SECTION ---
     if st.session_state.get("analysis_done"):
@@ -315,6 +455,30 @@ with tab1:
         m2.metric("Projected Bill (Approx)", f"Rs. {est_bill:,.0f}")
         m3.metric("Avg Daily Usage", f"{total_kwh/7:.2f} kWh")
 
+        with st.expander("⏱️ Time-of-Use (Peak / Off-Peak) Bill"):
+            t1, t2 = st.columns(2)
+            peak_rate = t1.slider(
+                f"Peak Rate ({PEAK_START}:00-{PEAK_END}:00) Rs/unit", 10, 100, PEAK_RATE
+            )
+            off_peak_rate = t2.slider("Off-Peak Rate Rs/unit", 10, 100, OFF_PEAK_RATE)
+            tou = price_forecast_tou(
+                future_df, build_tou_matrix(peak_rate, off_peak_rate)
+            )
+            u1, u2, u3 = st.columns(3)
+            u1.metric("TOU Cost (7 Days)", f"Rs. {tou['total_cost']:,.0f}")
+            u2.metric(
+                "Peak Usage",
+                f"{tou['peak_kwh']:.1f} kWh",
+                f"Rs. {tou['peak_cost']:,.0f}",
+                delta_color="off",
+            )
+            u3.metric(
+                "Off-Peak Usage",
+                f"{tou['off_peak_kwh']:.1f} kWh",
+                f"Rs. {tou['off_peak_cost']:,.0f}",
+                delta_color="off",
+            )
+
         # --- 1.5 VISUAL ANALYSIS SECTION (RESTORED) ---
         st.markdown("---")
         st.subheader("🔍 Detailed Visual Analysis")
@@ -340,17 +504,35 @@ with tab1:
         )
 
         graph_filename = graph_options.get(selected_graph_name)
+        chart_slot = st.empty()
+        pending_chart = None
 
         if graph_filename:
-            file_path = f"graphs/{graph_filename}"
-            if os.path.exists(file_path):
-                st.image(
-                    file_path,
-                    caption=selected_graph_name,
-                    width=800,  # Adjusted for better visibility
-                )
+            # Rendered on first selection, then served from this session's cache
+            if st.session_state.get("chart_cache") is None:
+                st.session_state["chart_cache"] = chart_renderer.new_chart_cache()
+            future = chart_renderer.request_chart(
+                st.session_state["chart_cache"],
+                graph_filename,
+                st.session_state["df_clean"],
+                future_df,
+            )
+            if not future.done():
+                # Filled in at the end of this tab, after the rest has rendered
+                chart_slot.info("⏳ Rendering chart...")
+                pending_chart = (future, selected_graph_name)
             else:
-                st.warning("Graph file not found. Please re-run the analysis.")
+                rendered = chart_renderer.chart_png(future)
+                if rendered:
+                    chart_slot.image(
+                        rendered,
+                        caption=selected_graph_name,
+                        width=800,  # Adjusted for better visibility
+                    )
+                else:
+                    chart_slot.warning(
+                        "Chart rendering failed. Please re-run the analysis."
+                    )
         else:
             if selected_graph_name is not None:
                 st.info("Please select a specific chart from the menu above.")
@@ -375,6 +557,28 @@ with tab1:
             st.caption(
                 "The AI will calculate exactly which devices to cut to hit your target."
             )
+            report_engine = st.radio(
+                "📝 Report Engine",
+                ["🧠 AI Writer (Hugging Face)", "⚡ Instant Local Report (Offline)"],
+                help="The local report uses the same forecast and plan, with no network call.",
+            )
+        report_mode = "local" if report_engine.startswith("⚡") else "ai"
+
+        # Precomputed what-if curve: every budget is evaluated in one call,
+        # so moving the target needs no recomputation round-trip.
+        with st.expander("📈 Budget Response Curve (What-If)"):
+            budget_grid = np.linspace(est_bill * 0.3, est_bill * 1.3, 60).round(-1)
+            curve = sweep_budget_plans(
+                budget_grid,
+                device_sets=[st.session_state["household_profile"].get("devices", [])],
+                predicted_kwh=total_kwh,
+            )
+            st.line_chart(
+                curve.set_index("target_bill_rs")[["gap_units", "total_cut_hours"]]
+            )
+            st.caption(
+                "Gap to close (kWh/week) and total device cut hours per day for each target budget."
+            )
 
         # --- THE AGENT TRIGGER ---
         if st.button("✨ Generate AI Savings Plan"):
@@ -407,14 +611,25 @@ with tab1:
             except:
                 hf_api_key = ""
 
-            if not hf_api_key:
+            if report_mode == "local":
+                plan_text = get_ai_energy_plan(
+                    st.session_state["df_clean"],
+                    st.session_state["future_df"],
+                    hf_api_key,
+                    st.session_state["household_profile"],
+                    agent_plan=agent_plan,
+                    mode="local",
+                )
+                st.session_state["ai_plan"] = plan_text
+
+            elif not hf_api_key:
                 hf_api_key = st.text_input(
                     "🔑 Enter Hugging Face API Key (Required for PDF Report)",
                     type="password",
                     key="pdf_key_input",
                 )
 
-            if hf_api_key:
+            if report_mode == "ai" and hf_api_key:
                 with st.spinner("Writing Official Report..."):
                     plan_text = get_ai_energy_plan(
                         st.session_state["df_clean"],
@@ -438,6 +653,15 @@ with tab1:
                     "Report.pdf",
                 )
 
+        # A chart still rendering fills its slot last, so nothing above waits on it
+        if pending_chart:
+            future, caption = pending_chart
+            rendered = chart_renderer.chart_png(future)
+            if rendered:
+                chart_slot.image(rendered, caption=caption, width=800)
+            else:
+                chart_slot.warning("Chart rendering failed. Please re-run the analysis.")
+
 # =========================================
 # TAB 2: REVERSE BUDGET PLANNER (Fixed)
 # =========================================
@@ -461,10 +685,22 @@ with tab2:
         help="Check your meter reading if possible.",
     )
 
+    # Response curve for the chosen days/usage, computed for all budgets at once
+    limit_curve = sweep_budget_plans(
+        np.arange(1000, max(target_budget_legacy * 2, 10000) + 1, 250),
+        days_left=[days_left],
+        current_usage_kwh=current_used,
+    )
+    st.line_chart(
+        limit_curve.set_index("target_bill_rs")["daily_limit"],
+        height=200,
+    )
+    st.caption("Safe daily limit (kWh/day) across monthly budgets.")
+
     if st.button("Calculate Daily Limit"):
 
         # Get devices from profile (or default list)
-        user_devices = st.session_state.get("household_profile", {}).get(
+        user_devices = (st.session_state.get("household_profile") or {}).get(
             "devices", ["AC", "Iron", "Fans"]
         )
 
@@ -516,11 +752,56 @@ with tab3:
             st.success(
                 f"✅ Free electricity after {solar_data['payback_years']:.1f} years!"
             )
+
+            # Risk view: 100k scenarios of tariff, degradation, cost and weather
+            risk = simulate_solar_roi(bill_input)
+            payback = risk["payback_percentiles"]
+            st.markdown("##### 🎲 Risk Analysis (Monte Carlo)")
+            st.caption(
+                f"{risk['n_scenarios']:,} scenarios of tariff growth, panel "
+                "degradation, installation cost and sunshine variation."
+            )
+            r1, r2 = st.columns(2)
+            r1.metric(
+                "Payback (P10–P90)", f"{payback[10]:.1f} – {payback[90]:.1f} Years"
+            )
+            r2.metric(
+                "Chance of Payback in 10 Years",
+                f"{risk['prob_payback_within_horizon'] * 100:.0f}%",
+            )
+            bands = solar_data["chart_data"].merge(risk["bands"], on="Year")
+            st.line_chart(bands.set_index("Year"))
     else:
         st.info(
             "👋 Enter your monthly bill amount above to see your solar savings potential."
         )
 
+    # 3. Hourly simulation against the household's own load curve
+    st.markdown("---")
+    st.markdown("#### 📈 Hourly Solar Simulation")
+    if st.session_state.get("df_clean") is not None:
+        st.caption(
+            "Simulates 8,760 hours of clear-sky generation against your uploaded "
+            "usage, so only the units you actually consume are valued at the grid rate."
+        )
+        if st.button("Simulate with My Load Profile"):
+            hourly_load = build_hourly_load(st.session_state["df_clean"])
+            best, size_table = recommend_solar_size(hourly_load)
+
+            s1, s2, s3, s4 = st.columns(4)
+            s1.metric("Best Size", f"{best['system_size_kw']:.1f} kW")
+            s2.metric("Annual Savings", f"Rs. {best['annual_savings']:,.0f}")
+            s3.metric("Self-Consumption", f"{best['self_consumption_pct']:.0f}%")
+            s4.metric("Payback", f"{best['payback_years']:.1f} Years")
+
+            st.line_chart(
+                size_table.set_index("system_size_kw")[
+                    ["annual_savings", "npv_10y"]
+                ]
+            )
+    else:
+        st.info("Run an analysis in Tab 1 to simulate solar against your hourly usage.")
+
 # =========================================
 # TAB 4: CONTEXT-AWARE AI CHATBOT
 # =========================================
@@ -552,38 +833,24 @@ with tab4:
             st.chat_message("user").markdown(user_input)
             st.session_state.messages.append({"role": "user", "content": user_input})
 
-            # 4. Prepare Context (The Brain)
-            agent_context = ""
-            if "agent_plan" in st.session_state and st.session_state["agent_plan"]:
-                plan = st.session_state["agent_plan"]
-                agent_context = f"""
-                [LIVE SYSTEM DATA]
-                - Target Budget: {plan.get('target_units', 0)} kWh
-                - Projected Usage: {plan.get('predicted_units', 0)} kWh
-                - Current Status: {plan.get('status', 'Unknown')}
-                - REQUIRED ACTIONS: {', '.join(plan.get('actions', []))}
-                """
-
-            # 5. Build Memory Chain for AI
-            history_for_ai = [
-                {
-                    "role": "system",
-                    "content": (
-                        f"You are a helpful energy expert. Use this live system data: {agent_context}. "
-                        "STRICT MATH RULES: "
-                        "1. NEVER subtract 'Units (kWh)' from 'Money (Rs)'. "
-                        "2. Always convert device usage to cost before subtracting from a budget. "
-                        "3. Assume 1 Unit (kWh) = Rs. 40 roughly. "
-                        "4. Keep answers short, concise, and unit-accurate."
-                    ),
-                }
-            ]
-            
-            # Take last 10 messages for memory efficiency
-            history_for_ai.extend(st.session_state.messages[-10:])
+            # 4. Build Token-Budgeted Context (compact facts + rolling summary)
+            if "chat_summary" not in st.session_state:
+                st.session_state.chat_summary = {}
+            if "chat_token_log" not in st.session_state:
+                st.session_state.chat_token_log = []
+
+            history_for_ai, ctx_stats = build_chat_context(
+                st.session_state.messages,
+                agent_plan=st.session_state.get("agent_plan"),
+                summary_state=st.session_state.chat_summary,
+            )
+            st.session_state.chat_token_log.append(ctx_stats["prompt_tokens"])
 
             with st.spinner("Thinking..."):
                 try:
+                    # Lazy: the chat tab is the only UI path that needs the client
+                    from huggingface_hub import InferenceClient
+
                     client = InferenceClient(token=hf_api_key)
                     response = client.chat_completion(
                         model="meta-llama/Llama-3.2-3B-Instruct",
@@ -599,5 +866,12 @@ with tab4:
                 except Exception as e:
                     st.error(f"AI Error: {e}")
 
+            st.caption(
+                f"🧮 Prompt: {ctx_stats['prompt_tokens']} tokens "
+                f"(budget {ctx_stats['token_budget']}, "
+                f"{ctx_stats['summarized_turns']} older turns summarized, "
+                f"last-10-messages prompt would be ~{ctx_stats['legacy_tokens']} tokens)"
+            )
+
 st.markdown("---")
 st.caption("⚡ Smart AI Meter | Energy Usage Advisor Project")
@@ -0,0 +1,70 @@
+# benchmarks/bench_aggregates.py
+# Chart + report aggregates for 10M rows: one shared pass vs per-chart groupbys.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_aggregates
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.aggregates import compute_aggregates
+from src.tariff import PEAK_END, PEAK_START
+
+N_ROWS = 10_000_000
+
+
+def _per_chart(df):
+    """
+    What the charts and the report computed before: each its own scan.
+    """
+    df.groupby("hour")["usage_kwh"].mean()
+    df.groupby("hour")[["usage_kwh", "temperature_c"]].mean()
+    periods = df.copy()
+    periods["period"] = periods["hour"].apply(
+        lambda h: "Peak" if PEAK_START <= h < PEAK_END else "Off-Peak"
+    )
+    periods.groupby("period")["usage_kwh"].sum()
+    df.pivot_table(
+        index="day_of_month", columns="hour", values="usage_kwh", aggfunc="mean"
+    )
+    days = df.copy()
+    days["forecast_day"] = (
+        days["timestamp"].dt.date - days["timestamp"].dt.date.min()
+    ).apply(lambda x: x.days + 1)
+    days.pivot_table(
+        index="forecast_day", columns="hour", values="usage_kwh", aggfunc="mean"
+    )
+    ts = pd.to_datetime(df["timestamp"])
+    df.assign(date=ts.dt.date, day_name=ts.dt.day_name()).groupby(
+        ["date", "day_name"]
+    ).agg({"usage_kwh": "sum", "temperature_c": "mean"})
+
+
+def main():
+    rng = np.random.default_rng(42)
+    ts = pd.Series(pd.date_range("2020-01-01", periods=N_ROWS, freq="min"))
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "usage_kwh": rng.gamma(2.0, 0.01, N_ROWS),
+            "temperature_c": rng.normal(28, 5, N_ROWS),
+            "hour": ts.dt.hour,
+            "day_of_month": ts.dt.day,
+        }
+    )
+
+    start = time.perf_counter()
+    compute_aggregates(df)
+    shared_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _per_chart(df)
+    per_chart_s = time.perf_counter() - start
+
+    print(f"📊 Chart/report aggregates over {N_ROWS:,} rows")
+    print(f"   Per-chart groupbys (old):  {per_chart_s:7.2f} s")
+    print(f"   Shared single pass:        {shared_s:7.2f} s")
+    print(f"   Speedup:                   {per_chart_s / shared_s:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
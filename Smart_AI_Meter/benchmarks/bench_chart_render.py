@@ -0,0 +1,95 @@
+# benchmarks/bench_chart_render.py
+# Analysis charts: eager (all ten) vs lazy per-session rendering with an LRU cache.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_chart_render
+import os
+import time
+from concurrent.futures import wait
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+from analysis.chart_renderer import (
+    CHART_JOBS,
+    MAX_WORKERS,
+    chart_png,
+    get_pool,
+    new_chart_cache,
+    request_chart,
+    warm_up,
+)
+
+N_RUNS = 3
+FIRST_CHART = next(iter(CHART_JOBS))  # The selectbox default
+
+
+def _sample_frames():
+    """
+    A month of hourly history and a 7-day forecast, shaped like the app's frames.
+    """
+    rng = np.random.default_rng(42)
+    ts = pd.date_range("2025-06-01", periods=24 * 30, freq="h")
+    past = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "usage_kwh": rng.gamma(2.0, 0.6, len(ts)),
+            "temperature_c": 30 + 6 * np.sin(np.arange(len(ts)) / 12 * np.pi),
+            "hour": ts.hour,
+            "day_of_month": ts.day,
+        }
+    )
+    future_ts = pd.date_range("2025-07-01", periods=24 * 7, freq="h")
+    future = pd.DataFrame(
+        {
+            "timestamp": future_ts,
+            "predicted_usage_kwh": rng.gamma(2.0, 0.6, len(future_ts)),
+            "temperature_c": 31 + 5 * np.sin(np.arange(len(future_ts)) / 12 * np.pi),
+            "hour": future_ts.hour,
+        }
+    )
+    return past, future
+
+
+def _time(fn):
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        fn()
+    return (time.perf_counter() - start) / N_RUNS * 1000
+
+
+def main():
+    past, future = _sample_frames()
+    n_workers = min(MAX_WORKERS, os.cpu_count() or 1)
+    get_pool(n_workers)
+    wait(warm_up())  # Workers are started while the user uploads, not per analysis
+
+    def eager_serial():
+        cache = new_chart_cache()
+        for name in CHART_JOBS:
+            request_chart(cache, name, past, future, parallel=False)
+
+    def eager_pool():
+        cache = new_chart_cache()
+        wait([request_chart(cache, name, past, future) for name in CHART_JOBS])
+
+    def lazy_first_view():
+        chart_png(request_chart(new_chart_cache(), FIRST_CHART, past, future))
+
+    warm_cache = new_chart_cache()
+    chart_png(request_chart(warm_cache, FIRST_CHART, past, future))
+
+    def cached_view():
+        chart_png(request_chart(warm_cache, FIRST_CHART, past, future))
+
+    print(f"📊 Analysis charts, {N_RUNS} runs, {n_workers} render workers")
+    print(f"   All ten, serial (old path):     {_time(eager_serial):7.0f} ms")
+    print(f"   All ten, render pool:           {_time(eager_pool):7.0f} ms")
+    print(f"   Lazy: first selected chart:     {_time(lazy_first_view):7.0f} ms")
+    print(f"   Lazy: re-selected (LRU hit):    {_time(cached_view):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
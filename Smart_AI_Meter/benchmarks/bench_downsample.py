@@ -0,0 +1,50 @@
+# benchmarks/bench_downsample.py
+# Full-pattern chart for a year of minute data: every point vs LTTB-downsampled.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_downsample
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+from analysis.visualization import plot_clean_full_pattern
+from src.downsample import MAX_PLOT_POINTS, lttb_indices
+
+N_POINTS = 525_600  # One year at 1-minute resolution
+N_RUNS = 3
+
+
+def _render(df, max_points):
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        png = plot_clean_full_pattern(df, max_points=max_points)
+    return (time.perf_counter() - start) / N_RUNS * 1000, len(png)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    minutes = np.arange(N_POINTS)
+    daily = 0.6 + 0.4 * np.sin(minutes / 1440 * 2 * np.pi) ** 2
+    usage = daily * rng.gamma(2.0, 0.5, N_POINTS)
+    usage[rng.integers(0, N_POINTS, 20)] += 15  # Rare spikes the chart must keep
+    df = pd.DataFrame({"usage_kwh": usage})
+
+    full_ms, full_bytes = _render(df, None)
+    lttb_ms, lttb_bytes = _render(df, MAX_PLOT_POINTS)
+
+    start = time.perf_counter()
+    kept = lttb_indices(usage, MAX_PLOT_POINTS)
+    lttb_only_ms = (time.perf_counter() - start) * 1000
+
+    print(f"📊 Full usage pattern, {N_POINTS:,} points -> {MAX_PLOT_POINTS:,}")
+    print(f"   Every point:   {full_ms:8.0f} ms   {full_bytes / 1024:7.0f} KB PNG")
+    print(f"   LTTB:          {lttb_ms:8.0f} ms   {lttb_bytes / 1024:7.0f} KB PNG")
+    print(f"   LTTB itself:   {lttb_only_ms:8.1f} ms")
+    print(f"   Max kept:      {usage[kept].max():.2f} of {usage.max():.2f} kWh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_energy_stream.py
+# Hourly kWh from a day of 1 Hz power readings: collect everything and
+# aggregate with pandas at the end vs the streaming integrator, batch by batch.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_energy_stream [--meters 50]
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.energy_stream import (
+    close_open_hours,
+    new_energy_stream,
+    new_weather_cache,
+    push_readings,
+)
+from src.meter_simulator import new_fleet, simulate_batch
+
+START = pd.Timestamp("2025-06-01")
+HOURS = 24
+BATCH_TICKS = 600  # 10 minutes of readings per batch
+
+
+def _batches(n_meters):
+    fleet = new_fleet(n_meters)
+    for b in range(HOURS * 3600 // BATCH_TICKS):
+        batch_start = START.value + b * BATCH_TICKS * 10**9
+        yield simulate_batch(fleet, batch_start, BATCH_TICKS, 1.0)
+
+
+def _collect_then_aggregate(batches):
+    """
+    The export route: keep every reading, then sum power x seconds per hour.
+    """
+    records = np.concatenate(list(batches))
+    df = pd.DataFrame(
+        {
+            "timestamp": records["timestamp_ns"].astype("datetime64[ns]"),
+            "meter_id": records["meter_id"],
+            "power_kw": records["power_kw"].astype(float),
+        }
+    )
+    df["kwh"] = df["power_kw"] / 3600  # 1 s per reading
+    return df.groupby(["meter_id", pd.Grouper(key="timestamp", freq="h")])[
+        "kwh"
+    ].sum()
+
+
+def _stream(batches):
+    stream = new_energy_stream(weather=new_weather_cache(fetch=lambda: None))
+    rows = [push_readings(stream, records) for records in batches]
+    rows.append(close_open_hours(stream))
+    return pd.concat(rows)
+
+
+def _timed(fn, batches):
+    """
+    Result and seconds spent in fn, batch generation excluded.
+    """
+    batches = list(batches)
+    began = time.perf_counter()
+    result = fn(iter(batches))
+    return result, time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meters", type=int, default=50)
+    args = parser.parse_args()
+
+    n_readings = HOURS * 3600 * args.meters
+    print(f"📊 {n_readings:,} readings ({args.meters} meters x {HOURS} h at 1 Hz)")
+
+    batch_kwh, batch_s = _timed(_collect_then_aggregate, _batches(args.meters))
+    rows, stream_s = _timed(_stream, _batches(args.meters))
+    print(
+        f"   Collect + pandas: {batch_s:6.2f} s | streaming: {stream_s:6.2f} s "
+        f"({n_readings / stream_s / 1e6:.2f} M readings/s)"
+    )
+
+    # Memory while running: the export route holds every reading, the stream
+    # only its per-meter state (batches are generated lazily here)
+    tracemalloc.start()
+    _collect_then_aggregate(_batches(args.meters))
+    batch_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    _stream(_batches(args.meters))
+    stream_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"   Peak memory: collect {batch_peak / 2**20:7.1f} MB | "
+        f"streaming {stream_peak / 2**20:5.1f} MB"
+    )
+
+    # Trapezoids over 1 s steps vs 1 s rectangles: the same energy to ~0.1 %
+    total_stream = (rows["usage_kwh"] * rows["coverage"]).sum()
+    print(
+        f"   Total energy: {batch_kwh.sum():,.1f} kWh (collect) vs "
+        f"{total_stream:,.1f} kWh (streaming), {len(rows):,} hourly rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
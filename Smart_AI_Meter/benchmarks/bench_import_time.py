@@ -0,0 +1,113 @@
+# benchmarks/bench_import_time.py
+# Cold-start import profile of app.py's top-level imports (python -X importtime),
+# with a regression gate: exits 1 if startup is over budget or a heavy library
+# that should load lazily (per tab / feature) is imported at startup.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_import_time [--max-ms 1500]
+import argparse
+import ast
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+STARTUP_BUDGET_MS = 1500  # Time-to-first-paint import budget (median of runs)
+N_RUNS = 5
+
+# Loaded only by the feature that needs them, never at app start
+LAZY_MODULES = (
+    "matplotlib",
+    "seaborn",
+    "sklearn",
+    "scipy",
+    "fpdf",
+    "huggingface_hub",
+    "requests",
+)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def startup_imports(app_path=APP_PATH):
+    """
+    The import statements app.py runs at module level (function-local,
+    lazy imports are skipped), as one line of source.
+    """
+    tree = ast.parse(app_path.read_text(encoding="utf-8"))
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.Try):
+            nodes = node.body
+        else:
+            nodes = [node]
+        imports = [n for n in nodes if isinstance(n, (ast.Import, ast.ImportFrom))]
+        statements += [ast.unparse(n) for n in imports]
+    return "; ".join(statements)
+
+
+def profile(code, cwd):
+    """
+    One cold interpreter run. Returns {top-level module: cumulative ms} and
+    the set of every module imported, excluding interpreter start-up.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level, modules = {}, set()
+    for match in LINE.finditer(result.stderr):
+        _, cumulative, indent, name = match.groups()
+        modules.add(name)
+        if len(indent) == 1:
+            top_level[name] = int(cumulative) / 1000
+    return top_level, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=N_RUNS)
+    args = parser.parse_args()
+
+    cwd = APP_PATH.parent
+    code = startup_imports()
+    baseline, baseline_modules = profile("pass", cwd)
+
+    totals, slowest, modules = [], {}, set()
+    for _ in range(args.runs):
+        top_level, imported = profile(code, cwd)
+        top_level = {k: v for k, v in top_level.items() if k not in baseline}
+        totals.append(sum(top_level.values()))
+        modules |= imported - baseline_modules
+        for name, ms in top_level.items():
+            slowest.setdefault(name, []).append(ms)
+
+    total = statistics.median(totals)
+    heavy = sorted({m.split(".")[0] for m in modules} & set(LAZY_MODULES))
+
+    print(f"📊 app.py startup imports ({args.runs} cold runs, median)")
+    print(f"   Total:  {total:7.0f} ms  (budget {args.max_ms:.0f} ms)")
+    ranked = sorted(slowest.items(), key=lambda kv: -statistics.median(kv[1]))
+    for name, runs in ranked[:8]:
+        print(f"   {name:<32} {statistics.median(runs):7.0f} ms")
+
+    failed = False
+    if heavy:
+        print(f"❌ Loaded at startup but should be lazy: {', '.join(heavy)}")
+        failed = True
+    if total > args.max_ms:
+        print(f"❌ Startup imports over budget: {total:.0f} > {args.max_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ Startup imports within budget.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_ingest.py
+# Telemetry ingestion over local TCP: many meters reporting every few seconds
+# into the time-series store, with ack-after-write latency percentiles.
+# Server and load generator share this process (and its one event loop).
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_ingest [--meters 20000]
+import argparse
+import asyncio
+import os
+import tempfile
+
+from src.ingest import (
+    ingest_stats,
+    new_ingest_server,
+    run_load,
+    start_ingest_server,
+    stop_ingest_server,
+)
+from src.tsdb import close_tsdb, open_tsdb
+
+PORT = 8799
+SCENARIOS = [
+    # (label, fsync before ack, queued frames before backpressure)
+    ("page cache, queue 256", False, 256),
+    ("fsync, queue 8", True, 8),
+]
+
+
+async def _scenario(args, sync, queue_batches):
+    db = open_tsdb(os.path.join(tempfile.mkdtemp(), "tsdb"))
+    server = new_ingest_server(db, sync=sync, queue_batches=queue_batches)
+    listener = await start_ingest_server(server, "127.0.0.1", PORT)
+    load = await run_load(
+        "127.0.0.1",
+        PORT,
+        args.meters,
+        args.connections,
+        args.interval,
+        args.duration,
+    )
+    await stop_ingest_server(server, listener)
+    close_tsdb(db)
+    return load, ingest_stats(server)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meters", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(
+        f"📊 {args.meters:,} meters every {args.interval:g} s over "
+        f"{args.connections} connections, {args.duration:g} s per scenario"
+    )
+    for label, sync, queue_batches in SCENARIOS:
+        load, stats = asyncio.run(_scenario(args, sync, queue_batches))
+        print(
+            f"   {label:<22}: {load['records_per_s']:>8,.0f} readings/s | "
+            f"{load['acked']:,}/{load['sent']:,} acked | ack p50 "
+            f"{load['p50_ms']:5.1f} ms, p95 {load['p95_ms']:5.1f} ms, "
+            f"p99 {load['p99_ms']:6.1f} ms"
+        )
+        print(
+            f"   {'':<22}  {stats['writes']:,} store writes "
+            f"({stats['records'] / max(stats['writes'], 1):,.0f} readings each, "
+            f"{stats['mean_write_ms']:.1f} ms), max queue {stats['max_queued']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
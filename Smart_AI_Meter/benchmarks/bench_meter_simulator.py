@@ -0,0 +1,61 @@
+# benchmarks/bench_meter_simulator.py
+# Multi-meter simulator throughput: generation alone, then generation + each
+# output format, in samples per second on one core (target: 1M/s).
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_meter_simulator
+import os
+import tempfile
+import time
+
+from src.meter_simulator import (
+    OUTPUT_FORMATS,
+    close_sink,
+    new_fleet,
+    open_sink,
+    simulate_batch,
+    write_batch,
+)
+
+FLEETS = (100, 1_000, 10_000)  # Meters, all at 1 Hz
+SAMPLES_PER_RUN = 2_000_000
+BATCH_TICKS = 10  # Seconds of readings per flush
+START_NS = 1_748_736_000 * 10**9  # 2025-06-01 00:00
+
+
+def _run(n_meters, fmt=None, folder=None):
+    """
+    Samples per second for SAMPLES_PER_RUN readings (written to fmt if given).
+    """
+    fleet = new_fleet(n_meters)
+    n_batches = max(1, SAMPLES_PER_RUN // (n_meters * BATCH_TICKS))
+    sink = None
+    if fmt is not None:
+        sink = open_sink(os.path.join(folder, f"{n_meters}.{fmt}"), fmt, n_meters)
+
+    start = time.perf_counter()
+    for b in range(n_batches):
+        batch_start = START_NS + b * BATCH_TICKS * 10**9
+        records = simulate_batch(fleet, batch_start, BATCH_TICKS, 1.0)
+        if sink is not None:
+            write_batch(sink, records)
+    if sink is not None:
+        close_sink(sink)
+    return n_batches * BATCH_TICKS * n_meters / (time.perf_counter() - start)
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    print(f"📊 Simulator throughput, M samples/s ({SAMPLES_PER_RUN:,} per run)")
+    columns = ("generate", *OUTPUT_FORMATS)
+    print(f"   {'meters':>7}" + "".join(f"{c:>10}" for c in columns))
+    for n_meters in FLEETS:
+        rates = [_run(n_meters)]
+        for fmt in OUTPUT_FORMATS:
+            try:
+                rates.append(_run(n_meters, fmt, folder))
+            except ImportError:  # Parquet needs pyarrow
+                rates.append(float("nan"))
+        print(f"   {n_meters:>7,}" + "".join(f"{r / 1e6:>10.2f}" for r in rates))
+
+
+if __name__ == "__main__":
+    main()
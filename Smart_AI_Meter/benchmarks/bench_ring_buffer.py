@@ -0,0 +1,98 @@
+# benchmarks/bench_ring_buffer.py
+# Live monitor window: pd.concat + .tail(n) per sample vs the NumPy ring buffer
+# (append throughput, peak transient memory, resident window size).
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_ring_buffer
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.ring_buffer import LIVE_CHANNELS, new_ring_buffer, ring_append, ring_window
+
+COLUMNS = ["timestamp", *LIVE_CHANNELS]
+WINDOWS = (50, 3600, 24 * 60 * 60)  # Old app window, 1 h and 24 h at 1 Hz
+N_APPENDS = 1000
+
+
+def _samples(n, start="2025-06-01"):
+    rng = np.random.default_rng(42)
+    times = pd.Timestamp(start) + pd.to_timedelta(np.arange(n), unit="s")
+    voltage = rng.normal(220, 2, n)
+    current = rng.normal(8, 3, n)
+    return list(zip(times, voltage, current, voltage * current / 1000))
+
+
+def _concat_appends(live, window, samples):
+    """
+    The old app path: a one-row frame, concat, then tail, for every sample.
+    """
+    for row in samples:
+        new_row = pd.DataFrame([row], columns=COLUMNS)
+        live = pd.concat([live, new_row], ignore_index=True)
+        if len(live) > window:
+            live = live.tail(window)
+    return live
+
+
+def _ring_appends(buf, window, samples):
+    for t, *values in samples:
+        ring_append(buf, t, values)
+    return buf
+
+
+def _full_window(path, window):
+    full = _samples(window)
+    if path is _concat_appends:
+        return pd.DataFrame(full, columns=COLUMNS)
+    return _ring_appends(new_ring_buffer(window), window, full)
+
+
+def _measure(path, window):
+    """
+    N_APPENDS appends onto an already full window. Returns
+    (µs per append, peak transient MB, resident window MB).
+    """
+    samples = _samples(N_APPENDS, start="2025-07-01")
+
+    state = _full_window(path, window)
+    start = time.perf_counter()
+    path(state, window, samples)
+    elapsed = time.perf_counter() - start  # Timed without tracemalloc running
+
+    state = _full_window(path, window)
+    tracemalloc.start()
+    state = path(state, window, samples)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if isinstance(state, pd.DataFrame):
+        resident = int(state.memory_usage(deep=True).sum())
+    else:
+        resident = state["values"].nbytes + state["times"].nbytes
+    return elapsed / N_APPENDS * 1e6, peak / 1e6, resident / 1e6
+
+
+def main():
+    print(f"📊 Live window appends ({N_APPENDS:,} samples onto a full window)")
+    print(
+        f"   {'window':>7}  {'path':<7} {'µs/append':>10} {'peak MB':>8}"
+        f" {'held MB':>8}"
+    )
+    for window in WINDOWS:
+        for label, path in (("concat", _concat_appends), ("ring", _ring_appends)):
+            per_append, peak, resident = _measure(path, window)
+            print(
+                f"   {window:>7,}  {label:<7} {per_append:>10.1f} {peak:>8.2f}"
+                f" {resident:>8.2f}"
+            )
+
+    # Windows are views into the buffer, never copies
+    buf = _ring_appends(new_ring_buffer(WINDOWS[-1]), None, _samples(WINDOWS[-1]))
+    _, values = ring_window(buf)
+    assert np.shares_memory(values, buf["values"])
+    print("✅ ring_window() returns zero-copy views.")
+
+
+if __name__ == "__main__":
+    main()
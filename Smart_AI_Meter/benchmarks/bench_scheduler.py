@@ -0,0 +1,105 @@
+# benchmarks/bench_scheduler.py
+# Load test: N simultaneous analyses training at once, each claiming every core
+# (n_jobs=-1, the old behaviour) vs admitted through the compute scheduler.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_scheduler [--sessions 4]
+import argparse
+import contextlib
+import io
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.predictor import train_model
+from src.scheduler import CORE_BUDGET, compute_slot, scheduler_stats
+
+
+def _sample_features(n_days=180):
+    """
+    Hourly history with the engineered features train_model looks for.
+    """
+    rng = np.random.default_rng(42)
+    ts = pd.date_range("2025-01-01", periods=24 * n_days, freq="h")
+    hour, day, month = ts.hour.to_numpy(), ts.dayofweek.to_numpy(), ts.month
+    temp = 28 + 7 * np.sin((hour - 9) / 24 * 2 * np.pi) + rng.normal(0, 1, len(ts))
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "usage_kwh": 0.4 + 0.05 * temp + rng.gamma(2.0, 0.3, len(ts)),
+            "temperature_c": temp,
+            "is_weekend": (day >= 5).astype(int),
+            "week_of_month": (ts.day.to_numpy() - 1) // 7 + 1,
+            "hour_sin": np.sin(2 * np.pi * hour / 24),
+            "hour_cos": np.cos(2 * np.pi * hour / 24),
+            "day_sin": np.sin(2 * np.pi * day / 7),
+            "day_cos": np.cos(2 * np.pi * day / 7),
+            "month_sin": np.sin(2 * np.pi * month / 12),
+            "month_cos": np.cos(2 * np.pi * month / 12),
+        }
+    )
+
+
+def _unscheduled(df):
+    train_model(df)
+
+
+def _scheduled(df):
+    with compute_slot("bench") as n_jobs:
+        train_model(df, n_jobs=n_jobs)
+
+
+def _load_test(job, df, n_sessions):
+    """
+    Starts n_sessions analyses at the same instant. Returns (wall s, latencies).
+    """
+    latencies = [0.0] * n_sessions
+    start = threading.Barrier(n_sessions + 1)
+
+    def session(i):
+        start.wait()
+        began = time.perf_counter()
+        job(df)
+        latencies[i] = time.perf_counter() - began
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+    for t in threads:
+        t.start()
+    with contextlib.redirect_stdout(io.StringIO()):  # train_model is chatty
+        start.wait()
+        began = time.perf_counter()
+        for t in threads:
+            t.join()
+    return time.perf_counter() - began, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--days", type=int, default=180)
+    args = parser.parse_args()
+
+    df = _sample_features(args.days)
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_model(df.iloc[:500])  # Warm-up: sklearn import, joblib pools
+
+    print(
+        f"📊 {args.sessions} simultaneous analyses, {len(df):,} rows each, "
+        f"{CORE_BUDGET} core(s)"
+    )
+    for label, job in (("n_jobs=-1 each", _unscheduled), ("scheduler", _scheduled)):
+        wall, lat = _load_test(job, df, args.sessions)
+        print(
+            f"   {label:<16} wall {wall:6.2f} s | latency p50 "
+            f"{np.median(lat):6.2f} s, max {lat.max():6.2f} s"
+        )
+
+    stats = scheduler_stats()
+    print(
+        f"   Scheduler queue: {stats['admitted']} admitted, mean wait "
+        f"{stats['mean_wait_s']:.2f} s, max wait {stats['max_wait_s']:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
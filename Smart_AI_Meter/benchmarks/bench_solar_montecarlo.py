@@ -0,0 +1,37 @@
+# benchmarks/bench_solar_montecarlo.py
+# Monte Carlo solar ROI: 100k scenarios x 10 years, in-process vs the process pool.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_solar_montecarlo
+import os
+import time
+
+from src.solar_montecarlo import simulate_solar_roi
+
+N_SCENARIOS = 100_000
+N_RUNS = 5
+
+
+def _time(n_workers):
+    simulate_solar_roi(25000, N_SCENARIOS, n_workers=n_workers)  # Warm the pool
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        result = simulate_solar_roi(25000, N_SCENARIOS, n_workers=n_workers)
+    return (time.perf_counter() - start) / N_RUNS * 1000, result
+
+
+def main():
+    cores = os.cpu_count() or 1
+    serial_ms, result = _time(1)
+    pool_ms, _ = _time(cores)
+
+    payback = result["payback_percentiles"]
+    print(f"📊 Solar Monte Carlo: {N_SCENARIOS:,} scenarios, {cores} cores")
+    print(f"   Single process:        {serial_ms:8.1f} ms")
+    print(f"   Process pool:          {pool_ms:8.1f} ms")
+    print(
+        f"   Payback P10/P50/P90:   {payback[10]:.2f} / {payback[50]:.2f} / "
+        f"{payback[90]:.2f} years"
+    )
+
+
+if __name__ == "__main__":
+    main()
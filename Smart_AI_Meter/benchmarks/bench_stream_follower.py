@@ -0,0 +1,76 @@
+# benchmarks/bench_stream_follower.py
+# Per-poll cost of picking up 100 new sensor rows as the stream file grows:
+# re-reading the whole CSV vs the incremental tail-follow reader.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_stream_follower
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ring_buffer import LIVE_CAPACITY, new_ring_buffer
+from src.stream_follower import STREAM_COLUMNS, follow_into_buffer, new_follower
+
+FILE_SIZES_MB = (1, 10, 100)
+NEW_ROWS = 100  # ~3 minutes of the sensor at its 2-second rate
+N_POLLS = 5
+
+
+def _rows(n, start):
+    rng = np.random.default_rng(start)
+    times = pd.Timestamp("2025-06-01") + pd.to_timedelta(start + np.arange(n), "s")
+    voltage = rng.normal(220, 2, n)
+    current = rng.normal(8, 3, n)
+    lines = [
+        f"{t},{v},{c},{v * c / 1000}\n" for t, v, c in zip(times, voltage, current)
+    ]
+    return "".join(lines).encode()
+
+
+def _grow_to(path, size_mb):
+    """
+    Appends sensor rows until the file reaches size_mb.
+    """
+    block = _rows(10_000, 0)
+    with open(path, "ab") as f:
+        while f.tell() < size_mb * 1e6:
+            f.write(block)
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "live_stream.csv")
+    with open(path, "w") as f:
+        f.write(",".join(STREAM_COLUMNS) + "\n")
+
+    print(f"📊 Picking up {NEW_ROWS} new rows per poll (median of {N_POLLS})")
+    for size_mb in FILE_SIZES_MB:
+        _grow_to(path, size_mb)
+        follower = new_follower(path)
+        buf = new_ring_buffer(LIVE_CAPACITY)
+        follow_into_buffer(follower, buf)  # Attach (reads only the file's tail)
+
+        full, incremental = [], []
+        for i in range(N_POLLS):
+            with open(path, "ab") as f:
+                f.write(_rows(NEW_ROWS, 10_000 + i * NEW_ROWS))
+
+            start = time.perf_counter()
+            pd.read_csv(path).tail(LIVE_CAPACITY)
+            full.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            got = follow_into_buffer(follower, buf)
+            incremental.append(time.perf_counter() - start)
+            assert got == NEW_ROWS
+
+        full_ms = np.median(full) * 1000
+        inc_ms = np.median(incremental) * 1000
+        print(
+            f"   {os.path.getsize(path) / 1e6:6.0f} MB file: re-read {full_ms:8.1f} ms"
+            f" | follow {inc_ms:6.2f} ms ({full_ms / inc_ms:,.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
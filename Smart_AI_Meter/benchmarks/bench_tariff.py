@@ -0,0 +1,42 @@
+# benchmarks/bench_tariff.py
+# Batch billing benchmark: vectorized slab engine vs the scalar per-meter loop.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_tariff
+import time
+
+import numpy as np
+
+from src.budget import calculate_cost_from_units
+from src.tariff import cost_to_units, units_to_cost
+
+N_METERS = 5_000_000
+N_SCALAR = 100_000  # The scalar loop is timed on a sample and extrapolated
+
+
+def main():
+    rng = np.random.default_rng(42)
+    units = rng.gamma(shape=2.0, scale=150.0, size=N_METERS)
+
+    start = time.perf_counter()
+    bills = units_to_cost(units)
+    forward_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recovered = cost_to_units(bills)
+    inverse_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for u in units[:N_SCALAR].tolist():
+        calculate_cost_from_units(u)
+    scalar_s = (time.perf_counter() - start) * (N_METERS / N_SCALAR)
+
+    assert np.allclose(recovered, units)
+
+    print(f"📊 Batch billing for {N_METERS:,} meters")
+    print(f"   Vectorized units -> cost: {forward_s * 1000:8.1f} ms")
+    print(f"   Vectorized cost -> units: {inverse_s * 1000:8.1f} ms")
+    print(f"   Scalar loop (estimated):  {scalar_s * 1000:8.1f} ms")
+    print(f"   Speedup (forward):        {scalar_s / forward_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_tou.py
+# TOU pricing benchmark: one household (slider path) and a batch of forecasts.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_tou
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.tariff import build_tou_matrix, price_forecast_tou, tou_cost
+
+N_HOUSEHOLDS = 100_000
+N_REPEATS = 1000
+
+
+def main():
+    rng = np.random.default_rng(42)
+    timestamps = pd.date_range("2025-06-02", periods=168, freq="h")
+    future_df = pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "hour": timestamps.hour,
+            "day_of_week": timestamps.dayofweek,
+            "predicted_usage_kwh": rng.gamma(2.0, 0.6, size=168),
+        }
+    )
+
+    # --- 1. SLIDER PATH (one household, new rates every call) ---
+    start = time.perf_counter()
+    for i in range(N_REPEATS):
+        price_forecast_tou(future_df, build_tou_matrix(40 + i % 20, 30))
+    single_us = (time.perf_counter() - start) / N_REPEATS * 1e6
+
+    # --- 2. BATCH PATH (many households sharing the forecast calendar) ---
+    usage = rng.gamma(2.0, 0.6, size=(N_HOUSEHOLDS, 168))
+    start = time.perf_counter()
+    result = tou_cost(usage, timestamps.hour, timestamps.dayofweek)
+    batch_s = time.perf_counter() - start
+
+    print("📊 Time-of-Use pricing")
+    print(f"   Single forecast (168 h):       {single_us:8.1f} µs per slider move")
+    print(
+        f"   Batch {N_HOUSEHOLDS:,} households:  {batch_s * 1000:8.1f} ms "
+        f"(mean bill Rs. {result['total_cost'].mean():,.0f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
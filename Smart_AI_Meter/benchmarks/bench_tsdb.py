@@ -0,0 +1,118 @@
+# benchmarks/bench_tsdb.py
+# Time-range queries on two days of 1 Hz readings from a meter fleet:
+# full scan of a flat binary log + pandas vs the time-series store's rollups.
+# Run from Smart_AI_Meter/:  python -m benchmarks.bench_tsdb [--meters 50]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.meter_simulator import SENSOR_RECORD_DTYPE, new_fleet, simulate_batch
+from src.tsdb import (
+    append_records,
+    flush,
+    hourly_usage,
+    open_tsdb,
+    pick_level,
+    query_range,
+)
+
+START = pd.Timestamp("2025-06-01")
+DAYS = 2
+BATCH_TICKS = 600  # 10 minutes of readings per append
+N_RUNS = 5
+
+QUERIES = [
+    # (label, start, end, meter); the store picks the rollup level
+    ("15 min, 1 meter", "2025-06-02 18:00", "2025-06-02 18:15", 7),
+    ("1 day, 1 meter", "2025-06-02", "2025-06-03", 7),
+    ("2 days, all meters", "2025-06-01", "2025-06-03", None),
+]
+
+
+
+def _ingest(n_meters, folder):
+    """
+    Writes the same readings to a flat binary log and to the store.
+    Returns (log path, store, readings, ingest seconds for the store).
+    """
+    log_path = os.path.join(folder, "flat.bin")
+    db = open_tsdb(os.path.join(folder, "tsdb"))
+    fleet = new_fleet(n_meters)
+    n_batches = DAYS * 86_400 // BATCH_TICKS
+    store_s = 0.0
+    with open(log_path, "wb") as log:
+        for b in range(n_batches):
+            batch_start = START.value + b * BATCH_TICKS * 10**9
+            records = simulate_batch(fleet, batch_start, BATCH_TICKS, 1.0)
+            log.write(records.tobytes())
+            began = time.perf_counter()
+            append_records(db, records)
+            store_s += time.perf_counter() - began
+    began = time.perf_counter()
+    flush(db)
+    store_s += time.perf_counter() - began
+    return log_path, db, n_batches * BATCH_TICKS * n_meters, store_s
+
+
+def _full_scan(log_path, start, end, meter, freq):
+    """
+    What a store without an index has to do: read everything, filter, group.
+    """
+    records = np.fromfile(log_path, dtype=SENSOR_RECORD_DTYPE)
+    ts = records["timestamp_ns"]
+    keep = (ts >= pd.Timestamp(start).value) & (ts < pd.Timestamp(end).value)
+    if meter is not None:
+        keep &= records["meter_id"] == meter
+    df = pd.DataFrame(
+        {
+            "timestamp": ts[keep].astype("datetime64[ns]"),
+            "meter_id": records["meter_id"][keep],
+            "power_kw": records["power_kw"][keep],
+        }
+    )
+    return df.groupby(["meter_id", pd.Grouper(key="timestamp", freq=freq)])[
+        "power_kw"
+    ].agg(["mean", "max", "count"])
+
+
+def _median_ms(fn):
+    runs = []
+    for _ in range(N_RUNS):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return np.median(runs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meters", type=int, default=50)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    log_path, db, n_readings, ingest_s = _ingest(args.meters, folder)
+    print(
+        f"📊 {n_readings:,} readings ({args.meters} meters x {DAYS} days at 1 Hz); "
+        f"store ingest {n_readings / ingest_s / 1e6:.2f} M readings/s"
+    )
+
+    for label, start, end, meter in QUERIES:
+        level = pick_level(pd.Timestamp(start).value, pd.Timestamp(end).value)
+        rows = len(query_range(db, start, end, meter_id=meter))
+        scan_ms = _median_ms(lambda: _full_scan(log_path, start, end, meter, level))
+        store_ms = _median_ms(lambda: query_range(db, start, end, meter_id=meter))
+        print(
+            f"   {label:<20} ({level:>4}, {rows:>6,} rows): full scan "
+            f"{scan_ms:8.1f} ms | store {store_ms:7.2f} ms"
+        )
+
+    usage_ms = _median_ms(lambda: hourly_usage(db, meter_id=7))
+    print(f"   Hourly usage_kwh for clean_data(), 1 meter: {usage_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
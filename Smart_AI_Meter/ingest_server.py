@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+
+from src.ingest import (
+    INGEST_HOST,
+    INGEST_PORT,
+    ingest_stats,
+    new_ingest_server,
+    run_load,
+    start_ingest_server,
+    stop_ingest_server,
+)
+from src.tsdb import TSDB_DIR, close_tsdb, open_tsdb
+
+STATS_EVERY_S = 10
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Meter telemetry ingestion. 'serve' accepts batched "
+        "readings over TCP into the time-series store; 'load' simulates many "
+        "meters reporting to a running server."
+    )
+    parser.add_argument("mode", choices=("serve", "load"))
+    parser.add_argument("--host", default=INGEST_HOST)
+    parser.add_argument("--port", type=int, default=INGEST_PORT)
+    parser.add_argument("--store", default=TSDB_DIR, help="serve: store folder")
+    parser.add_argument(
+        "--sync", action="store_true", help="serve: fsync every write before acking"
+    )
+    parser.add_argument("--meters", type=int, default=20_000, help="load: meters")
+    parser.add_argument(
+        "--connections", type=int, default=50, help="load: client connections"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=2.0, help="load: seconds between reports"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="load: seconds to run"
+    )
+    return parser.parse_args()
+
+
+async def serve(args):
+    db = open_tsdb(args.store)
+    server = new_ingest_server(db, sync=args.sync)
+    listener = await start_ingest_server(server, args.host, args.port)
+    print(f"📡 Ingest server listening on {args.host}:{args.port} -> {args.store}")
+    print("Press Ctrl+C to stop.")
+    try:
+        while True:
+            await asyncio.sleep(STATS_EVERY_S)
+            stats = ingest_stats(server)
+            print(
+                f"⚡ {stats['records']:,} readings | {stats['connections']} clients | "
+                f"queue {stats['queued']} | p99 {stats['p99_ms']:.1f} ms"
+            )
+    finally:
+        await stop_ingest_server(server, listener)
+        close_tsdb(db)
+        print(f"✅ Stored {server['records']:,} readings.")
+
+
+async def load(args):
+    print(
+        f"🚦 {args.meters:,} meters every {args.interval:g} s over "
+        f"{args.connections} connections for {args.duration:g} s..."
+    )
+    result = await run_load(
+        args.host,
+        args.port,
+        args.meters,
+        args.connections,
+        args.interval,
+        args.duration,
+    )
+    print(
+        f"✅ {result['records']:,} readings ({result['records_per_s']:,.0f}/s), "
+        f"{result['acked']:,}/{result['sent']:,} batches acked, "
+        f"{result['errors']} errors"
+    )
+    print(
+        f"   Ack latency: p50 {result['p50_ms']:.1f} ms | "
+        f"p95 {result['p95_ms']:.1f} ms | p99 {result['p99_ms']:.1f} ms"
+    )
+
+
+def main():
+    args = parse_args()
+    try:
+        asyncio.run(serve(args) if args.mode == "serve" else load(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
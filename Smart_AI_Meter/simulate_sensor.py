@@ -1,40 +1,138 @@
-import pandas as pd
-import numpy as np
-import time
+import argparse
 import os
+import time
+
+import pandas as pd
+
+from src.meter_simulator import (
+    OUTPUT_FORMATS,
+    close_sink,
+    inject_faults,
+    new_fleet,
+    open_sink,
+    simulate_batch,
+    write_batch,
+)
 
-FILE_PATH = "data/live_stream.csv"
-os.makedirs("data", exist_ok=True)
+DEFAULT_PATHS = {
+    "csv": "data/live_stream.csv",  # Followed by the dashboard's live monitor
+    "parquet": "data/sensor_stream.parquet",
+    "binary": "data/sensor_stream.bin",
+}
+FLEET_CSV_PATH = "data/fleet_stream.csv"  # CSV from several meters (with meter_id)
 
-# Initialize file with headers if it doesn't exist
-if not os.path.exists(FILE_PATH):
-    pd.DataFrame(columns=["timestamp", "voltage", "current", "power_kw"]).to_csv(
-        FILE_PATH, index=False
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="IoT smart meter simulator. With no options: one meter, "
+        "one reading every 2 seconds, appended to data/live_stream.csv."
+    )
+    parser.add_argument("--meters", type=int, default=1, help="Number of meters")
+    parser.add_argument(
+        "--rate", type=float, default=0.5, help="Readings per second, per meter"
     )
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument("--out", help="Output file (default depends on --format)")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Seconds of readings to produce (default: until Ctrl+C)",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=float,
+        default=2.0,
+        help="Seconds of readings written per batch",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Generate as fast as possible instead of in real time (load tests)",
+    )
+    parser.add_argument(
+        "--faults",
+        type=float,
+        default=0.005,
+        help="Share of readings turned into current spikes / voltage sags",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.fast and args.duration is None:
+        parser.error("--fast needs --duration")
+    if args.meters < 1:
+        parser.error("--meters must be at least 1")
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    # The live monitor follows a single-meter CSV (no meter_id column)
+    live_path = os.path.abspath(DEFAULT_PATHS["csv"])
+    to_live = args.out is not None and os.path.abspath(args.out) == live_path
+    if to_live and (args.format != "csv" or args.meters > 1):
+        parser.error(f"{DEFAULT_PATHS['csv']} takes one meter's CSV; use another --out")
+    return args
 
-print("📡 IoT Sensor Simulation Started... (Data is streaming to data/live_stream.csv)")
-print("Press Ctrl+C to stop.")
 
-while True:
-    
-    now = pd.Timestamp.now()
-    voltage = np.random.normal(220, 2)  # 220V +/- 2V fluctuation
-    current = np.random.normal(8, 3)  # 8 Amps +/- 3A load change
+def main():
+    args = parse_args()
+    if args.out:
+        path = args.out
+    elif args.format == "csv" and args.meters > 1:
+        path = FLEET_CSV_PATH
+    else:
+        path = DEFAULT_PATHS[args.format]
+    fleet = new_fleet(args.meters, seed=args.seed)
+    step_ns = int(round(1e9 / args.rate))
+    ticks_per_batch = max(1, round(args.flush_every * args.rate))
+    total_ticks = None if args.duration is None else round(args.duration * args.rate)
+
+    try:
+        sink = open_sink(path, args.format, n_meters=args.meters)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(
+        f"📡 IoT Sensor Simulation Started... ({args.meters:,} meter(s) at "
+        f"{args.rate:g} Hz, streaming to {path})"
+    )
+    if total_ticks is None:
+        print("Press Ctrl+C to stop.")
+
+    start_ns = pd.Timestamp.now().value
+    began = time.perf_counter()
+    tick = written = 0
+    try:
+        while total_ticks is None or tick < total_ticks:
+            n_ticks = ticks_per_batch
+            if total_ticks is not None:
+                n_ticks = min(n_ticks, total_ticks - tick)
+            batch_start = start_ns + tick * step_ns
+            records = simulate_batch(fleet, batch_start, n_ticks, args.rate)
+            if args.faults:
+                inject_faults(fleet, records, args.faults)
 
-    # 2. Calculate Power (P = V * I)
-    
-    if np.random.random() > 0.8:
-        current += 10  # Sudden load spike
+            if not args.fast:
+                # Real time: a batch is written once its last reading is due
+                due_ns = start_ns + (tick + n_ticks - 1) * step_ns
+                time.sleep(max(0.0, (due_ns - pd.Timestamp.now().value) / 1e9))
+            write_batch(sink, records)
+            tick += n_ticks
+            written += len(records)
 
-    power = (voltage * current) / 1000  # Convert Watts to kW
+            if not args.fast:
+                latest = records[-args.meters :]
+                print(
+                    f"⚡ Reading: {latest['power_kw'].sum():.2f} kW | "
+                    f"{latest['voltage'].mean():.1f} V"
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_sink(sink)
 
-    # 3. Append to CSV
-    new_row = pd.DataFrame(
-        [[now, voltage, current, power]],
-        columns=["timestamp", "voltage", "current", "power_kw"],
+    elapsed = time.perf_counter() - began
+    print(
+        f"✅ Wrote {written:,} readings in {elapsed:.2f} s "
+        f"({written / elapsed:,.0f} samples/s)."
     )
 
-    new_row.to_csv(FILE_PATH, mode="a", header=False, index=False)
 
-    print(f"⚡ Reading: {power:.2f} kW | {voltage:.1f} V")
-    time.sleep(2)  # 2-second sampling rate
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# src/aggregates.py
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.tariff import PEAK_END, PEAK_START
+
+MAX_CACHED_RESULTS = 16  # Small per-frame results (aggregates, fingerprints)
+
+_CACHE = OrderedDict()  # (id(df), name) -> (weakref to df, result)
+
+
+def _mean(total, count):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _heatmap(total, count, index, name):
+    """
+    Mean-per-cell pivot (rows x 24 hours), dropping all-empty rows/columns
+    exactly like pivot_table(aggfunc="mean") does.
+    """
+    pivot = pd.DataFrame(
+        _mean(total, count),
+        index=pd.Index(index, name=name),
+        columns=pd.Index(np.arange(24), name="hour"),
+    )
+    return pivot.dropna(how="all").dropna(axis=1, how="all")
+
+
+def compute_aggregates(df, usage_col="usage_kwh", temp_col="temperature_c"):
+    """
+    Scans a history or forecast frame once and returns every small aggregate
+    the charts and the report need:
+
+    - hourly:     mean usage (and temperature) per hour of day
+    - peak:       total usage per "Off-Peak" / "Peak" period
+    - daily:      per-date usage sum, mean temperature and day name
+    - heat_month: mean usage, day of month x hour
+    - heat_days:  mean usage, day number (1 = first date) x hour
+    - total_usage / mean_temp
+    """
+    # --- 1. ONE PASS: (day, hour) grid of sums and counts ---
+    ts = pd.to_datetime(df["timestamp"])
+    day = ts.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    hour = (df["hour"] if "hour" in df.columns else ts.dt.hour).to_numpy(np.int64)
+    first_day = day.min()
+    n_days = int(day.max() - first_day) + 1
+    key = (day - first_day) * 24 + hour
+
+    def grid(weights=None):
+        counts = np.bincount(key, weights=weights, minlength=n_days * 24)
+        return counts.reshape(n_days, 24)
+
+    usage = df[usage_col].to_numpy(dtype=float)
+    usage_ok = ~np.isnan(usage)
+    rows = grid()
+    usage_sum = grid(np.where(usage_ok, usage, 0.0))
+    usage_n = grid(usage_ok.astype(float))
+
+    has_temp = temp_col in df.columns
+    if has_temp:
+        temp = df[temp_col].to_numpy(dtype=float)
+        temp_ok = ~np.isnan(temp)
+        temp_sum = grid(np.where(temp_ok, temp, 0.0))
+        temp_n = grid(temp_ok.astype(float))
+
+    # --- 2. HOUR OF DAY ---
+    seen_hours = np.flatnonzero(rows.sum(axis=0))
+    hourly = pd.DataFrame(
+        {usage_col: _mean(usage_sum.sum(axis=0), usage_n.sum(axis=0))},
+        index=pd.Index(np.arange(24), name="hour"),
+    )
+    if has_temp:
+        hourly[temp_col] = _mean(temp_sum.sum(axis=0), temp_n.sum(axis=0))
+    hourly = hourly.iloc[seen_hours]
+
+    # --- 3. PEAK / OFF-PEAK (same order as groupby("period")) ---
+    is_peak = (np.arange(24) >= PEAK_START) & (np.arange(24) < PEAK_END)
+    by_hour = usage_sum.sum(axis=0)
+    peak = pd.Series(
+        [by_hour[~is_peak].sum(), by_hour[is_peak].sum()],
+        index=pd.Index(["Off-Peak", "Peak"], name="period"),
+        name=usage_col,
+    )
+    peak = peak[[rows.sum(axis=0)[~is_peak].any(), rows.sum(axis=0)[is_peak].any()]]
+
+    # --- 4. PER DATE ---
+    seen_days = np.flatnonzero(rows.sum(axis=1))
+    dates = pd.DatetimeIndex((first_day + seen_days).astype("datetime64[D]"))
+    daily = pd.DataFrame(
+        {
+            "date": dates.date,
+            "day_name": dates.day_name(),
+            usage_col: usage_sum.sum(axis=1)[seen_days],
+        }
+    )
+    if has_temp:
+        daily[temp_col] = _mean(temp_sum.sum(axis=1), temp_n.sum(axis=1))[seen_days]
+
+    # --- 5. HEATMAPS (regrouped from the small grid, not the frame) ---
+    day_of_month = np.zeros(n_days, dtype=np.int64)
+    day_of_month[seen_days] = dates.day
+    month_key = (day_of_month[:, None] * 24 + np.arange(24)).ravel()
+    month_sum = np.bincount(month_key, usage_sum.ravel(), minlength=32 * 24)
+    month_n = np.bincount(month_key, usage_n.ravel(), minlength=32 * 24)
+
+    return {
+        "usage_col": usage_col,
+        "hourly": hourly,
+        "peak": peak,
+        "daily": daily,
+        "heat_month": _heatmap(
+            month_sum.reshape(32, 24)[1:],
+            month_n.reshape(32, 24)[1:],
+            np.arange(1, 32),
+            "day_of_month",
+        ),
+        "heat_days": _heatmap(
+            usage_sum, usage_n, np.arange(1, n_days + 1), "forecast_day"
+        ),
+        "total_usage": float(usage_sum.sum()),
+        "mean_temp": (
+            float(_mean(temp_sum.sum(), temp_n.sum())) if has_temp else np.nan
+        ),
+    }
+
+
+def cached_for_frame(df, name, compute):
+    """
+    Memoizes compute() per frame object, so repeated reruns with the same
+    DataFrame reuse the result. Frames are treated as read-only.
+    """
+    key = (id(df), name)
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0]() is df:
+        _CACHE.move_to_end(key)
+        return hit[1]
+
+    result = compute()
+    _CACHE[key] = (weakref.ref(df), result)
+    while len(_CACHE) > MAX_CACHED_RESULTS:
+        _CACHE.popitem(last=False)
+    return result
+
+
+def get_aggregates(df, usage_col="usage_kwh", temp_col="temperature_c"):
+    """
+    compute_aggregates() cached per frame, so every chart and the report
+    share one scan of the data.
+    """
+    return cached_for_frame(
+        df,
+        ("aggregates", usage_col, temp_col),
+        lambda: compute_aggregates(df, usage_col, temp_col),
+    )
@@ -0,0 +1,186 @@
+# src/anomaly_detector.py
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.meter_simulator import SENSOR_RECORD_DTYPE
+from src.ring_buffer import LIVE_CHANNELS
+
+HOUR_NS = 3600 * 10**9
+NO_SAMPLE = np.iinfo(np.int64).min
+ALPHA = 0.01  # EWMA weight once a baseline has seen 1 / ALPHA readings
+WARMUP = 30  # Readings an hour-of-day baseline needs before it scores
+Z_THRESHOLD = 5.0  # Deviations (in baseline std) that raise an event
+VOLTAGE_FLOOR_V = 0.5  # Minimum std, so a very steady supply is not all alarms
+CURRENT_FLOOR_A = 0.2
+SPIKE_MAX_GAP_S = 30  # Readings further apart are not compared for spikes
+LATENCY_HISTORY = 1000  # Scoring calls kept for latency percentiles
+EVENT_COLUMNS = ["timestamp", "meter_id", "kind", "value", "score"]
+
+
+def new_detector():
+    """
+    Online detector state. Per meter and hour of day it keeps an EWMA mean and
+    variance of voltage and an EWMA variance of reading-to-reading current
+    changes: 24 x 4 numbers per meter, however long the stream runs.
+    """
+    return {
+        # Arrays indexed by meter_id (and hour of day), grown on demand
+        "n": np.zeros((0, 24), dtype=np.int64),
+        "v_mean": np.zeros((0, 24)),
+        "v_var": np.zeros((0, 24)),
+        "d_var": np.zeros((0, 24)),
+        "last_t": np.empty(0, dtype=np.int64),
+        "last_i": np.empty(0),
+        "last_jump": np.empty(0),  # Current change into the last reading
+        "scored": 0,
+        "events": 0,
+        "latency_s": deque(maxlen=LATENCY_HISTORY),
+    }
+
+
+def _grow(det, n_meters):
+    extra = n_meters - len(det["last_t"])
+    if extra <= 0:
+        return
+    for name in ("n", "v_mean", "v_var", "d_var"):
+        det[name] = np.concatenate([det[name], np.zeros((extra, 24), det[name].dtype)])
+    for name, fill in (("last_t", NO_SAMPLE), ("last_i", 0.0), ("last_jump", np.nan)):
+        pad = np.full(extra, fill, dtype=det[name].dtype)
+        det[name] = np.concatenate([det[name], pad])
+
+
+def _step(det, m, t, v, i, found):
+    """
+    Scores and learns one reading for each of the (distinct) meters m.
+    """
+    h = (t // HOUR_NS) % 24
+    n = det["n"]
+
+    # A meter's first reading in an hour slot starts from the previous hour's
+    # baseline (on day one, a grid-wide step at the hour may be flagged once)
+    seed = (n[m, h] == 0) & (n[m, h - 1] > 0)
+    if seed.any():
+        ms, hs = m[seed], h[seed]
+        for name in ("v_mean", "v_var", "d_var"):
+            det[name][ms, hs] = det[name][ms, hs - 1]
+        n[ms, hs] = np.minimum(n[ms, hs - 1], WARMUP)
+    count = n[m, h]
+    warm = count >= WARMUP
+
+    # --- 1. VOLTAGE AGAINST THE HOUR-OF-DAY BASELINE (sags and surges) ---
+    v_mean, v_var = det["v_mean"][m, h], det["v_var"][m, h]
+    v_std = np.sqrt(v_var) + VOLTAGE_FLOOR_V
+    z_v = (v - v_mean) / v_std
+    off = warm & (np.abs(z_v) > Z_THRESHOLD)
+    if off.any():
+        kind = np.where(z_v[off] < 0, "sag", "surge")
+        found.append((t[off], m[off], kind, v[off], z_v[off]))
+
+    # --- 2. CURRENT SPIKES: UP INTO THE LAST READING, BACK DOWN NOW ---
+    # (flagged one reading late, at the spike's own timestamp)
+    chained = (det["last_t"][m] != NO_SAMPLE) & (
+        t - det["last_t"][m] <= SPIKE_MAX_GAP_S * 10**9
+    )
+    jump = i - det["last_i"][m]
+    d_var = det["d_var"][m, h]
+    d_std = np.sqrt(d_var) + CURRENT_FLOOR_A
+    z_i = np.minimum(det["last_jump"][m], -jump) / d_std
+    spike = warm & chained & (z_i > Z_THRESHOLD)
+    if spike.any():
+        found.append(
+            (
+                det["last_t"][m][spike],
+                m[spike],
+                np.full(spike.sum(), "spike"),
+                det["last_i"][m][spike],
+                z_i[spike],
+            )
+        )
+
+    # --- 3. LEARN (Welford-style mean at first, then EWMA; outliers clipped) ---
+    a = np.maximum(ALPHA, 1 / (count + 1))
+    limit = Z_THRESHOLD * v_std
+    x = np.where(count == 0, v, np.clip(v, v_mean - limit, v_mean + limit))
+    delta = x - v_mean
+    det["v_mean"][m, h] = v_mean + a * delta
+    det["v_var"][m, h] = (1 - a) * (v_var + a * delta**2)
+    clipped = np.clip(jump, -Z_THRESHOLD * d_std, Z_THRESHOLD * d_std)
+    det["d_var"][m, h] = np.where(chained, (1 - a) * d_var + a * clipped**2, d_var)
+    det["last_jump"][m] = np.where(chained, jump, np.nan)
+    det["last_i"][m] = i
+    det["last_t"][m] = t
+    n[m, h] = count + 1
+
+
+def score_readings(det, records):
+    """
+    Scores a batch of SENSOR_RECORD_DTYPE readings (any meters, any order) as
+    they arrive, then learns from them. O(1) work and memory per reading.
+    Returns the events raised, as a DataFrame of EVENT_COLUMNS (kind is
+    "spike", "sag" or "surge"; score is the deviation in baseline std).
+    """
+    began = time.perf_counter()
+    meter = records["meter_id"].astype(np.int64)
+    t = records["timestamp_ns"].astype(np.int64)
+    found = []
+    if len(t):
+        _grow(det, int(meter.max()) + 1)
+        order = np.lexsort((t, meter))
+        meter, t = meter[order], t[order]
+        v = records["voltage"][order].astype(np.float64)
+        i = records["current"][order].astype(np.float64)
+        keep = t > det["last_t"][meter]
+        keep[1:] &= (meter[1:] != meter[:-1]) | (t[1:] != t[:-1])
+        meter, t, v, i = meter[keep], t[keep], v[keep], i[keep]
+
+        # Readings are sequential per meter: step through the k-th reading of
+        # every meter at once (one step per batch for tick-major feeds)
+        starts = np.flatnonzero(np.concatenate(([True], meter[1:] != meter[:-1])))
+        rank = np.arange(len(meter)) - np.repeat(starts, np.diff([*starts, len(meter)]))
+        by_rank = np.argsort(rank, kind="stable")
+        for step in np.split(by_rank, np.cumsum(np.bincount(rank))[:-1]):
+            _step(det, meter[step], t[step], v[step], i[step], found)
+        det["scored"] += len(meter)
+
+    if found:
+        columns = [np.concatenate(column) for column in zip(*found)]
+        events = pd.DataFrame(dict(zip(EVENT_COLUMNS, columns)))
+        events["timestamp"] = events["timestamp"].astype("datetime64[ns]")
+        events = events.sort_values(["timestamp", "meter_id"], ignore_index=True)
+    else:
+        events = pd.DataFrame(columns=EVENT_COLUMNS)
+    det["events"] += len(events)
+    det["latency_s"].append(time.perf_counter() - began)
+    return events
+
+
+def live_records(times, values, meter_id=0):
+    """
+    Live-monitor samples (LIVE_CHANNELS order) as SENSOR_RECORD_DTYPE records.
+    """
+    records = np.zeros(len(times), dtype=SENSOR_RECORD_DTYPE)
+    records["timestamp_ns"] = np.asarray(times, "datetime64[ns]").astype(np.int64)
+    records["meter_id"] = meter_id
+    for channel, column in zip(LIVE_CHANNELS, np.asarray(values).T):
+        records[channel] = column
+    return records
+
+
+def detector_stats(det):
+    """
+    Snapshot for monitoring: readings scored, events raised and scoring
+    latency percentiles (ms) over recent calls.
+    """
+    latency = np.asarray(det["latency_s"]) * 1000
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99]) if len(latency) else [0] * 3
+    return {
+        "meters": len(det["last_t"]),
+        "scored": det["scored"],
+        "events": det["events"],
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
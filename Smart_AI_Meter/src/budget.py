@@ -1,5 +1,8 @@
 import math
 
+from src.optimizer import optimize_device_cuts
+from src.tariff import cost_to_units, units_to_cost
+
 DEVICE_LIBRARY = {
     "Air Conditioner (1.5 Ton)": {
         "kw": 1.5,
@@ -37,6 +40,42 @@ DEVICE_LIBRARY = {
     },
 }
 
+DEFAULT_DEVICES = [{"name": "AC", "kw": 1.5}, {"name": "Heater", "kw": 2.0}]
+
+
+def _build_name_index(library):
+    """
+    Every lowercase substring of every library name -> first library key that
+    contains it (library order), so matching a user name is one dict lookup.
+    """
+    index = {}
+    for key in library:
+        name = key.lower()
+        for i in range(len(name) + 1):
+            for j in range(i, len(name) + 1):
+                index.setdefault(name[i:j], key)
+    return index
+
+
+DEVICE_NAME_INDEX = _build_name_index(DEVICE_LIBRARY)
+
+
+def match_devices(user_selected_devices):
+    """
+    Maps user device names (e.g. "AC", "Motor") to DEVICE_LIBRARY entries.
+    Falls back to a generic AC + Heater pair when nothing matches.
+    """
+    active_devices = []
+    if user_selected_devices:
+        for dev_name in user_selected_devices:
+            key = DEVICE_NAME_INDEX.get(dev_name.lower())
+            if key:
+                active_devices.append({"name": dev_name, **DEVICE_LIBRARY[key]})
+
+    if not active_devices:
+        active_devices = [dict(dev) for dev in DEFAULT_DEVICES]
+    return active_devices
+
 
 def calculate_budget_plan(
     target_bill_rs=None,
@@ -45,20 +84,8 @@ def calculate_budget_plan(
     user_selected_devices=None,
     predicted_kwh=0,
 ):
-    budget_units = 0
     if target_bill_rs and target_bill_rs > 0:
-        money = target_bill_rs
-        if money >= (200 * 18):
-            budget_units += 200
-            money -= 200 * 18
-            if money >= (100 * 30):
-                budget_units += 100
-                money -= 100 * 30
-                budget_units += money / 40
-            else:
-                budget_units += money / 30
-        else:
-            budget_units += money / 18
+        budget_units = float(cost_to_units(target_bill_rs))
 
         target_units = int(budget_units)
         mode = "Strict Budget"
@@ -117,38 +144,25 @@ def calculate_budget_plan(
             )
             gap_to_solve = 0
 
-    active_devices = []
-    if user_selected_devices:
-        for dev_name in user_selected_devices:
-            match = next(
-                (v for k, v in DEVICE_LIBRARY.items() if dev_name.lower() in k.lower()),
-                None,
-            )
-            if match:
-                active_devices.append({"name": dev_name, **match})
-
-    if not active_devices:
-        active_devices = [{"name": "AC", "kw": 1.5}, {"name": "Heater", "kw": 2.0}]
+    active_devices = match_devices(user_selected_devices)
 
     if plan_data["status"] == "WARNING":
         active_devices.sort(key=lambda x: x["kw"], reverse=True)
         daily_cut_needed = gap_to_solve / 7
-        solved = 0
-        for dev in active_devices:
-            if solved >= daily_cut_needed:
-                break
-            hours = (daily_cut_needed - solved) / dev["kw"]
-            if hours > 4:
-                hours = 4
-            if hours < 0.3:
-                hours = 0.5
-
+        cut_plan = optimize_device_cuts(active_devices, daily_cut_needed)
+        for dev, hours in zip(active_devices, cut_plan["hours"]):
+            if hours <= 0:
+                continue
             h = int(hours)
-            m = int((hours - h) * 60)
+            m = int(round((hours - h) * 60))
             plan_data["actions"].append(
                 f"Cut **{dev['name']}** by **{h}hr {m}min/day**"
             )
-            solved += hours * dev["kw"]
+        if not cut_plan["feasible"]:
+            plan_data["actions"].append(
+                f"⚠️ Even these cuts save only {cut_plan['saved_kwh']:.1f} of the "
+                f"{daily_cut_needed:.1f} kWh/day needed. Consider a higher budget."
+            )
 
     elif plan_data["status"] == "SAFE" and predicted_kwh == 0:
         base_load = 4
@@ -159,7 +173,7 @@ def calculate_budget_plan(
             )
         else:
             for dev in active_devices:
-                if dev["type"] == "essential":
+                if dev.get("type") == "essential":
                     continue
 
                 affordable_hours = surplus / dev["kw"]
@@ -181,18 +195,5 @@ def calculate_budget_plan(
     return plan_data
 
 
-def calculate_cost_from_units(units):
-    cost = 0
-    rem = units
-    if rem > 200:
-        cost += 200 * 18
-        rem -= 200
-        if rem > 100:
-            cost += 100 * 30
-            rem -= 100
-            cost += rem * 40
-        else:
-            cost += rem * 30
-    else:
-        cost += rem * 18
-    return cost
+def calculate_cost_from_units(units, table=None):
+    return float(units_to_cost(units, table))
@@ -0,0 +1,247 @@
+# src/budget_batch.py
+import numpy as np
+
+from src.budget import DEFAULT_DEVICES, DEVICE_LIBRARY, match_devices
+from src.budget_sweep import (
+    STATUS_CRITICAL,
+    STATUS_NAMES,
+    STATUS_SAFE,
+    STATUS_WARNING,
+    evaluate_plan_arrays,
+)
+from src.optimizer import build_cut_table, solve_from_table
+
+# Columns of a household x device mask (see mask_groups)
+BATCH_DEVICES = [{"name": k, **v} for k, v in DEVICE_LIBRARY.items()]
+BATCH_DEVICE_NAMES = [dev["name"] for dev in BATCH_DEVICES]
+BASE_LOAD_KWH = 4  # Daily fridge + lights allowance in calculator mode
+
+
+def device_groups(device_sets):
+    """
+    Per-household lists of user device names (as typed in the app) -> the
+    households argument of batch_budget_plans. Each distinct list is matched
+    once, keeping the user's names, order and duplicates.
+    """
+    set_of = {}
+    set_ids = [
+        set_of.setdefault(tuple(names or ()), len(set_of)) for names in device_sets
+    ]
+    return {
+        "set_ids": np.array(set_ids, dtype=np.int64),
+        "sets": [match_devices(list(names)) for names in set_of],
+    }
+
+
+def mask_groups(masks):
+    """
+    Boolean (n_households, len(BATCH_DEVICE_NAMES)) mask -> the households
+    argument of batch_budget_plans. Devices are named by their library keys;
+    empty rows fall back to the generic AC + Heater pair.
+    """
+    masks = np.asarray(masks, dtype=bool)
+    # Device sets -> integer codes so grouping is a 1-D unique, not a row sort
+    bits = np.left_shift(1, np.arange(masks.shape[1], dtype=np.int64))
+    codes, set_ids = np.unique(masks.astype(np.int64) @ bits, return_inverse=True)
+    sets = [
+        [dict(BATCH_DEVICES[c]) for c in np.flatnonzero(code & bits)]
+        or [dict(dev) for dev in DEFAULT_DEVICES]
+        for code in codes
+    ]
+    return {"set_ids": set_ids.astype(np.int64), "sets": sets}
+
+
+def _set_arrays(sets, value, pad, dtype=float):
+    """
+    value(device) for every device of every set, as a (n_sets, longest set)
+    array padded with pad.
+    """
+    out = np.full((len(sets), max(map(len, sets), default=0)), pad, dtype=dtype)
+    for k, devices in enumerate(sets):
+        out[k, : len(devices)] = [value(dev) for dev in devices]
+    return out
+
+
+def _solve_cut_hours(daily_cut_needed, households):
+    """
+    Optimizer cut hours for every WARNING household, per device of its set:
+    one DP table per distinct set, then vectorized backtracking over all
+    households sharing it.
+    """
+    set_ids, sets = households["set_ids"], households["sets"]
+    cut_hours = np.zeros((len(set_ids), max(map(len, sets), default=0)), np.float32)
+    rows = np.flatnonzero(daily_cut_needed > 0)
+    if len(rows) == 0:
+        return cut_hours
+
+    present, inverse = np.unique(set_ids[rows], return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(present) + 1))
+
+    for g, k in enumerate(present):
+        group = rows[order[bounds[g] : bounds[g + 1]]]
+        devices = sets[k]
+        # Same device order as calculate_budget_plan so ties resolve identically
+        cols = np.argsort([-dev["kw"] for dev in devices], kind="stable")
+        needs = daily_cut_needed[group]
+        table = build_cut_table(
+            [devices[c] for c in cols], needs.max(), max_cells=np.inf
+        )
+        cut_hours[np.ix_(group, cols)] = solve_from_table(table, needs)
+    return cut_hours
+
+
+def batch_budget_plans(
+    target_bills, predicted_kwh, days_left, households, current_usage_kwh=0
+):
+    """
+    Columnar calculate_budget_plan for many households at once.
+
+    - target_bills / predicted_kwh / days_left / current_usage_kwh: arrays (or scalars)
+    - households: device sets from device_groups (user names) or mask_groups
+
+    Returns a dict of arrays: status codes, gap, daily limit, cut hours
+    (WARNING households) and allowed run hours (calculator mode), each per
+    device of the household's set, in the set's order.
+    Use format_plan() to turn one row into the usual text plan, lazily.
+    """
+    set_ids, sets = households["set_ids"], households["sets"]
+    target_bills, predicted_kwh, days_left, current_usage_kwh, _ = np.broadcast_arrays(
+        np.asarray(target_bills, dtype=float),
+        np.asarray(predicted_kwh, dtype=float),
+        np.asarray(days_left, dtype=float),
+        np.asarray(current_usage_kwh, dtype=float),
+        set_ids,
+    )
+    core = evaluate_plan_arrays(
+        target_bills, predicted_kwh, days_left, current_usage_kwh
+    )
+
+    # --- 1. DEVICE SETS (one padded row of attributes per distinct set) ---
+    # (padding: infinite kW, so a missing device never gets run hours)
+    kw = _set_arrays(sets, lambda dev: dev["kw"], np.inf)[set_ids]
+    max_hours = _set_arrays(sets, lambda dev: dev.get("max_hours", 24), 24)[set_ids]
+    essential = _set_arrays(
+        sets, lambda dev: dev.get("type") == "essential", True, bool
+    )[set_ids]
+
+    # --- 2. WARNING: optimizer cuts ---
+    daily_cut_needed = np.where(
+        core["status"] == STATUS_WARNING, core["gap_units"] / 7, 0.0
+    )
+    cut_hours = _solve_cut_hours(daily_cut_needed, households)
+    saved_kwh = (cut_hours * np.where(np.isfinite(kw), kw, 0)).sum(axis=1)
+
+    # --- 3. CALCULATOR MODE: how long each device may run per day ---
+    calculator_safe = (core["status"] == STATUS_SAFE) & (predicted_kwh == 0)
+    surplus = np.where(calculator_safe, core["daily_limit"] - BASE_LOAD_KWH, -1.0)
+    run_hours = np.minimum(np.maximum(surplus, 0)[:, None] / kw, max_hours)
+    runnable = ~essential & (surplus >= 0)[:, None] & (run_hours >= 0.5)
+    run_hours = np.where(runnable, run_hours, 0.0)
+
+    return {
+        "target_bill_rs": target_bills,
+        "predicted_kwh": predicted_kwh,
+        "days_left": days_left,
+        "current_usage_kwh": current_usage_kwh,
+        "status": core["status"],
+        "target_units": core["target_units"],
+        "gap_units": core["gap_units"],
+        "daily_limit": core["daily_limit"],
+        "daily_cut_needed": daily_cut_needed,
+        "saved_kwh": saved_kwh,
+        "low_limit": calculator_safe & (surplus < 0),
+        "cut_hours": cut_hours,
+        "run_hours": run_hours,
+        "set_ids": set_ids,
+        "device_sets": sets,
+    }
+
+
+def _hours_text(hours, style):
+    h = int(hours)
+    if style == "cut":
+        return f"{h}hr {int(round((hours - h) * 60))}min"
+    m = int((hours - h) * 60)
+    return f"{h} hours {m} mins" if m > 0 else f"{h} hours"
+
+
+def format_plan(result, i):
+    """
+    Lazy string step: renders household i of a batch result into the same
+    plan dict (mode, message, actions) that calculate_budget_plan returns.
+    """
+    status = int(result["status"][i])
+    predicted = float(result["predicted_kwh"][i])
+    target_units = float(result["target_units"][i])
+    gap = float(result["gap_units"][i])
+    daily_limit = float(result["daily_limit"][i])
+    devices = result["device_sets"][result["set_ids"][i]]
+
+    plan = {
+        "mode": (
+            "Strict Budget"
+            if result["target_bill_rs"][i] > 0
+            else "Efficiency Optimization"
+        ),
+        "target_units": round(target_units, 1),
+        "predicted_units": round(predicted, 1),
+        "actions": [],
+        "status": STATUS_NAMES[status],
+        "gap_units": round(gap, 1),
+        "daily_limit": round(daily_limit, 1),
+    }
+
+    if status == STATUS_WARNING:
+        plan["message"] = (
+            f"⚠️ **Action Needed!** You are projected to exceed your budget by {gap:.1f} kWh."
+        )
+        # Largest loads first, as calculate_budget_plan lists them
+        for j in sorted(range(len(devices)), key=lambda j: -devices[j]["kw"]):
+            hours = float(result["cut_hours"][i, j])
+            if hours > 0:
+                plan["actions"].append(
+                    f"Cut **{devices[j]['name']}** by "
+                    f"**{_hours_text(hours, 'cut')}/day**"
+                )
+        saved = float(result["saved_kwh"][i])
+        need = float(result["daily_cut_needed"][i])
+        if saved + 1e-6 < need:
+            plan["actions"].append(
+                f"⚠️ Even these cuts save only {saved:.1f} of the "
+                f"{need:.1f} kWh/day needed. Consider a higher budget."
+            )
+    elif predicted > 0:
+        plan["message"] = (
+            "✅ **You are safe!** Your target budget covers your predicted usage."
+        )
+        plan["actions"].append("Maintain current usage patterns.")
+    elif status == STATUS_CRITICAL:
+        plan["message"] = (
+            f"🚨 **Budget Exceeded!** You have already used "
+            f"{result['current_usage_kwh'][i]:g} units. Stop usage immediately."
+        )
+    else:
+        plan["message"] = (
+            f"✅ **Budget Plan:** You can use **{daily_limit:.1f} kWh/day** for the "
+            f"next {int(result['days_left'][i])} days."
+        )
+        if result["low_limit"][i]:
+            plan["actions"].append("⚠️ Limit is very low! Run ONLY Fridge & Lights.")
+        for j in np.flatnonzero(result["run_hours"][i] > 0):
+            hours = float(result["run_hours"][i, j])
+            plan["actions"].append(
+                f"🟢 You can run **{devices[j]['name']}** for "
+                f"**{_hours_text(hours, 'run')}/day**"
+            )
+
+    plan["action_plan"] = plan["actions"]
+    return plan
+
+
+def iter_plans(result):
+    """
+    Generator over formatted plans, so callers only pay for the rows they render.
+    """
+    for i in range(len(result["status"])):
+        yield format_plan(result, i)
@@ -0,0 +1,119 @@
+# src/budget_sweep.py
+import numpy as np
+import pandas as pd
+
+from src.budget import match_devices
+from src.optimizer import build_cut_table, solve_from_table
+from src.tariff import cost_to_units
+
+STATUS_SAFE = 0
+STATUS_WARNING = 1
+STATUS_CRITICAL = 2
+STATUS_NAMES = np.array(["SAFE", "WARNING", "CRITICAL"])
+
+
+def evaluate_plan_arrays(
+    target_bill_rs, predicted_kwh=0, days_left=30, current_usage_kwh=0
+):
+    """
+    Vectorized core of calculate_budget_plan: status, gap and daily limit for
+    any broadcastable arrays of inputs (no device logic, no strings).
+    """
+    target_bill_rs = np.asarray(target_bill_rs, dtype=float)
+    predicted_kwh = np.asarray(predicted_kwh, dtype=float)
+    days_left = np.asarray(days_left, dtype=float)
+    current_usage_kwh = np.asarray(current_usage_kwh, dtype=float)
+    target_bill_rs, predicted_kwh, days_left, current_usage_kwh = np.broadcast_arrays(
+        target_bill_rs, predicted_kwh, days_left, current_usage_kwh
+    )
+
+    # --- 1. TARGET UNITS (Strict Budget vs Efficiency Optimization) ---
+    has_budget = target_bill_rs > 0
+    budget_units = np.floor(cost_to_units(np.where(has_budget, target_bill_rs, 0)))
+    fallback_units = np.where(predicted_kwh > 0, predicted_kwh * 0.9, 300.0)
+    target_units = np.where(has_budget, budget_units, fallback_units)
+
+    # --- 2. PREDICTION MODE vs CALCULATOR MODE ---
+    prediction_mode = predicted_kwh > 0
+    safe_days = np.where(days_left > 0, days_left, 1)
+
+    gap_units = np.where(prediction_mode, predicted_kwh - target_units, 0.0)
+    remaining_units = np.where(
+        prediction_mode, target_units, target_units - current_usage_kwh
+    )
+    daily_limit = np.where(days_left > 0, remaining_units / safe_days, 0.0)
+
+    status = np.full(target_units.shape, STATUS_SAFE, dtype=np.int8)
+    status[prediction_mode & (gap_units > 0)] = STATUS_WARNING
+    status[~prediction_mode & (remaining_units <= 0)] = STATUS_CRITICAL
+
+    return {
+        "status": status,
+        "target_units": target_units,
+        "gap_units": gap_units,
+        "daily_limit": daily_limit,
+    }
+
+
+def sweep_budget_plans(
+    target_bills,
+    days_left=(30,),
+    device_sets=None,
+    predicted_kwh=0,
+    current_usage_kwh=0,
+):
+    """
+    What-if sweep: evaluates every (target budget x days left x device set)
+    combination in one vectorized call.
+
+    Returns a compact DataFrame with status, gap, daily limit and the daily cut
+    hours per device (one 'cut_<device>' column per device name).
+    """
+    device_sets = [None] if device_sets is None else list(device_sets)
+    bills, days, set_idx = np.meshgrid(
+        np.asarray(target_bills, dtype=float),
+        np.asarray(days_left, dtype=float),
+        np.arange(len(device_sets)),
+        indexing="ij",
+    )
+    bills, days, set_idx = bills.ravel(), days.ravel(), set_idx.ravel()
+
+    core = evaluate_plan_arrays(bills, predicted_kwh, days, current_usage_kwh)
+    daily_cut_needed = np.where(
+        core["status"] == STATUS_WARNING, core["gap_units"] / 7, 0.0
+    )
+
+    # --- DEVICE CUTS (one optimizer DP table per device set, reused by all rows) ---
+    # Same device order as calculate_budget_plan so ties resolve identically
+    matched_sets = [
+        sorted(match_devices(names), key=lambda x: x["kw"], reverse=True)
+        for names in device_sets
+    ]
+    device_names = list(
+        dict.fromkeys(dev["name"] for devices in matched_sets for dev in devices)
+    )
+    column_of = {name: j for j, name in enumerate(device_names)}
+    cuts = np.zeros((len(bills), len(device_names)))
+    for k, devices in enumerate(matched_sets):
+        rows = np.flatnonzero(set_idx == k)
+        needs = daily_cut_needed[rows]
+        table = build_cut_table(devices, needs.max(initial=0), max_cells=np.inf)
+        set_cuts = solve_from_table(table, needs)
+        for i, dev in enumerate(devices):
+            cuts[rows, column_of[dev["name"]]] += set_cuts[:, i]
+
+    table = pd.DataFrame(
+        {
+            "target_bill_rs": bills,
+            "days_left": days.astype(int),
+            "device_set": set_idx,
+            "status": STATUS_NAMES[core["status"]],
+            "target_units": core["target_units"],
+            "gap_units": core["gap_units"].round(1),
+            "daily_limit": core["daily_limit"].round(1),
+            "total_cut_hours": cuts.sum(axis=1).round(2),
+        }
+    )
+    for j, name in enumerate(device_names):
+        table[f"cut_{name}"] = cuts[:, j].round(2)
+    return table
@@ -0,0 +1,171 @@
+# src/chat_context.py
+import math
+import re
+
+SYSTEM_PROMPT = (
+    "You are a helpful energy expert. Use this live system data: {facts}. "
+    "STRICT MATH RULES: "
+    "1. NEVER subtract 'Units (kWh)' from 'Money (Rs)'. "
+    "2. Always convert device usage to cost before subtracting from a budget. "
+    "3. Assume 1 Unit (kWh) = Rs. 40 roughly. "
+    "4. Keep answers short, concise, and unit-accurate."
+)
+
+DEFAULT_TOKEN_BUDGET = 1200  # Whole prompt (system + summary + raw turns)
+SUMMARY_TOKEN_BUDGET = 250  # Cap for the rolling summary of older turns
+MIN_RECENT_TURNS = 2  # Always send at least the latest exchange verbatim
+CHARS_PER_TOKEN = 4  # Llama-style BPE averages ~4 chars per English token
+MESSAGE_OVERHEAD_TOKENS = 4  # Role markers / separators per chat message
+LEGACY_WINDOW = 10  # Old behaviour: last 10 raw messages, used for savings stats
+
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate (no tokenizer download needed).
+    Good enough to enforce a budget and to compare prompt sizes turn by turn.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _message_tokens(msg):
+    return estimate_tokens(msg["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def build_plan_facts(agent_plan):
+    """
+    Compresses the agent plan into one compact line of facts for the system prompt.
+    """
+    if not agent_plan:
+        return "No budget plan generated yet"
+
+    facts = [
+        f"Target {agent_plan.get('target_units', 0)} kWh",
+        f"Predicted {agent_plan.get('predicted_units', 0)} kWh",
+        f"Gap {agent_plan.get('gap_units', 0)} kWh",
+        f"Daily limit {agent_plan.get('daily_limit', 0)} kWh",
+        f"Status {agent_plan.get('status', 'Unknown')}",
+    ]
+    actions = [a.replace("*", "") for a in agent_plan.get("actions", [])]
+    if actions:
+        facts.append("Actions: " + "; ".join(actions))
+    return " | ".join(facts)
+
+
+def _legacy_plan_context(agent_plan):
+    """
+    The verbose plan block the old prompt embedded (indentation included, as
+    it was sent), kept only to measure what the compact facts save.
+    """
+    if not agent_plan:
+        return ""
+    pad = " " * 16
+    lines = [
+        "[LIVE SYSTEM DATA]",
+        f"- Target Budget: {agent_plan.get('target_units', 0)} kWh",
+        f"- Projected Usage: {agent_plan.get('predicted_units', 0)} kWh",
+        f"- Current Status: {agent_plan.get('status', 'Unknown')}",
+        f"- REQUIRED ACTIONS: {', '.join(agent_plan.get('actions', []))}",
+    ]
+    return "\n" + "".join(pad + line + "\n" for line in lines) + pad
+
+
+def summarize_turn(msg, max_chars=160):
+    """
+    Extractive one-line summary of a chat turn (first sentence, markdown stripped).
+    """
+    text = re.sub(r"[*#`>_]+", "", msg["content"])
+    text = " ".join(text.split())
+    first = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(first) > max_chars:
+        first = first[: max_chars - 3].rstrip() + "..."
+    speaker = "User" if msg["role"] == "user" else "Assistant"
+    return f"{speaker}: {first}"
+
+
+def _update_summary(messages, summary_state, upto):
+    """
+    Folds messages[summary_state['upto']:upto] into the cached running summary.
+    Only newly evicted turns are summarized, so each turn is compressed once.
+    """
+    start = summary_state.get("upto", 0)
+    if upto <= start:
+        return summary_state
+
+    lines = summary_state.get("lines", [])
+    lines.extend(summarize_turn(m) for m in messages[start:upto])
+
+    # Drop the oldest summary lines once the summary itself exceeds its budget
+    total = sum(estimate_tokens(line) for line in lines)
+    while lines and total > SUMMARY_TOKEN_BUDGET:
+        total -= estimate_tokens(lines.pop(0))
+
+    summary_state["lines"] = lines
+    summary_state["upto"] = upto
+    summary_state["text"] = "\n".join(lines)
+    return summary_state
+
+
+def build_chat_context(
+    messages, agent_plan=None, summary_state=None, token_budget=DEFAULT_TOKEN_BUDGET
+):
+    """
+    Builds the message list for the chat model under a token budget.
+
+    - System prompt carries only the compact agent-plan facts.
+    - Newest turns are sent verbatim while they fit the budget.
+    - Older turns are compressed into a cached running summary (summary_state,
+      a plain dict the caller keeps in session state between turns).
+
+    Returns (history_for_ai, stats) where stats reports prompt tokens for this turn.
+    """
+    if summary_state is None:
+        summary_state = {}
+
+    system_content = SYSTEM_PROMPT.format(facts=build_plan_facts(agent_plan))
+    system_tokens = estimate_tokens(system_content) + MESSAGE_OVERHEAD_TOKENS
+
+    # --- 1. FIT RECENT TURNS (newest first) ---
+    available = token_budget - system_tokens - SUMMARY_TOKEN_BUDGET
+    floor = summary_state.get("upto", 0)
+    cut = len(messages)
+    used = 0
+    while cut > floor:
+        cost = _message_tokens(messages[cut - 1])
+        kept = len(messages) - cut
+        if used + cost > available and kept >= MIN_RECENT_TURNS:
+            break
+        used += cost
+        cut -= 1
+
+    # --- 2. COMPRESS EVERYTHING OLDER INTO THE SUMMARY ---
+    _update_summary(messages, summary_state, cut)
+
+    history_for_ai = [{"role": "system", "content": system_content}]
+    summary_tokens = 0
+    if summary_state.get("text"):
+        summary_content = "Summary of earlier conversation:\n" + summary_state["text"]
+        summary_tokens = estimate_tokens(summary_content) + MESSAGE_OVERHEAD_TOKENS
+        history_for_ai.append({"role": "system", "content": summary_content})
+    history_for_ai.extend(messages[cut:])
+
+    # --- 3. STATS (vs. the old "full context + last 10 raw messages" prompt) ---
+    legacy_system = SYSTEM_PROMPT.format(facts=_legacy_plan_context(agent_plan))
+    legacy_tokens = (
+        estimate_tokens(legacy_system)
+        + MESSAGE_OVERHEAD_TOKENS
+        + sum(_message_tokens(m) for m in messages[-LEGACY_WINDOW:])
+    )
+    prompt_tokens = system_tokens + summary_tokens + used
+    stats = {
+        "prompt_tokens": prompt_tokens,
+        "system_tokens": system_tokens,
+        "summary_tokens": summary_tokens,
+        "history_tokens": used,
+        "raw_turns": len(messages) - cut,
+        "summarized_turns": cut,
+        "legacy_tokens": legacy_tokens,
+        "token_budget": token_budget,
+    }
+    return history_for_ai, stats
@@ -0,0 +1,191 @@
+# src/disaggregation.py
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.budget import DEVICE_LIBRARY, DEVICE_NAME_INDEX
+from src.meter_simulator import DEVICE_TYPE_PATTERNS
+
+HOUR_NS = 3600 * 10**9
+EDGE_WINDOW_S = 10  # Seconds averaged on each side of a candidate step
+MIN_STEP_KW = 0.1  # Smaller steps are lost in measurement noise
+STEP_Z = 4.0  # ...as are steps within 4 std of the noise around them
+MATCH_TOLERANCE = 0.1  # A step within 10% of a rating counts as that device...
+MATCH_MIN_KW = 0.05  # ...or within 50 W, whichever is wider
+MAX_RUN_FACTOR = 10  # Longest believable run, in multiples of the type's usual
+METER_CHUNK = 64  # Meters processed together (bounds temporary arrays)
+MIN_RUNTIME_H = 0.25  # Less than this in the data does not count as "in use"
+
+
+def detect_steps(power_kw, rate_hz=1.0):
+    """
+    Vectorized edge detector over a (meters, samples) array: at every sample,
+    the mean of the next EDGE_WINDOW_S seconds minus the mean of the previous
+    ones. A clean step gives a triangular peak centred on it, so steps are
+    local maxima of that difference, at least MIN_STEP_KW and STEP_Z times
+    the noise within the two windows.
+    Returns (meter row, sample index, step kW) for every step found.
+    """
+    power_kw = np.atleast_2d(np.asarray(power_kw, dtype=np.float64))
+    n_meters, n = power_kw.shape
+    w = max(1, round(EDGE_WINDOW_S * rate_hz))
+    if n < 2 * w:
+        return np.empty(0, int), np.empty(0, int), np.empty(0)
+
+    # --- 1. WINDOWED MEANS AND VARIANCES FROM RUNNING SUMS ---
+    t = np.arange(w, n - w + 1)
+    csum = np.zeros((n_meters, n + 1))
+    np.cumsum(power_kw, axis=1, out=csum[:, 1:])
+    sums = csum[:, w:] - csum[:, :-w]  # Window starting at j: p[j : j + w]
+    np.cumsum(power_kw**2, axis=1, out=csum[:, 1:])
+    squares = csum[:, w:] - csum[:, :-w]
+    mean_b, mean_a = sums[:, : len(t)] / w, sums[:, w:] / w
+    var_b = np.maximum(squares[:, : len(t)] / w - mean_b**2, 0)
+    var_a = np.maximum(squares[:, w:] / w - mean_a**2, 0)
+    diff = mean_a - mean_b
+
+    # --- 2. SIGNIFICANT LOCAL MAXIMA OF |diff| (first sample of a plateau) ---
+    size = np.abs(diff)
+    padded = np.pad(size, ((0, 0), (w, w)))
+    peak = sliding_window_view(padded, 2 * w + 1, axis=1).max(axis=2)
+    noise = np.sqrt((var_a + var_b) / w)
+    is_step = (size >= MIN_STEP_KW) & (size > STEP_Z * noise) & (size == peak)
+    is_step[:, 1:] &= size[:, 1:] > size[:, :-1]
+    rows, cols = np.nonzero(is_step)
+    return rows, t[cols], diff[rows, cols]
+
+
+def _device_tables(devices):
+    """
+    Devices grouped by rating (identical ratings cannot be told apart by step
+    size), plus each device's typical on-share per hour of day.
+    """
+    kw = np.array([dev["kw"] for dev in devices.values()])
+    class_kw, device_class = np.unique(kw, return_inverse=True)
+    members = device_class[None, :] == np.arange(len(class_kw))[:, None]
+    patterns = [DEVICE_TYPE_PATTERNS[dev["type"]] for dev in devices.values()]
+    duty = np.array([p["duty"] for p in patterns]).T  # (24, devices)
+    # Runs far longer than a device type's usual ones are mismatched steps
+    longest_s = np.array([p["on_s"] for p in patterns]) * MAX_RUN_FACTOR
+    max_run_s = (members * longest_s).max(axis=1)
+    return class_kw, members, duty, max_run_s
+
+
+def _runtime_chunk(power_kw, start_ns, rate_hz, tables):
+    """
+    Per-device runtime (hours) for a chunk of meters, shape (meters, devices).
+    """
+    class_kw, members, duty, max_run_s = tables
+    n_meters, n = power_kw.shape
+    runtime = np.zeros((n_meters, members.shape[1]))
+    rows, at, step = detect_steps(power_kw, rate_hz)
+
+    # --- 1. MATCH EVERY STEP TO THE NEAREST RATING ---
+    cls = np.abs(np.abs(step)[:, None] - class_kw).argmin(axis=1)
+    error = np.abs(np.abs(step) - class_kw[cls])
+    ok = error <= np.maximum(MATCH_MIN_KW, MATCH_TOLERANCE * class_kw[cls])
+    rows, at, cls, sign = rows[ok], at[ok], cls[ok], np.sign(step[ok]).astype(int)
+    if len(rows) == 0:
+        return runtime
+
+    # --- 2. PAIR EACH "ON" WITH THE NEXT STEP OF ITS RATING, IF IT IS AN "OFF" ---
+    group = rows * len(class_kw) + cls
+    order = np.lexsort((at, group))
+    group, rows, at, cls, sign = (x[order] for x in (group, rows, at, cls, sign))
+    same = group[1:] == group[:-1]
+    paired = np.flatnonzero(same & (sign[:-1] > 0) & (sign[1:] < 0))
+    # Unpaired ends: on before the data starts, or still on when it stops
+    first = np.flatnonzero(np.concatenate(([True], ~same)))
+    last = np.flatnonzero(np.concatenate((~same, [True])))
+    lead = first[sign[first] < 0]
+    tail = last[sign[last] > 0]
+    idx = np.concatenate([paired, lead, tail])
+    on_from = np.concatenate([at[paired], np.zeros(len(lead), int), at[tail]])
+    on_to = np.concatenate([at[paired + 1], at[lead], np.full(len(tail), n)])
+    rows, cls, on_s = rows[idx], cls[idx], (on_to - on_from) / rate_hz
+    believable = on_s <= max_run_s[cls]
+    rows, cls, on_s, on_from = (x[believable] for x in (rows, cls, on_s, on_from))
+
+    # --- 3. SHARE EACH RUN AMONG SAME-RATED DEVICES BY HOUR OF DAY ---
+    hour = ((start_ns + on_from * (1e9 / rate_hz)) // HOUR_NS).astype(int) % 24
+    weights = members[cls] * (duty[hour] + 0.01)
+    weights /= weights.sum(axis=1, keepdims=True)
+    np.add.at(runtime, rows, on_s[:, None] * weights)
+    return runtime / 3600
+
+
+def disaggregate(power_kw, start, rate_hz=1.0, devices=DEVICE_LIBRARY):
+    """
+    Estimates how long each appliance ran from aggregate power alone.
+
+    power_kw: regularly sampled readings, one meter (samples,) or many
+    (meters, samples), starting at `start`. Step changes are matched to the
+    devices' kW ratings; devices sharing a rating split the time by their
+    usual hours. Devices below MIN_STEP_KW cannot be seen (NaN).
+    Returns one row per meter and device: meter_id, device, kw, runtime_h,
+    energy_kwh.
+    """
+    power_kw = np.atleast_2d(np.asarray(power_kw, dtype=np.float64))
+    visible = {k: v for k, v in devices.items() if v["kw"] >= MIN_STEP_KW}
+    tables = _device_tables(visible)
+    start_ns = pd.Timestamp(start).value
+
+    runtime = np.vstack(
+        [
+            _runtime_chunk(power_kw[i : i + METER_CHUNK], start_ns, rate_hz, tables)
+            for i in range(0, len(power_kw), METER_CHUNK)
+        ]
+    )
+    names = list(devices)
+    column = {name: visible_idx for visible_idx, name in enumerate(visible)}
+    runtime_h = np.full((len(power_kw), len(names)), np.nan)
+    for j, name in enumerate(names):
+        if name in column:
+            runtime_h[:, j] = runtime[:, column[name]]
+
+    kw = np.array([devices[name]["kw"] for name in names])
+    return pd.DataFrame(
+        {
+            "meter_id": np.repeat(np.arange(len(power_kw)), len(names)),
+            "device": np.tile(names, len(power_kw)),
+            "kw": np.tile(kw, len(power_kw)),
+            "runtime_h": runtime_h.ravel(),
+            "energy_kwh": (runtime_h * kw).ravel(),
+        }
+    )
+
+
+def disaggregate_frame(df, devices=DEVICE_LIBRARY):
+    """
+    One meter's timestamp / power_kw readings (e.g. the live stream CSV),
+    put on a regular grid at their median spacing, then disaggregated.
+    """
+    readings = df.set_index("timestamp")["power_kw"].sort_index()
+    step = readings.index.to_series().diff().median()
+    if readings.empty or pd.isna(step):
+        return disaggregate(np.empty((1, 0)), pd.Timestamp(0), devices=devices)
+    regular = readings.resample(step).mean().interpolate()
+    return disaggregate(regular.to_numpy(), regular.index[0], 1e9 / step.value, devices)
+
+
+def devices_that_ran(usage, user_names, min_runtime_h=MIN_RUNTIME_H):
+    """
+    The user-facing device names (e.g. "AC", "Motor") for the appliances a
+    disaggregate() result says ran. A device with no name of its own maps to
+    the first name of the same type (an AC of any size ticks "AC").
+    """
+    mapped = {name: DEVICE_NAME_INDEX.get(name.lower()) for name in user_names}
+    ran = usage.loc[usage["runtime_h"] >= min_runtime_h, "device"].unique()
+    picked = []
+    for device in ran:
+        kind = DEVICE_LIBRARY.get(device, {}).get("type")
+        exact = [name for name, key in mapped.items() if key == device]
+        similar = [
+            name
+            for name, key in mapped.items()
+            if key and DEVICE_LIBRARY[key]["type"] == kind
+        ]
+        for name in (exact or similar)[:1]:
+            if name not in picked:
+                picked.append(name)
+    return [name for name in user_names if name in picked]
@@ -0,0 +1,70 @@
+# src/downsample.py
+import numpy as np
+
+# ~2 points per horizontal pixel of a 6-inch, 120-dpi chart; beyond this
+# extra points are invisible but still cost render time and PNG bytes.
+MAX_PLOT_POINTS = 1500
+
+
+def lttb_indices(y, n_out, x=None):
+    """
+    Largest-Triangle-Three-Buckets: picks n_out row positions that keep the
+    visual shape (peaks and dips) of the series. First and last points are
+    always kept. Returns all positions when the series is already small.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # --- 1. BUCKETS (interior points 1 .. n-2, n_out - 2 buckets) ---
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+
+    # Average point of every bucket, all at once; the last bucket's
+    # "next bucket" is the final point itself.
+    y_filled = np.nan_to_num(y)
+    avg_x = np.add.reduceat(x[: n - 1], starts) / counts
+    avg_y = np.add.reduceat(y_filled[: n - 1], starts) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y_filled[-1])
+
+    # --- 2. SELECTION (each bucket depends on the previous pick) ---
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        s, e = starts[i], ends[i]
+        ax, ay = x[a], y_filled[a]
+        area = np.abs(
+            (ax - next_x[i]) * (y_filled[s:e] - ay)
+            - (ax - x[s:e]) * (next_y[i] - ay)
+        )
+        a = s + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_positions(y, max_points=MAX_PLOT_POINTS):
+    """
+    (x positions, y values) for plotting a series against its row number,
+    LTTB-downsampled above max_points (None keeps every point).
+    """
+    y = np.asarray(y)
+    if max_points is None or len(y) <= max_points:
+        positions = np.arange(len(y))
+    else:
+        positions = lttb_indices(y, max_points)
+    return positions, y[positions]
+
+
+def downsample_frame(df, y_col, max_points=MAX_PLOT_POINTS):
+    """
+    Rows of df chosen by LTTB on y_col (original index kept, so positions
+    still line up on the x axis). No-op at or below max_points or when None.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+    return df.iloc[lttb_indices(df[y_col].to_numpy(), max_points)]
@@ -0,0 +1,233 @@
+# src/energy_stream.py
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ring_buffer import new_ring_buffer, ring_extend, ring_frame
+from src.weather_service import get_karachi_weather_forecast
+
+HOUR_NS = 3600 * 10**9
+NO_SAMPLE = np.iinfo(np.int64).min
+MAX_GAP_S = 300  # Longer silences are gaps, not a straight line between readings
+MIN_COVERAGE = 0.5  # Hours observed less than half get usage_kwh = NaN
+HISTORY_HOURS = 90 * 24  # Closed hours kept per meter for retraining (~35 KB)
+WEATHER_TTL_S = 3600  # Weather is re-fetched at most once an hour
+WEATHER_KEEP_HOURS = 14 * 24  # Past temperatures kept for the join
+HOURLY_COLUMNS = ["timestamp", "meter_id", "usage_kwh", "temperature_c", "coverage"]
+
+
+# ---------------------------------------------
+# 1. WEATHER CACHE
+# ---------------------------------------------
+def new_weather_cache(fetch=get_karachi_weather_forecast, ttl_s=WEATHER_TTL_S):
+    """
+    Hour -> temperature, filled from the hourly forecast. Forecast values stay
+    after their hour has passed, so just-closed hours can still be joined.
+    """
+    return {"fetch": fetch, "ttl_s": ttl_s, "fetched_at": None, "temps": {}}
+
+
+def weather_for_hours(cache, hours_ns):
+    """
+    Temperatures for hour-start timestamps (ns); NaN where unknown, which
+    clean_data() interpolates. Calls the API at most once per TTL.
+    """
+    now = time.monotonic()
+    if cache["fetched_at"] is None or now - cache["fetched_at"] > cache["ttl_s"]:
+        cache["fetched_at"] = now
+        forecast = cache["fetch"]()
+        if forecast is not None:
+            hours = forecast["timestamp"].to_numpy("datetime64[ns]").astype(np.int64)
+            cache["temps"].update(zip(hours.tolist(), forecast["temperature_c"]))
+            oldest = hours.min() - WEATHER_KEEP_HOURS * HOUR_NS
+            cache["temps"] = {h: c for h, c in cache["temps"].items() if h >= oldest}
+
+    unique, inverse = np.unique(hours_ns, return_inverse=True)
+    temps = np.array([cache["temps"].get(h, np.nan) for h in unique.tolist()])
+    return temps[inverse] if len(unique) else np.empty(0)
+
+
+# ---------------------------------------------
+# 2. STREAMING INTEGRATOR
+# ---------------------------------------------
+def new_energy_stream(
+    max_gap_s=MAX_GAP_S,
+    history_hours=HISTORY_HOURS,
+    weather=None,
+):
+    """
+    Per-meter state for turning power readings into hourly energy: the last
+    reading, the open (current) hour and a bounded history of closed hours.
+    Memory grows with the number of meters, never with stream length.
+    """
+    if max_gap_s > 3600:
+        raise ValueError("❌ max_gap_s must be at most one hour.")
+    return {
+        "max_gap_ns": int(max_gap_s * 10**9),
+        "history_hours": history_hours,
+        "weather": new_weather_cache() if weather is None else weather,
+        # Arrays indexed by meter_id, grown on demand
+        "last_t": np.empty(0, dtype=np.int64),
+        "last_p": np.empty(0),
+        "open_hour": np.empty(0, dtype=np.int64),
+        "open_kwh": np.empty(0),
+        "open_s": np.empty(0),
+        "history": {},  # meter_id -> ring buffer of (usage_kwh, temperature_c)
+    }
+
+
+def _grow(stream, n_meters):
+    extra = n_meters - len(stream["last_t"])
+    if extra <= 0:
+        return
+    for name, fill in (
+        ("last_t", NO_SAMPLE),
+        ("last_p", 0.0),
+        ("open_hour", NO_SAMPLE),
+        ("open_kwh", 0.0),
+        ("open_s", 0.0),
+    ):
+        pad = np.full(extra, fill, dtype=stream[name].dtype)
+        stream[name] = np.concatenate([stream[name], pad])
+
+
+def _pieces(t0, t1, p0, p1):
+    """
+    Trapezoid energy (kWh) and seconds of each interval, split at the hour
+    boundary it crosses (intervals are at most an hour, so at most one).
+    Returns (hour, kwh, seconds) for the first pieces and for the spill-overs.
+    """
+    h0, h1 = t0 // HOUR_NS, t1 // HOUR_NS
+    cut = np.where(h1 > h0, h1 * HOUR_NS, t1)
+    p_cut = p0 + (p1 - p0) * (cut - t0) / (t1 - t0)
+    first = (h0, (p0 + p_cut) / 2 * (cut - t0) / HOUR_NS, (cut - t0) / 1e9)
+    spill = h1 > h0
+    second = (
+        h1[spill],
+        (p_cut[spill] + p1[spill]) / 2 * (t1 - cut)[spill] / HOUR_NS,
+        (t1 - cut)[spill] / 1e9,
+    )
+    return first, second, spill
+
+
+def _hourly_rows(stream, meter, hour, kwh, seconds):
+    """
+    Closed hours as rows in the shape clean_data() expects (plus meter_id and
+    coverage). Thin coverage gives NaN usage for clean_data to interpolate.
+    """
+    order = np.lexsort((meter, hour))
+    meter, hour, kwh, seconds = meter[order], hour[order], kwh[order], seconds[order]
+    coverage = seconds / 3600
+    with np.errstate(divide="ignore", invalid="ignore"):
+        usage = np.where(coverage >= MIN_COVERAGE, kwh / coverage, np.nan)
+    times = (hour * HOUR_NS).astype("datetime64[ns]")
+    temps = weather_for_hours(stream["weather"], hour * HOUR_NS)
+
+    if stream["history_hours"]:
+        values = np.column_stack([usage, temps])
+        by_meter = np.argsort(meter, kind="stable")  # Hours stay in order
+        starts = np.flatnonzero(np.diff(meter[by_meter])) + 1
+        for rows in np.split(by_meter, starts) if len(meter) else []:
+            m = int(meter[rows[0]])
+            if m not in stream["history"]:
+                stream["history"][m] = new_ring_buffer(
+                    stream["history_hours"], channels=("usage_kwh", "temperature_c")
+                )
+            ring_extend(stream["history"][m], times[rows], values[rows])
+
+    return pd.DataFrame(
+        {
+            "timestamp": times,
+            "meter_id": meter,
+            "usage_kwh": usage,
+            "temperature_c": temps,
+            "coverage": coverage,
+        }
+    )
+
+
+def push_readings(stream, records):
+    """
+    Feeds a batch of SENSOR_RECORD_DTYPE readings (any meters, any order) and
+    returns the hours it closed, as a DataFrame of HOURLY_COLUMNS.
+
+    Power is integrated with the trapezoid rule between consecutive readings
+    of a meter, however irregular; intervals longer than max_gap_s count as
+    missing. Readings not newer than a meter's last one are dropped.
+    """
+    meter = records["meter_id"].astype(np.int64)
+    t = records["timestamp_ns"].astype(np.int64)
+    p = records["power_kw"].astype(np.float64)
+    if len(t) == 0:
+        return pd.DataFrame(columns=HOURLY_COLUMNS)
+    _grow(stream, int(meter.max()) + 1)
+
+    # --- 1. ORDER PER METER, DROP STALE / DUPLICATE READINGS ---
+    order = np.lexsort((t, meter))
+    meter, t, p = meter[order], t[order], p[order]
+    keep = t > stream["last_t"][meter]
+    keep[1:] &= (meter[1:] != meter[:-1]) | (t[1:] != t[:-1])
+    meter, t, p = meter[keep], t[keep], p[keep]
+    if len(t) == 0:
+        return pd.DataFrame(columns=HOURLY_COLUMNS)
+
+    # --- 2. INTERVALS (previous reading: in this batch, or carried over) ---
+    first = np.concatenate(([True], meter[1:] != meter[:-1]))
+    prev_t, prev_p = np.roll(t, 1), np.roll(p, 1)
+    prev_t[first] = stream["last_t"][meter[first]]
+    prev_p[first] = stream["last_p"][meter[first]]
+    ok = (prev_t != NO_SAMPLE) & (t - prev_t <= stream["max_gap_ns"])
+    (h_a, kwh_a, s_a), (h_b, kwh_b, s_b), spill = _pieces(
+        prev_t[ok], t[ok], prev_p[ok], p[ok]
+    )
+
+    last = np.concatenate((meter[1:] != meter[:-1], [True]))
+    stream["last_t"][meter[last]] = t[last]
+    stream["last_p"][meter[last]] = p[last]
+
+    # --- 3. ACCUMULATE INTO (METER, HOUR), INCLUDING THE OPEN HOURS ---
+    open_m = np.flatnonzero(stream["open_hour"] != NO_SAMPLE)
+    all_m = np.concatenate([open_m, meter[ok], meter[ok][spill]])
+    all_h = np.concatenate([stream["open_hour"][open_m], h_a, h_b])
+    all_kwh = np.concatenate([stream["open_kwh"][open_m], kwh_a, kwh_b])
+    all_s = np.concatenate([stream["open_s"][open_m], s_a, s_b])
+    n_meters = len(stream["last_t"])
+    keys, inverse = np.unique(all_h * n_meters + all_m, return_inverse=True)
+    g_m, g_h = keys % n_meters, keys // n_meters
+    g_kwh = np.bincount(inverse, weights=all_kwh)
+    g_s = np.bincount(inverse, weights=all_s)
+
+    # An hour closes once its meter has a reading at or past its end
+    closed = (g_h + 1) * HOUR_NS <= stream["last_t"][g_m]
+    stream["open_hour"][g_m] = NO_SAMPLE
+    stream["open_hour"][g_m[~closed]] = g_h[~closed]
+    stream["open_kwh"][g_m[~closed]] = g_kwh[~closed]
+    stream["open_s"][g_m[~closed]] = g_s[~closed]
+    return _hourly_rows(stream, g_m[closed], g_h[closed], g_kwh[closed], g_s[closed])
+
+
+def close_open_hours(stream):
+    """
+    Emits every meter's current, partly observed hour (e.g. at shutdown).
+    """
+    open_m = np.flatnonzero(stream["open_hour"] != NO_SAMPLE)
+    rows = _hourly_rows(
+        stream,
+        open_m,
+        stream["open_hour"][open_m],
+        stream["open_kwh"][open_m],
+        stream["open_s"][open_m],
+    )
+    stream["open_hour"][open_m] = NO_SAMPLE
+    return rows
+
+
+def training_frame(stream, meter_id=0):
+    """
+    A meter's recent closed hours as timestamp / usage_kwh / temperature_c,
+    ready for clean_data() and train_model() without exporting anything.
+    """
+    if meter_id not in stream["history"]:
+        return pd.DataFrame(columns=["timestamp", "usage_kwh", "temperature_c"])
+    return ring_frame(stream["history"][meter_id]).reset_index()
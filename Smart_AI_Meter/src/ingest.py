@@ -0,0 +1,250 @@
+# src/ingest.py
+import asyncio
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from src.meter_simulator import SENSOR_RECORD_DTYPE, new_fleet, simulate_batch
+from src.tsdb import append_records
+
+INGEST_HOST = "127.0.0.1"
+INGEST_PORT = 8765
+
+# Wire format, little-endian. Client -> server: a FRAME_HEADER, then
+# n_records x 24-byte SENSOR_RECORD_DTYPE records. Server -> client: one ACK
+# per frame, sent only after its records are in storage.
+FRAME_HEADER = struct.Struct("<II")  # batch_id, n_records
+ACK = struct.Struct("<II")  # batch_id, status
+ACK_OK, ACK_REJECTED, ACK_FAILED = 0, 1, 2
+
+MAX_BATCH_RECORDS = 1_000_000  # Larger frames are rejected (24 MB)
+QUEUE_BATCHES = 256  # Frames waiting for storage before sockets stop being read
+WRITE_RECORDS = 200_000  # Queued frames are merged into writes of up to this size
+LATENCY_HISTORY = 10_000  # Acked frames kept for server-side latency percentiles
+
+
+def _percentiles_ms(seconds):
+    if not len(seconds):
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    p50, p95, p99 = np.percentile(np.asarray(seconds) * 1000, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+# ---------------------------------------------
+# 1. SERVER
+# ---------------------------------------------
+def new_ingest_server(db, sync=False, queue_batches=QUEUE_BATCHES):
+    """
+    Server state around an open tsdb store. sync=True makes every write reach
+    the disk before it is acknowledged.
+    """
+    return {
+        "db": db,
+        "sync": sync,
+        "queue": asyncio.Queue(maxsize=queue_batches),
+        "batches": 0,
+        "records": 0,
+        "writes": 0,
+        "rejected": 0,
+        "failed": 0,
+        "max_queued": 0,
+        "write_s": 0.0,
+        "connections": 0,
+        "latency_s": deque(maxlen=LATENCY_HISTORY),  # Frame received -> acked
+    }
+
+
+async def _handle_connection(server, reader, writer):
+    """
+    Reads frames from one client into the shared queue. When the queue is
+    full, put() waits, this socket stops being read, and TCP flow control
+    slows the client down: that is the backpressure.
+    """
+    server["connections"] += 1
+    try:
+        while True:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            batch_id, n_records = FRAME_HEADER.unpack(header)
+            if n_records > MAX_BATCH_RECORDS:
+                server["rejected"] += 1
+                writer.write(ACK.pack(batch_id, ACK_REJECTED))
+                break  # The stream cannot be resynchronised after this frame
+            payload = await reader.readexactly(n_records * SENSOR_RECORD_DTYPE.itemsize)
+            records = np.frombuffer(payload, dtype=SENSOR_RECORD_DTYPE)
+            await server["queue"].put((records, writer, batch_id, time.perf_counter()))
+            server["max_queued"] = max(server["max_queued"], server["queue"].qsize())
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass  # Client went away; anything it already sent is still written
+    finally:
+        server["connections"] -= 1
+        writer.close()
+
+
+async def _write_loop(server):
+    """
+    Single storage writer: merges whatever frames are queued into one append
+    (off the event loop thread), then acknowledges each of them.
+    """
+    queue = server["queue"]
+    while True:
+        batches = [await queue.get()]
+        n_records = len(batches[0][0])
+        while n_records < WRITE_RECORDS and not queue.empty():
+            batches.append(queue.get_nowait())
+            n_records += len(batches[-1][0])
+
+        records = np.concatenate([batch[0] for batch in batches])
+        began = time.perf_counter()
+        try:
+            await asyncio.to_thread(
+                append_records, server["db"], records, sync=server["sync"]
+            )
+            status = ACK_OK
+        except Exception as e:
+            print(f"❌ Ingest write failed: {e}")
+            server["failed"] += len(batches)
+            status = ACK_FAILED
+        server["write_s"] += time.perf_counter() - began
+        server["writes"] += 1
+
+        acked_at = time.perf_counter()
+        for _, writer, batch_id, received_at in batches:
+            if not writer.is_closing():
+                writer.write(ACK.pack(batch_id, status))
+            server["latency_s"].append(acked_at - received_at)
+            queue.task_done()
+        if status == ACK_OK:
+            server["batches"] += len(batches)
+            server["records"] += n_records
+
+
+async def start_ingest_server(server, host=INGEST_HOST, port=INGEST_PORT):
+    """
+    Starts listening and the storage writer. Returns the asyncio server;
+    pass both to stop_ingest_server().
+    """
+    server["writer_task"] = asyncio.create_task(_write_loop(server))
+    return await asyncio.start_server(
+        lambda r, w: _handle_connection(server, r, w), host, port
+    )
+
+
+async def stop_ingest_server(server, listener):
+    """
+    Stops accepting, writes (and acknowledges) everything already queued.
+    """
+    listener.close()
+    await listener.wait_closed()
+    await server["queue"].join()
+    server["writer_task"].cancel()
+
+
+def ingest_stats(server):
+    """
+    Snapshot for monitoring: totals, queue depth, mean write time and
+    receive-to-ack latency percentiles of recent frames.
+    """
+    writes = max(server["writes"], 1)
+    return {
+        "connections": server["connections"],
+        "batches": server["batches"],
+        "records": server["records"],
+        "writes": server["writes"],
+        "rejected": server["rejected"],
+        "failed": server["failed"],
+        "queued": server["queue"].qsize(),
+        "max_queued": server["max_queued"],
+        "mean_write_ms": server["write_s"] / writes * 1000,
+        **_percentiles_ms(server["latency_s"]),
+    }
+
+
+# ---------------------------------------------
+# 2. LOAD GENERATOR
+# ---------------------------------------------
+async def _client(host, port, fleet, first_meter, interval_s, duration_s, delay_s, out):
+    """
+    One connection reporting its share of meters every interval_s. Latency is
+    from when a batch was due to when its ack arrived, so time spent blocked
+    by backpressure counts.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    due = {}
+
+    async def read_acks():
+        try:
+            while True:
+                batch_id, status = ACK.unpack(await reader.readexactly(ACK.size))
+                out["latency_s"].append(time.perf_counter() - due.pop(batch_id))
+                out["acked" if status == ACK_OK else "errors"] += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    acks = asyncio.create_task(read_acks())
+    await asyncio.sleep(delay_s)  # Connections are spread over the interval
+    began = time.perf_counter()
+    batch_id = 0
+    while batch_id * interval_s < duration_s:
+        due_at = began + batch_id * interval_s
+        await asyncio.sleep(max(0.0, due_at - time.perf_counter()))
+        records = simulate_batch(fleet, time.time_ns(), 1, 1 / interval_s)
+        records["meter_id"] += first_meter
+        due[batch_id] = due_at
+        writer.write(FRAME_HEADER.pack(batch_id, len(records)) + records.tobytes())
+        await writer.drain()  # Waits here while the server pushes back
+        out["sent"] += 1
+        out["records"] += len(records)
+        batch_id += 1
+
+    # Wait for outstanding acks (bounded), then hang up
+    for _ in range(100):
+        if not due:
+            break
+        await asyncio.sleep(0.05)
+    writer.close()
+    acks.cancel()
+
+
+async def run_load(
+    host=INGEST_HOST,
+    port=INGEST_PORT,
+    n_meters=20_000,
+    n_connections=50,
+    interval_s=2.0,
+    duration_s=20.0,
+):
+    """
+    Simulates n_meters reporting every interval_s over n_connections (each a
+    gateway for its share of meters). Returns throughput and ack latency
+    percentiles.
+    """
+    out = {"sent": 0, "records": 0, "acked": 0, "errors": 0, "latency_s": []}
+    per_connection = np.array_split(np.arange(n_meters), n_connections)
+    began = time.perf_counter()
+    await asyncio.gather(
+        *[
+            _client(
+                host,
+                port,
+                new_fleet(len(meters), seed=int(meters[0])),
+                int(meters[0]),
+                interval_s,
+                duration_s,
+                interval_s * k / n_connections,
+                out,
+            )
+            for k, meters in enumerate(per_connection)
+            if len(meters)
+        ]
+    )
+    elapsed = time.perf_counter() - began
+    return {
+        "sent": out["sent"],
+        "acked": out["acked"],
+        "errors": out["errors"],
+        "records": out["records"],
+        "records_per_s": out["records"] / elapsed,
+        **_percentiles_ms(out["latency_s"]),
+    }
@@ -0,0 +1,186 @@
+# src/jobs.py
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.forecaster import predict_next_week
+from src.predictor import train_model
+from src.processor import clean_data
+from src.scheduler import compute_slot
+
+JOBS_DIR = os.path.join("data", "jobs")
+MAX_WORKERS = 2  # Concurrent analyses per server; more queue up
+JOB_RETENTION_HOURS = 24  # Finished jobs (and their files) are kept this long
+
+ANALYSIS_STAGES = [
+    ("clean", "🧹 Cleaning your data"),
+    ("train", "🧠 Training the forecast model"),
+    ("forecast", "🔮 Forecasting the next 7 days"),
+]
+
+_JOB_ID = re.compile(r"[0-9a-f]{12}")
+_POOL = None
+_JOBS = {}  # job_id -> live status dict (this server process only)
+_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """
+    One shared worker pool per server process. Jobs run here, not on a
+    session's script thread, so they keep going if the browser disconnects.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+    return _POOL
+
+
+def _job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+
+def _save_status(status):
+    """
+    Writes status.json atomically, so a reader never sees half a file.
+    """
+    path = os.path.join(_job_dir(status["job_id"]), "status.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(status, f)
+    os.replace(path + ".tmp", path)
+
+
+def _update(job_id, **changes):
+    with _LOCK:
+        status = _JOBS[job_id]
+        status.update(changes, updated=time.time())
+        snapshot = dict(status)
+    _save_status(snapshot)
+
+
+def _run_analysis(job_id):
+    """
+    clean -> train -> forecast, persisting progress after every stage and the
+    results once at the end.
+    """
+    input_path = os.path.join(_job_dir(job_id), "input.csv")
+    results = {}
+    try:
+        for i, (stage, label) in enumerate(ANALYSIS_STAGES):
+            _update(
+                job_id,
+                state="running",
+                stage=stage,
+                step=i + 1,
+                stage_label=label,
+                progress=i / len(ANALYSIS_STAGES),
+            )
+            if stage == "clean":
+                results["df_clean"] = clean_data(pd.read_csv(input_path))
+            elif stage == "train":
+                # Waits here for cores when other sessions are training
+                with compute_slot(f"train:{job_id}") as n_jobs:
+                    model, features, results["metrics"] = train_model(
+                        results["df_clean"], n_jobs=n_jobs
+                    )
+            elif stage == "forecast":
+                results["future_df"] = predict_next_week(model, features)
+
+        pd.to_pickle(results, os.path.join(_job_dir(job_id), "results.pkl"))
+        _update(job_id, state="done", stage=None, stage_label="Done", progress=1.0)
+        print(f"✅ Job {job_id} finished.")
+    except Exception as e:
+        print(f"❌ Job {job_id} failed: {e}")
+        _update(job_id, state="failed", error=str(e))
+
+
+def _prune_jobs(max_age_hours=JOB_RETENTION_HOURS):
+    """
+    Deletes done or failed jobs last updated more than max_age_hours ago,
+    from memory and from disk. Queued and running jobs are never touched.
+    """
+    if not os.path.isdir(JOBS_DIR):
+        return
+    cutoff = time.time() - max_age_hours * 3600
+    for job_id in os.listdir(JOBS_DIR):
+        status = job_status(job_id)
+        if status is None:
+            # Not a job folder we can read (e.g. created by a crashed submit)
+            path = _job_dir(job_id)
+            expired = _JOB_ID.fullmatch(job_id) and os.path.getmtime(path) < cutoff
+        else:
+            expired = status["state"] in ("done", "failed")
+            expired = expired and status["updated"] < cutoff
+        if expired:
+            with _LOCK:
+                _JOBS.pop(job_id, None)
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+
+
+def submit_analysis(raw_file_path, household_profile):
+    """
+    Queues the analysis pipeline for an uploaded file and returns its job ID.
+    The input is copied into the job folder, so later uploads cannot change it.
+    Old finished jobs are cleaned up first.
+    """
+    _prune_jobs()
+    job_id = uuid.uuid4().hex[:12]
+    os.makedirs(_job_dir(job_id), exist_ok=True)
+    shutil.copyfile(raw_file_path, os.path.join(_job_dir(job_id), "input.csv"))
+
+    status = {
+        "job_id": job_id,
+        "state": "queued",
+        "stage": None,
+        "step": 0,
+        "stage_label": "Waiting for a free worker",
+        "progress": 0.0,
+        "error": None,
+        "household_profile": household_profile,
+        "created": time.time(),
+        "updated": time.time(),
+    }
+    with _LOCK:
+        _JOBS[job_id] = status
+    _save_status(status)
+    _get_pool().submit(_run_analysis, job_id)
+    return job_id
+
+
+def job_status(job_id):
+    """
+    Latest status of a job, from memory or (after a server restart) from disk.
+    Returns None for unknown or malformed IDs.
+    """
+    if not job_id or not _JOB_ID.fullmatch(job_id):
+        return None
+    with _LOCK:
+        if job_id in _JOBS:
+            return dict(_JOBS[job_id])
+
+    path = os.path.join(_job_dir(job_id), "status.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        status = json.load(f)
+    if status["state"] in ("queued", "running"):
+        # Persisted as in-flight, but no worker here owns it any more
+        status["state"] = "failed"
+        status["error"] = "Interrupted by a server restart. Please run it again."
+    return status
+
+
+def job_result(job_id):
+    """
+    Results of a finished job: {"df_clean", "metrics", "future_df"}, or None.
+    """
+    status = job_status(job_id)
+    if status is None or status["state"] != "done":
+        return None
+    return pd.read_pickle(os.path.join(_job_dir(job_id), "results.pkl"))
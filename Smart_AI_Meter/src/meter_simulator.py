@@ -0,0 +1,240 @@
+# src/meter_simulator.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.budget import DEVICE_LIBRARY
+
+# One reading in the binary append log: 24 bytes, little-endian, no padding.
+# Read a log back with np.fromfile(path, dtype=SENSOR_RECORD_DTYPE).
+SENSOR_RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp_ns", "<i8"),  # Unix epoch nanoseconds (local wall clock)
+        ("meter_id", "<u4"),
+        ("voltage", "<f4"),
+        ("current", "<f4"),
+        ("power_kw", "<f4"),
+    ]
+)
+OUTPUT_FORMATS = ("csv", "parquet", "binary")
+
+NOMINAL_VOLTAGE = 220.0
+FEEDER_DROP_V_PER_KW = 0.8  # Local voltage sag per kW drawn by the house
+EVENING_SAG_V = 5.0  # Extra grid sag at the evening peak (19:00-22:00)
+FAULT_SPIKE_A = 10.0  # Injected load spike: one reading's current jumps by 10 A
+FAULT_SAG_V = 20.0  # Injected supply dip: one reading's voltage drops by 20 V
+
+
+def _hours(level, *ranges):
+    """
+    24-slot duty profile: `level` inside the (start, end) hour ranges, else 0.
+    """
+    duty = np.zeros(24)
+    for start, end in ranges:
+        duty[start:end] = level
+    return duty
+
+
+# --- APPLIANCE BEHAVIOUR BY DEVICE TYPE ---
+# duty: fraction of each hour the appliance is on (for households owning it)
+# on_s: mean length of one "on" run in seconds (compressor cycle, a wash...)
+# owned: share of households that own an appliance of this type
+DEVICE_TYPE_PATTERNS = {
+    "cooling": {
+        "duty": _hours(0.7, (0, 3), (13, 24)) + _hours(0.3, (3, 7), (10, 13)),
+        "on_s": 1200,
+        "owned": 0.5,
+    },
+    "heating": {"duty": _hours(0.3, (5, 8), (20, 23)), "on_s": 900, "owned": 0.3},
+    "kitchen": {
+        "duty": _hours(0.1, (7, 9), (13, 14), (19, 21)),
+        "on_s": 240,
+        "owned": 0.6,
+    },
+    "utility": {"duty": _hours(0.08, (8, 12), (16, 18)), "on_s": 1200, "owned": 0.6},
+    "entertainment": {"duty": _hours(0.6, (17, 24)), "on_s": 3600, "owned": 0.3},
+    "essential": {"duty": _hours(0.4, (0, 24)), "on_s": 900, "owned": 0.9},
+    "basic": {
+        "duty": _hours(0.9, (0, 6), (18, 24)) + _hours(0.3, (6, 18)),
+        "on_s": 7200,
+        "owned": 1.0,
+    },
+}
+
+
+def new_fleet(n_meters, seed=42, devices=DEVICE_LIBRARY):
+    """
+    Random households: which appliances each owns, standby load and supply
+    offset, plus the live on/off state of every appliance.
+    """
+    rng = np.random.default_rng(seed)
+    patterns = [DEVICE_TYPE_PATTERNS[dev["type"]] for dev in devices.values()]
+    owned_share = np.array([p["owned"] for p in patterns])
+    duty = np.array([p["duty"] for p in patterns]).T  # (24, n_devices)
+    supply_v = NOMINAL_VOLTAGE + rng.normal(0, 2, n_meters)
+    return {
+        "rng": rng,
+        "n_meters": n_meters,
+        "kw": np.array([dev["kw"] for dev in devices.values()], dtype=np.float32),
+        "duty": duty,
+        "on_s": np.array([p["on_s"] for p in patterns], dtype=float),
+        "owned": rng.random((n_meters, len(devices))) < owned_share,
+        # Start near the daily average state instead of everything off
+        "on": rng.random((n_meters, len(devices))) < duty.mean(axis=0),
+        "standby_kw": rng.uniform(0.05, 0.2, n_meters).astype(np.float32),
+        "supply_v": supply_v.astype(np.float32),
+    }
+
+
+def _transition_tables(fleet, dt_s):
+    """
+    Per hour of day, each appliance's chance to switch on / off in one tick.
+    A two-state chain with these rates is on `duty` of the time on average,
+    in runs of about `on_s` seconds.
+    """
+    p_off = np.minimum(dt_s / fleet["on_s"], 1.0)
+    duty = np.minimum(fleet["duty"], 0.99)
+    p_on = np.minimum(p_off * duty / (1 - duty), 1.0)
+    p_off = np.broadcast_to(p_off, p_on.shape)
+    return p_on.astype(np.float32), p_off.astype(np.float32)
+
+
+def simulate_batch(fleet, start_ns, n_ticks, rate_hz):
+    """
+    n_ticks readings for every meter, one tick every 1 / rate_hz seconds
+    starting at start_ns. Returns SENSOR_RECORD_DTYPE records, tick-major
+    (all meters at tick 0, then tick 1, ...); the fleet's appliance state
+    carries over, so consecutive batches continue one another.
+    """
+    n_meters, rng = fleet["n_meters"], fleet["rng"]
+    step_ns = int(round(1e9 / rate_hz))
+    times = start_ns + step_ns * np.arange(n_ticks, dtype=np.int64)
+    hours = (times // 3_600_000_000_000) % 24
+    p_on, p_off = _transition_tables(fleet, 1 / rate_hz)
+
+    # --- 1. APPLIANCE ON/OFF CHAINS (a loop over ticks, vectorized over meters) ---
+    draws = rng.random((n_ticks, *fleet["on"].shape), dtype=np.float32)
+    on = fleet["on"]
+    appliance_kw = np.empty((n_ticks, n_meters), dtype=np.float32)
+    for t in range(n_ticks):
+        hour = hours[t]
+        on = np.where(on, draws[t] >= p_off[hour], draws[t] < p_on[hour])
+        appliance_kw[t] = (on & fleet["owned"]) @ fleet["kw"]
+    fleet["on"] = on
+
+    # --- 2. ELECTRICAL READINGS ---
+    power = appliance_kw + fleet["standby_kw"]
+    power *= 1 + 0.03 * rng.standard_normal(power.shape, dtype=np.float32)
+    np.maximum(power, 0.0, out=power)
+    evening = ((hours >= 19) & (hours < 22)).astype(np.float32)[:, None]
+    voltage = fleet["supply_v"] - EVENING_SAG_V * evening
+    voltage = voltage - FEEDER_DROP_V_PER_KW * power
+    voltage += rng.standard_normal(power.shape, dtype=np.float32)
+
+    records = np.empty(n_ticks * n_meters, dtype=SENSOR_RECORD_DTYPE)
+    records["timestamp_ns"] = np.repeat(times, n_meters)
+    records["meter_id"] = np.tile(np.arange(n_meters, dtype=np.uint32), n_ticks)
+    records["voltage"] = voltage.ravel()
+    records["current"] = (power * 1000 / voltage).ravel()
+    records["power_kw"] = power.ravel()
+    return records
+
+
+def inject_faults(fleet, records, rate):
+    """
+    Turns a `rate` share of readings into faults, in place: half are current
+    spikes, half voltage sags (power follows). Returns the positions of the
+    (spikes, sags), so detectors can be checked against them.
+    """
+    rng = fleet["rng"]
+    hit = np.flatnonzero(rng.random(len(records)) < rate)
+    is_spike = rng.random(len(hit)) < 0.5
+    spikes, sags = hit[is_spike], hit[~is_spike]
+    records["current"][spikes] += FAULT_SPIKE_A
+    records["voltage"][sags] -= FAULT_SAG_V
+    records["power_kw"][hit] = records["voltage"][hit] * records["current"][hit] / 1000
+    return spikes, sags
+
+
+def records_frame(records, with_meter_id=True):
+    """
+    Records as a DataFrame with a datetime timestamp column.
+    """
+    df = pd.DataFrame(
+        {
+            "timestamp": records["timestamp_ns"].astype("datetime64[ns]"),
+            "meter_id": records["meter_id"],
+            "voltage": records["voltage"],
+            "current": records["current"],
+            "power_kw": records["power_kw"],
+        }
+    )
+    return df if with_meter_id else df.drop(columns="meter_id")
+
+
+# ---------------------------------------------
+# OUTPUT SINKS (one open file per run, one write per batch)
+# ---------------------------------------------
+def open_sink(path, fmt, n_meters=1):
+    """
+    Opens an output for a run. CSV and binary append to an existing file;
+    Parquet cannot be appended to, so it is rewritten. CSV from a single
+    meter keeps the live_stream.csv layout (no meter_id) the dashboard follows.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"❌ Unknown output format '{fmt}' (use {OUTPUT_FORMATS}).")
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    sink = {"path": path, "format": fmt, "with_meter_id": n_meters > 1}
+    if fmt == "parquet":
+        # Optional dependency, only needed for this format
+        import pyarrow
+        import pyarrow.parquet
+
+        sink["pa"], sink["pq"] = pyarrow, pyarrow.parquet
+        sink["writer"] = None  # Created with the first batch's schema
+    else:
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if fmt == "csv":
+            empty = np.empty(0, SENSOR_RECORD_DTYPE)
+            columns = records_frame(empty, sink["with_meter_id"]).columns
+            header = ",".join(columns) + "\n"
+            if not is_new:
+                with open(path, encoding="utf-8") as f:
+                    if f.readline() != header:
+                        raise ValueError(
+                            f"❌ {path} has a different column layout; "
+                            "write to a new file instead."
+                        )
+        sink["file"] = open(path, "ab")
+        if fmt == "csv" and is_new:
+            sink["file"].write(header.encode())
+    return sink
+
+
+def write_batch(sink, records):
+    """
+    Appends one batch: raw records (binary), rows (CSV) or a row group (Parquet).
+    """
+    if sink["format"] == "binary":
+        sink["file"].write(records.tobytes())
+    elif sink["format"] == "csv":
+        df = records_frame(records, sink["with_meter_id"])
+        df.to_csv(sink["file"], header=False, index=False, float_format="%.4f")
+    else:
+        table = sink["pa"].Table.from_pandas(records_frame(records))
+        if sink["writer"] is None:
+            sink["writer"] = sink["pq"].ParquetWriter(sink["path"], table.schema)
+        sink["writer"].write_table(table)
+    if "file" in sink:
+        sink["file"].flush()  # Followers see whole batches as soon as written
+
+
+def close_sink(sink):
+    if sink.get("writer") is not None:
+        sink["writer"].close()
+    if "file" in sink:
+        sink["file"].close()
@@ -0,0 +1,177 @@
+# src/optimizer.py
+import math
+
+import numpy as np
+
+SLOT_HOURS = 0.25  # Cuts are planned in 15-minute slots
+MAX_CUT_HOURS = 4  # Never ask a household to cut a device by more than this per day
+DEFAULT_PRIORITY = 3
+MAX_DP_CELLS = 2_000_000  # Items x energy units (~5 ms); larger problems use the greedy
+
+
+def discomfort_per_hour(dev):
+    """
+    Priority 1 (AC, fridge) hurts most to cut, priority 5 (fans, lights) least.
+    """
+    return 6 - dev.get("priority", DEFAULT_PRIORITY)
+
+
+def cut_caps(devices):
+    """
+    Maximum daily cut hours per device. Essential loads are never cut.
+    """
+    return np.array(
+        [
+            0.0
+            if dev.get("type") == "essential"
+            else min(MAX_CUT_HOURS, dev.get("max_hours", MAX_CUT_HOURS))
+            for dev in devices
+        ]
+    )
+
+
+def _split_items(devices):
+    """
+    Bounded slot counts -> 0/1 items by binary splitting (1, 2, 4, ..., rest),
+    so a device with 16 slots becomes 5 items instead of 16.
+
+    Energy is counted in units of the largest step that divides every device's
+    slot energy (ratings taken to the watt), so the DP is exact. Returns the
+    items and that unit in kWh.
+    """
+    kw = np.array([dev["kw"] for dev in devices], dtype=float)
+    # Floor keeps the DP conservative for ratings finer than a watt
+    watts = np.floor(kw * 1000 + 1e-6).astype(np.int64)
+    unit_w = max(int(np.gcd.reduce(watts[watts > 0])), 1)
+    weight = np.array([discomfort_per_hour(dev) for dev in devices], dtype=float)
+    slots = np.floor(cut_caps(devices) / SLOT_HOURS).astype(int)
+
+    owner, n_slots = [], []
+    for d, count in enumerate(slots):
+        piece = 1
+        while count > 0:
+            take = min(piece, count)
+            owner.append(d)
+            n_slots.append(take)
+            count -= take
+            piece *= 2
+
+    owner = np.array(owner, dtype=int)
+    n_slots = np.array(n_slots, dtype=int)
+    hours = n_slots * SLOT_HOURS
+    energy_units = watts[owner] // unit_w * n_slots
+    costs = weight[owner] * hours
+
+    useful = energy_units > 0
+    step_kwh = unit_w / 1000 * SLOT_HOURS
+    return owner[useful], hours[useful], energy_units[useful], costs[useful], step_kwh
+
+
+def build_cut_table(devices, max_need_kwh, max_cells=MAX_DP_CELLS):
+    """
+    Min-discomfort covering knapsack over 15-minute slots, solved once for every
+    energy target up to max_need_kwh (dynamic programming on the energy axis).
+
+    Returns the DP table (reusable for many targets), or None when the problem
+    is larger than max_cells. Decided by size, not by the clock, so the same
+    inputs always get the same solver.
+    """
+    owner, hours, energy_units, costs, step_kwh = _split_items(devices)
+    # Targets above the total reachable energy are infeasible anyway
+    n_units = max(int(math.ceil(max_need_kwh / step_kwh - 1e-9)), 0)
+    n_units = min(n_units, int(energy_units.sum()) + 1)
+    if len(owner) * (n_units + 1) > max_cells:
+        return None
+
+    # dp[e] = least discomfort that saves at least e energy units
+    dp = np.full(n_units + 1, np.inf)
+    dp[0] = 0.0
+    take = np.zeros((len(owner), n_units + 1), dtype=bool)
+
+    candidate = np.empty_like(dp)
+    for i, (w, c) in enumerate(zip(energy_units, costs)):
+        head = min(w, n_units + 1)
+        candidate[:head] = dp[0] + c
+        np.add(dp[: n_units + 1 - head], c, out=candidate[head:])
+        np.less(candidate, dp, out=take[i])
+        np.minimum(dp, candidate, out=dp)
+
+    return {
+        "dp": dp,
+        "take": take,
+        "owner": owner,
+        "hours": hours,
+        "energy_units": energy_units,
+        "step_kwh": step_kwh,
+        "n_devices": len(devices),
+    }
+
+
+def solve_from_table(table, needs_kwh):
+    """
+    Vectorized backtracking: optimal cut hours for an array of daily targets.
+    Returns (n_targets, n_devices) hours. Targets beyond reach get every
+    device cut to its cap.
+    """
+    needs = np.atleast_1d(np.asarray(needs_kwh, dtype=float))
+    n_units = len(table["dp"]) - 1
+    e = np.clip(np.ceil(needs / table["step_kwh"] - 1e-9).astype(int), 0, n_units)
+    feasible = np.isfinite(table["dp"][e])
+
+    cuts = np.zeros((len(needs), table["n_devices"]))
+    for i in range(len(table["owner"]) - 1, -1, -1):
+        chosen = table["take"][i, e] & feasible
+        cuts[chosen, table["owner"][i]] += table["hours"][i]
+        e = np.where(chosen, np.maximum(e - table["energy_units"][i], 0), e)
+
+    if not feasible.all():
+        cuts[~feasible] = np.bincount(
+            table["owner"], weights=table["hours"], minlength=table["n_devices"]
+        )
+    return cuts
+
+
+def greedy_cut_hours(devices, need_kwh):
+    """
+    Fallback: cut the lowest discomfort-per-kWh devices first (fractional
+    knapsack rounded up to slots). Used only when the DP would be too large.
+    """
+    kw = np.array([dev["kw"] for dev in devices], dtype=float)
+    weight = np.array([discomfort_per_hour(dev) for dev in devices], dtype=float)
+    caps = cut_caps(devices)
+
+    cuts = np.zeros(len(devices))
+    remaining = need_kwh
+    for d in np.argsort(weight / kw, kind="stable"):
+        if remaining <= 0:
+            break
+        hours = min(caps[d], math.ceil(remaining / kw[d] / SLOT_HOURS) * SLOT_HOURS)
+        cuts[d] = hours
+        remaining -= hours * kw[d]
+    return cuts
+
+
+def optimize_device_cuts(devices, need_kwh, max_cells=MAX_DP_CELLS):
+    """
+    Daily cut hours per device that save at least need_kwh with minimum
+    discomfort (priority-weighted hours), respecting max_hours and slot size.
+    """
+    kw = np.array([dev["kw"] for dev in devices], dtype=float)
+    if need_kwh <= 0 or not devices:
+        hours, method = np.zeros(len(devices)), "none"
+    else:
+        table = build_cut_table(devices, need_kwh, max_cells)
+        if table is None:
+            hours, method = greedy_cut_hours(devices, need_kwh), "greedy"
+        else:
+            hours, method = solve_from_table(table, need_kwh)[0], "dp"
+
+    weight = np.array([discomfort_per_hour(dev) for dev in devices], dtype=float)
+    saved_kwh = float(hours @ kw)
+    return {
+        "hours": hours,
+        "saved_kwh": saved_kwh,
+        "discomfort": float(hours @ weight),
+        "feasible": saved_kwh + 1e-9 >= need_kwh,
+        "method": method,
+    }
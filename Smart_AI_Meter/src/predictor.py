@@ -1,15 +1,18 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error
 
-def train_model(df):
+def train_model(df, n_jobs=-1):
     """
     The AI Engine: 
     1. Selects the best features (Math + Physics).
     2. Validates accuracy on the last 20% of data (to prove it works).
     3. Retrains on 100% of data (to be ready for the future).
+    n_jobs: CPU cores for the forests (-1 = all; the app passes its scheduler grant).
     """
+    # scikit-learn takes >1s to import, so it loads on first training, not app start
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error
+
     print("🧠 Starting AI Training Sequence...")
 
     # 1. Feature Selection Strategy
@@ -41,7 +44,7 @@ def train_model(df):
     test_df = df.iloc[split_point:]
     
     # Train a temporary model just for testing
-    model_test = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+    model_test = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
     model_test.fit(train_df[available_features], train_df[target_col])
     
     # Generate Accuracy Report
@@ -63,7 +66,7 @@ def train_model(df):
 
     # 3. The Production Phase (The "Final Exam")
     print("🚀 Retraining on 100% of Data for Deployment...")
-    final_model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+    final_model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
     final_model.fit(df[available_features], df[target_col])
     
     print("✅ AI Model Ready.")
@@ -1,98 +1,81 @@
 import pandas as pd
-from huggingface_hub import InferenceClient
 import time
 import datetime
 
+from src.aggregates import get_aggregates
+from src.report_template import render_local_report
 
-def get_ai_energy_plan(
-    past_df, future_df, api_key, household_profile={}, agent_plan=None
-):
-    """
-    Generates Context-Aware Energy Plan using a HYBRID approach:
-    - If 'agent_plan' is provided, the Report strictly follows the Agent's math.
-    - If not, it falls back to standard estimation logic.
-    - AI only writes natural language based on these pre-computed facts.
-    """
-    print("🤖 AI CONSULTANT: Analyzing Data & Building Strategy...")
+REPORT_MODES = ("ai", "local")
 
-    try:
-        # --- STEP 1: DATA PREPARATION ---
-        df_history = past_df.copy()
-        if "timestamp" not in df_history.columns:
-            df_history = df_history.reset_index()
-            for col in ["index", "Datetime", df_history.columns[0]]:
-                if col in df_history.columns:
-                    df_history = df_history.rename(columns={col: "timestamp"})
-                    break
-
-        df_history["timestamp"] = pd.to_datetime(
-            df_history["timestamp"], errors="coerce"
-        )
 
-        # --- STEP 2: FORECAST ANALYSIS (Context for the Report) ---
-        future_df_copy = future_df.copy()
-        future_df_copy["date"] = pd.to_datetime(future_df_copy["timestamp"]).dt.date
-        future_df_copy["day_name"] = pd.to_datetime(
-            future_df_copy["timestamp"]
-        ).dt.day_name()
-
-        daily_forecast = (
-            future_df_copy.groupby(["date", "day_name"])
-            .agg({"predicted_usage_kwh": "sum", "temperature_c": "mean"})
-            .reset_index()
-        )
-
-        total_future_usage = daily_forecast["predicted_usage_kwh"].sum()
-        avg_daily = total_future_usage / 7
-        avg_temp = future_df["temperature_c"].mean()
-
-        # Past usage calculation
-        last_7_days = df_history.tail(168).copy()
-        usage_col = next(
-            (
-                c
-                for c in ["usage_kwh", "Usage", "usage", "kWh"]
-                if c in last_7_days.columns
-            ),
-            None,
-        )
-        past_usage = last_7_days[usage_col].sum() if usage_col else 0
-
-        # Project to monthly
-        total_14_days = past_usage + total_future_usage
-        avg_daily_consumption = total_14_days / 14
-        projected_monthly = avg_daily_consumption * 30
-
-        # --- STEP 3: SEASON DETECTION ---
-        if avg_temp >= 32:
-            actual_season = "Summer"
-            season_type = "cooling"
-        elif avg_temp >= 28:
-            actual_season = "Spring"
-            season_type = "moderate"
-        elif avg_temp >= 24:
-            actual_season = "Autumn"
-            season_type = "moderate"
-        else:
-            actual_season = "Winter"
-            season_type = "heating"
-
-        # --- STEP 4: AGENT VS LEGACY LOGIC ---
-
-        agent_instructions = ""
-        target_reduction = 0
-        potential_savings = 0
-        tier_name = "Standard"
-
-        # [A] THE INTELLIGENT AGENT PATH (Priority)
-        if agent_plan:
-            target_reduction = agent_plan.get("gap_units", 0)
-            tier_name = agent_plan.get("status", "Calculated")
-
-            # Create a strict instruction block for the AI
-            agent_instructions = f"""
+def build_report_context(past_df, future_df, household_profile={}, agent_plan=None):
+    """
+    Pre-computes every fact the report needs (forecast, season, tier, agent plan).
+    Shared by the AI writer prompt and the local template renderer.
+    """
+    # --- STEP 1: DATA PREPARATION ---
+    # Only the last 7 days of history are used, so slice before copying.
+    df_history = past_df.tail(168).copy()
+    if "timestamp" not in df_history.columns:
+        df_history = df_history.reset_index()
+        for col in ["index", "Datetime", df_history.columns[0]]:
+            if col in df_history.columns:
+                df_history = df_history.rename(columns={col: "timestamp"})
+                break
+
+    df_history["timestamp"] = pd.to_datetime(df_history["timestamp"], errors="coerce")
+
+    # --- STEP 2: FORECAST ANALYSIS (Context for the Report) ---
+    # Same cached aggregates the forecast charts use (one scan of future_df)
+    forecast_agg = get_aggregates(future_df, "predicted_usage_kwh")
+    daily_forecast = forecast_agg["daily"]
+
+    total_future_usage = daily_forecast["predicted_usage_kwh"].sum()
+    avg_temp = forecast_agg["mean_temp"]
+
+    # Past usage calculation
+    last_7_days = df_history
+    usage_col = next(
+        (c for c in ["usage_kwh", "Usage", "usage", "kWh"] if c in last_7_days.columns),
+        None,
+    )
+    past_usage = last_7_days[usage_col].sum() if usage_col else 0
+
+    # Project to monthly
+    total_14_days = past_usage + total_future_usage
+    avg_daily_consumption = total_14_days / 14
+    projected_monthly = avg_daily_consumption * 30
+
+    # --- STEP 3: SEASON DETECTION ---
+    if avg_temp >= 32:
+        actual_season = "Summer"
+        season_type = "cooling"
+    elif avg_temp >= 28:
+        actual_season = "Spring"
+        season_type = "moderate"
+    elif avg_temp >= 24:
+        actual_season = "Autumn"
+        season_type = "moderate"
+    else:
+        actual_season = "Winter"
+        season_type = "heating"
+
+    # --- STEP 4: AGENT VS LEGACY LOGIC ---
+
+    agent_instructions = ""
+    target_reduction = 0
+    potential_savings = 0
+    tier_name = "Standard"
+
+    # [A] THE INTELLIGENT AGENT PATH (Priority)
+    if agent_plan:
+        target_reduction = agent_plan.get("gap_units", 0)
+        tier_name = agent_plan.get("status", "Calculated")
+
+        # Create a strict instruction block for the AI
+        agent_instructions = f"""
 *** 🚨 CALCULATED AGENT PLAN (MUST FOLLOW STRICTLY) ***
-The Energy Accountant Agent has solved the user's budget equation. 
+The Energy Accountant Agent has solved the user's budget equation.
 You must output these EXACT actions. Do not invent new ones.
 
 - User Mode: {agent_plan.get('mode', 'Optimization')}
@@ -104,31 +87,31 @@ REQUIRED ACTIONS (Write these exactly in the Action Plan):
 {chr(10).join(f"- {action}" for action in agent_plan.get('actions', []))}
 """
 
-        # [B] THE LEGACY ESTIMATION PATH (Fallback)
-        else:
-            # Old Billing Logic
-            cost_per_unit = 16
-            if projected_monthly > 700:
-                target_reduction = int(((projected_monthly - 700) / 30) * 7)
-                tier_name = "CRITICAL"
-                cost_per_unit = 42
-            elif projected_monthly > 300:
-                target_reduction = int(((projected_monthly - 300) / 30) * 7)
-                tier_name = "HIGH"
-                cost_per_unit = 27
-            elif projected_monthly > 200:
-                target_reduction = int(((projected_monthly - 200) / 30) * 7)
-                tier_name = "WARNING"
-                cost_per_unit = 22
-
-            # Cap reduction
-            max_realistic = int(total_future_usage * 0.3)
-            if target_reduction > max_realistic:
-                target_reduction = max_realistic
-
-            potential_savings = target_reduction * cost_per_unit
-
-            agent_instructions = f"""
+    # [B] THE LEGACY ESTIMATION PATH (Fallback)
+    else:
+        # Old Billing Logic
+        cost_per_unit = 16
+        if projected_monthly > 700:
+            target_reduction = int(((projected_monthly - 700) / 30) * 7)
+            tier_name = "CRITICAL"
+            cost_per_unit = 42
+        elif projected_monthly > 300:
+            target_reduction = int(((projected_monthly - 300) / 30) * 7)
+            tier_name = "HIGH"
+            cost_per_unit = 27
+        elif projected_monthly > 200:
+            target_reduction = int(((projected_monthly - 200) / 30) * 7)
+            tier_name = "WARNING"
+            cost_per_unit = 22
+
+        # Cap reduction
+        max_realistic = int(total_future_usage * 0.3)
+        if target_reduction > max_realistic:
+            target_reduction = max_realistic
+
+        potential_savings = target_reduction * cost_per_unit
+
+        agent_instructions = f"""
 *** ESTIMATED PLAN (No Agent Data) ***
 - Target Reduction: {target_reduction} kWh
 - Estimated Savings: Rs. {potential_savings}
@@ -136,31 +119,56 @@ REQUIRED ACTIONS (Write these exactly in the Action Plan):
 (Generate generic device advice based on season)
 """
 
-        # --- STEP 5: DEVICE CONTEXT (For Flavor Text) ---
-        residents = household_profile.get("residents", 4)
-        selected_devices = household_profile.get("devices", [])
+    # --- STEP 5: DEVICE CONTEXT (For Flavor Text) ---
+    residents = household_profile.get("residents", 4)
+    selected_devices = household_profile.get("devices", [])
+
+    return {
+        "residents": residents,
+        "selected_devices": selected_devices,
+        "actual_season": actual_season,
+        "season_type": season_type,
+        "avg_temp": avg_temp,
+        "past_usage": past_usage,
+        "total_future_usage": total_future_usage,
+        "projected_monthly": projected_monthly,
+        "tier_name": tier_name,
+        "target_reduction": target_reduction,
+        "potential_savings": potential_savings,
+        "agent_plan": agent_plan,
+        "agent_instructions": agent_instructions,
+        "daily_forecast": daily_forecast,
+    }
+
+
+def build_report_prompt(ctx):
+    """
+    Turns the report facts into the AI writer prompt.
+    """
+    daily_forecast = ctx["daily_forecast"]
+    selected_devices = ctx["selected_devices"]
 
-        # --- STEP 6: BUILD FACTS FOR AI ---
-        facts_for_ai = f"""
+    # --- STEP 6: BUILD FACTS FOR AI ---
+    facts_for_ai = f"""
 CONTEXTUAL FACTS:
-- Residents: {residents}
-- Season: {actual_season} ({avg_temp:.1f}°C) -> Focus on {season_type}
-- Past 7 Days Usage: {past_usage:.1f} kWh
-- Next 7 Days Forecast: {total_future_usage:.1f} kWh
-- Projected Monthly: {projected_monthly:.1f} kWh
-- Billing Tier: {tier_name}
+- Residents: {ctx['residents']}
+- Season: {ctx['actual_season']} ({ctx['avg_temp']:.1f}°C) -> Focus on {ctx['season_type']}
+- Past 7 Days Usage: {ctx['past_usage']:.1f} kWh
+- Next 7 Days Forecast: {ctx['total_future_usage']:.1f} kWh
+- Projected Monthly: {ctx['projected_monthly']:.1f} kWh
+- Billing Tier: {ctx['tier_name']}
 
-{agent_instructions}
+{ctx['agent_instructions']}
 
 AVAILABLE DEVICES IN HOME:
 {', '.join(selected_devices) if selected_devices else "Standard Basic Appliances"}
 
 DAILY WEATHER FORECAST (Use for day-by-day advice):
-{chr(10).join(f"- {row['day_name']}: {row['predicted_usage_kwh']:.1f} kWh predicted at {row['temperature_c']:.1f}°C" for _, row in daily_forecast.iterrows())}
+{chr(10).join(f"- {day}: {usage:.1f} kWh predicted at {temp:.1f}°C" for day, usage, temp in zip(daily_forecast['day_name'], daily_forecast['predicted_usage_kwh'], daily_forecast['temperature_c']))}
 """
 
-        # --- STEP 7: PROMPT CONSTRUCTION ---
-        prompt = f"""You are writing an Energy Audit Report based on strict mathematical calculations.
+    # --- STEP 7: PROMPT CONSTRUCTION ---
+    return f"""You are writing an Energy Audit Report based on strict mathematical calculations.
 
 {facts_for_ai}
 
@@ -170,14 +178,14 @@ Write a professional report with these EXACT sections:
 Summarize the user's current status (Forecast vs Target). If an Agent Plan exists, state the "Gap to Close".
 
 **SECTION 2: REQUIRED ACTIONS (THE PLAN)**
-If "CALCULATED AGENT PLAN" is provided above, list those exact actions. 
+If "CALCULATED AGENT PLAN" is provided above, list those exact actions.
 If not, recommend general reductions based on the Season and Available Devices.
 
 **SECTION 3: 7-DAY WEATHER STRATEGY**
 Look at the Daily Weather Forecast above. Give a specific tip for each day based on the temperature (e.g., "Monday is hot, use fans").
 
-**SECTION 4: {actual_season.upper()} SEASON TIPS**
-Give 3 short, specific technical tips for {season_type} efficiency.
+**SECTION 4: {ctx['actual_season'].upper()} SEASON TIPS**
+Give 3 short, specific technical tips for {ctx['season_type']} efficiency.
 
 CRITICAL RULES:
 1. If the "CALCULATED AGENT PLAN" is present, YOU MUST use those numbers. Do not hallucinate different numbers.
@@ -186,7 +194,35 @@ CRITICAL RULES:
 
 Write the report now."""
 
+
+def get_ai_energy_plan(
+    past_df, future_df, api_key, household_profile={}, agent_plan=None, mode="ai"
+):
+    """
+    Generates Context-Aware Energy Plan using a HYBRID approach:
+    - If 'agent_plan' is provided, the Report strictly follows the Agent's math.
+    - If not, it falls back to standard estimation logic.
+    - AI only writes natural language based on these pre-computed facts.
+    - mode="local" (or no API key) renders the deterministic template report
+      instead, with no network call. It is also the fallback if every model fails.
+      Any mode other than those in REPORT_MODES raises ValueError.
+    """
+    if mode not in REPORT_MODES:
+        raise ValueError(f"❌ Unknown report mode '{mode}' (use {REPORT_MODES}).")
+    print("🤖 AI CONSULTANT: Analyzing Data & Building Strategy...")
+
+    try:
+        ctx = build_report_context(past_df, future_df, household_profile, agent_plan)
+
+        if mode == "local" or not api_key:
+            return render_local_report(ctx)
+
+        prompt = build_report_prompt(ctx)
+
         # --- STEP 8: API CALL ---
+        # Lazy: huggingface_hub costs ~0.5s to import and the local mode never needs it
+        from huggingface_hub import InferenceClient
+
         free_chat_models = [
             "meta-llama/Llama-3.2-3B-Instruct",
             "mistralai/Mistral-7B-Instruct-v0.2",
@@ -220,16 +256,22 @@ Write the report now."""
                 print(f"⚠️ {model_name} error: {str(e)[:100]}")
                 continue
 
-        # Fallback if AI fails
-        return f"""**⚠️ AI Connection Busy - Here is your Raw Plan:**
-
-**TARGET:** {agent_plan.get('target_units', 'N/A') if agent_plan else 'N/A'} kWh
-**PREDICTED:** {agent_plan.get('predicted_units', 'N/A') if agent_plan else total_future_usage:.1f} kWh
-
-**REQUIRED ACTIONS:**
-{chr(10).join(f"- {action}" for action in agent_plan.get('actions', [])) if agent_plan else "Focus on reducing AC and Heater usage."}
-
-*(Please try generating the full report again later)*"""
+        # Fallback if AI fails: the local report carries the same facts
+        return (
+            "**⚠️ AI Connection Busy - Here is your Instant Report:**\n\n"
+            + render_local_report(ctx)
+        )
 
     except Exception as e:
         return f"❌ System Error: {str(e)}"
+
+
+def generate_local_reports(households):
+    """
+    Batch/offline mode: renders template reports for many households.
+    'households' is an iterable of (past_df, future_df, household_profile, agent_plan).
+    """
+    return [
+        render_local_report(build_report_context(past, future, profile, plan))
+        for past, future, profile, plan in households
+    ]
@@ -0,0 +1,131 @@
+# src/report_template.py
+# Deterministic, template-driven Energy Audit Report.
+# Renders the same four sections as the AI writer from pre-computed facts
+# (no network, runs in milliseconds).
+
+SEASON_TIPS = {
+    "cooling": [
+        "Set the AC to 26°C; every degree lower adds roughly 6% to its consumption.",
+        "Clean AC filters every two weeks so the compressor does not overwork.",
+        "Close curtains on sun-facing windows between 12 PM and 4 PM.",
+    ],
+    "heating": [
+        "Keep the geyser thermostat at 50°C and switch it off after morning use.",
+        "Heat only occupied rooms and close doors to keep the warm air in.",
+        "Seal gaps under doors and windows to stop cold drafts.",
+    ],
+    "moderate": [
+        "Use ceiling fans instead of the AC while temperatures stay mild.",
+        "Open windows in the early morning and evening for free ventilation.",
+        "Shift washing and ironing to off-peak hours (before 7 AM or after 7 PM).",
+    ],
+}
+
+SEASON_DEVICE_FOCUS = {
+    "cooling": ["AC", "Motor", "Iron"],
+    "heating": ["Heater", "Geyser", "Iron"],
+    "moderate": ["Washing Machine", "Iron", "Motor"],
+}
+
+HOT_DAY_C = 32
+WARM_DAY_C = 28
+COLD_DAY_C = 18
+
+
+def _day_tip(day_name, usage_kwh, temp_c, avg_daily):
+    if temp_c >= HOT_DAY_C:
+        tip = "hot day, pre-cool rooms before noon and keep the AC at 26°C"
+    elif temp_c >= WARM_DAY_C:
+        tip = "warm day, use fans first and run the AC only in the evening"
+    elif temp_c <= COLD_DAY_C:
+        tip = "cold day, limit heater and geyser to short morning cycles"
+    else:
+        tip = "mild day, good time for laundry and ironing at off-peak hours"
+
+    if usage_kwh > avg_daily * 1.1:
+        tip += " (above-average load expected)"
+    return f"- **{day_name}** ({temp_c:.1f}°C, {usage_kwh:.1f} kWh): {tip}."
+
+
+def _situation_section(ctx):
+    lines = [
+        f"Your home ({ctx['residents']} residents) is forecast to use "
+        f"**{ctx['total_future_usage']:.1f} kWh** over the next 7 days, after "
+        f"**{ctx['past_usage']:.1f} kWh** in the last 7 days.",
+        f"That projects to **{ctx['projected_monthly']:.1f} kWh/month** "
+        f"(Billing Tier: {ctx['tier_name']}).",
+    ]
+    agent_plan = ctx["agent_plan"]
+    if agent_plan:
+        lines.append(
+            f"Your target is **{agent_plan.get('target_units', 0)} kWh** against a "
+            f"prediction of **{agent_plan.get('predicted_units', 0)} kWh**. "
+            f"Gap to Close: **{agent_plan.get('gap_units', 0)} kWh**."
+        )
+    elif ctx["target_reduction"] > 0:
+        lines.append(
+            f"Reducing usage by **{ctx['target_reduction']} kWh** this week can save "
+            f"about **Rs. {ctx['potential_savings']:,}**."
+        )
+    return "\n\n".join(lines)
+
+
+def _actions_section(ctx):
+    agent_plan = ctx["agent_plan"]
+    if agent_plan and agent_plan.get("actions"):
+        return "\n".join(f"- {action}" for action in agent_plan["actions"])
+
+    devices = ctx["selected_devices"]
+    focus = [
+        d
+        for d in SEASON_DEVICE_FOCUS[ctx["season_type"]]
+        if not devices or any(d.lower() in s.lower() for s in devices)
+    ] or SEASON_DEVICE_FOCUS[ctx["season_type"]][:2]
+
+    share = ctx["target_reduction"] / len(focus) if ctx["target_reduction"] else 0
+    actions = []
+    for device in focus:
+        if share:
+            actions.append(
+                f"- Cut **{device}** usage to save about {share:.1f} kWh this week."
+            )
+        else:
+            actions.append(f"- Keep **{device}** usage at current levels.")
+    return "\n".join(actions)
+
+
+def render_local_report(ctx):
+    """
+    Renders the full four-section report from the facts built by
+    recommender.build_report_context().
+    """
+    forecast = ctx["daily_forecast"]
+    avg_daily = ctx["total_future_usage"] / 7
+    day_tips = "\n".join(
+        _day_tip(day, usage, temp, avg_daily)
+        for day, usage, temp in zip(
+            forecast["day_name"],
+            forecast["predicted_usage_kwh"],
+            forecast["temperature_c"],
+        )
+    )
+    season_tips = "\n".join(
+        f"{i}. {tip}" for i, tip in enumerate(SEASON_TIPS[ctx["season_type"]], 1)
+    )
+
+    return f"""**SECTION 1: THE SITUATION**
+
+{_situation_section(ctx)}
+
+**SECTION 2: REQUIRED ACTIONS (THE PLAN)**
+
+{_actions_section(ctx)}
+
+**SECTION 3: 7-DAY WEATHER STRATEGY**
+
+{day_tips}
+
+**SECTION 4: {ctx['actual_season'].upper()} SEASON TIPS**
+
+{season_tips}
+"""
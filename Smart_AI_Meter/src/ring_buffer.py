@@ -0,0 +1,80 @@
+# src/ring_buffer.py
+import numpy as np
+import pandas as pd
+
+LIVE_CHANNELS = ("voltage", "current", "power_kw")
+LIVE_CAPACITY = 60 * 60  # App window: 1 hour at 1 Hz, ~230 KB per session
+
+
+def new_ring_buffer(capacity, channels=LIVE_CHANNELS):
+    """
+    Fixed-capacity buffer of timestamped samples, allocated once.
+
+    Every sample is written twice (slot i and i + capacity), so the latest
+    n samples are always one contiguous slice: windows are views, not copies,
+    and appends never allocate. Memory: 2 x capacity x (channels + 1) x 8 bytes.
+    """
+    return {
+        "capacity": capacity,
+        "channels": list(channels),
+        "values": np.zeros((2 * capacity, len(channels)), dtype=np.float64),
+        "times": np.zeros(2 * capacity, dtype="datetime64[ns]"),
+        "pos": 0,  # Next slot to write, 0 .. capacity-1
+        "size": 0,  # Valid samples, up to capacity
+    }
+
+
+def ring_append(buf, timestamp, values):
+    """
+    Adds one sample (values in channel order). O(1), overwrites the oldest
+    sample once the buffer is full.
+    """
+    pos, capacity = buf["pos"], buf["capacity"]
+    t = np.datetime64(timestamp, "ns")
+    buf["values"][pos] = buf["values"][pos + capacity] = values
+    buf["times"][pos] = buf["times"][pos + capacity] = t
+    buf["pos"] = (pos + 1) % capacity
+    buf["size"] = min(buf["size"] + 1, capacity)
+
+
+def ring_extend(buf, timestamps, values):
+    """
+    Adds many samples at once (values shaped [n, channels]); same result as
+    calling ring_append for each row, in a few vectorized writes.
+    """
+    capacity = buf["capacity"]
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    values = np.asarray(values, dtype=np.float64)
+    values = values.reshape(len(timestamps), len(buf["channels"]))
+    n = len(timestamps)
+    if n > capacity:  # Only the newest `capacity` rows would survive anyway
+        timestamps, values = timestamps[-capacity:], values[-capacity:]
+        skipped, n = n - capacity, capacity
+    else:
+        skipped = 0
+
+    slots = (buf["pos"] + skipped + np.arange(n)) % capacity
+    for offset in (0, capacity):
+        buf["values"][slots + offset] = values
+        buf["times"][slots + offset] = timestamps
+    buf["pos"] = (buf["pos"] + skipped + n) % capacity
+    buf["size"] = min(buf["size"] + skipped + n, capacity)
+
+
+def ring_window(buf, n=None):
+    """
+    Latest n samples (default: all), oldest first, as zero-copy views:
+    (times[n], values[n, channels]). Do not write through them.
+    """
+    n = buf["size"] if n is None else min(n, buf["size"])
+    end = buf["pos"] + buf["capacity"]
+    return buf["times"][end - n : end], buf["values"][end - n : end]
+
+
+def ring_frame(buf, n=None):
+    """
+    Latest n samples as a DataFrame indexed by timestamp (for charts).
+    """
+    times, values = ring_window(buf, n)
+    index = pd.DatetimeIndex(times, name="timestamp")
+    return pd.DataFrame(values, index=index, columns=buf["channels"])
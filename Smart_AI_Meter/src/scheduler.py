@@ -0,0 +1,71 @@
+# src/scheduler.py
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+CORE_BUDGET = os.cpu_count() or 1  # Cores all heavy jobs may use together
+WAIT_HISTORY = 200  # Recent admission waits kept for the stats
+
+_COND = threading.Condition()
+_QUEUE = deque()  # (ticket, queued_at), first come first served
+_RUNNING = {}  # ticket -> (job name, cores granted)
+_TICKETS = itertools.count()
+_WAITS = deque(maxlen=WAIT_HISTORY)
+_STATE = {"cores_in_use": 0, "admitted": 0}
+
+
+@contextmanager
+def compute_slot(name, max_cores=None):
+    """
+    Admits one CPU-heavy job against the process-wide core budget and yields
+    its core grant. Jobs are admitted strictly in arrival order; free cores
+    are split evenly among the jobs waiting at that moment. The grant only
+    takes effect when the job passes it on (e.g. as n_jobs); threads the job
+    starts on its own are not limited here.
+    """
+    ticket = next(_TICKETS)
+    queued_at = time.perf_counter()
+    with _COND:
+        _QUEUE.append((ticket, queued_at))
+        while _QUEUE[0][0] != ticket or _STATE["cores_in_use"] >= CORE_BUDGET:
+            _COND.wait()
+
+        free = CORE_BUDGET - _STATE["cores_in_use"]
+        cores = max(1, min(free // len(_QUEUE), max_cores or CORE_BUDGET))
+        _QUEUE.popleft()
+        _RUNNING[ticket] = (name, cores)
+        _STATE["cores_in_use"] += cores
+        _STATE["admitted"] += 1
+        _WAITS.append(time.perf_counter() - queued_at)
+        _COND.notify_all()  # The next job in line may fit in what is left
+
+    try:
+        yield cores
+    finally:
+        with _COND:
+            del _RUNNING[ticket]
+            _STATE["cores_in_use"] -= cores
+            _COND.notify_all()
+
+
+def scheduler_stats():
+    """
+    Snapshot for monitoring: budget, cores in use, running and queued jobs,
+    and admission wait times (seconds) of recent jobs.
+    """
+    with _COND:
+        now = time.perf_counter()
+        waits = sorted(_WAITS)
+        return {
+            "core_budget": CORE_BUDGET,
+            "cores_in_use": _STATE["cores_in_use"],
+            "running": sorted(_RUNNING.values()),
+            "queued": len(_QUEUE),
+            "oldest_wait_s": now - _QUEUE[0][1] if _QUEUE else 0.0,
+            "admitted": _STATE["admitted"],
+            "mean_wait_s": sum(waits) / len(waits) if waits else 0.0,
+            "max_wait_s": waits[-1] if waits else 0.0,
+        }
@@ -2,16 +2,16 @@
 import pandas as pd
 import numpy as np
 
+# --- 1. CONSTANTS (Pakistani Market Rates) ---
+COST_PER_KW = 120000  # Avg cost of 1kW system (panels + inverter + structure)
+UNIT_RATE = 45  # Avg cost per unit (kWh) from grid (blended rate)
+UNITS_PER_KW_DAILY = 4.2  # Daily generation per 1kW (Karachi sunlight avg)
+
 
 def calculate_solar_roi(avg_monthly_bill):
     """
     Calculates Solar System Size, Cost, and ROI based on the user's bill.
     """
-    # --- 1. CONSTANTS (Pakistani Market Rates) ---
-    COST_PER_KW = 120000  # Avg cost of 1kW system (panels + inverter + structure)
-    UNIT_RATE = 45  # Avg cost per unit (kWh) from grid (blended rate)
-    UNITS_PER_KW_DAILY = 4.2  # Daily generation per 1kW (Karachi sunlight avg)
-
     # --- 2. SYSTEM SIZING LOGIC ---
     # Reverse calc: Bill -> Units needed
     avg_monthly_units = avg_monthly_bill / UNIT_RATE
@@ -0,0 +1,159 @@
+# src/solar_batch.py
+import numpy as np
+import pandas as pd
+
+from src.solar import COST_PER_KW, UNIT_RATE, UNITS_PER_KW_DAILY
+from src.solar_sim import EXPORT_RATE, HOURS_PER_YEAR, clear_sky_profile
+
+CHUNK_SIZE = 100_000  # Customers per vectorized pass (bounds temporary memory)
+WEEK_SLOTS = 168  # (weekday, hour) cells of a weekly load profile
+
+
+def _finish_table(index, size_kw, yearly_savings, extra=None):
+    """
+    Shared ROI columns + portfolio rank (1 = biggest 10-year net profit).
+    """
+    total_cost = size_kw * COST_PER_KW
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback = np.where(yearly_savings > 0, total_cost / yearly_savings, np.inf)
+    net_profit = yearly_savings * 10 - total_cost
+
+    table = pd.DataFrame(
+        {
+            "system_size_kw": size_kw,
+            "total_cost": total_cost,
+            "monthly_savings": yearly_savings / 12,
+            "payback_years": payback,
+            "net_profit_10y": net_profit,
+            **(extra or {}),
+        },
+        index=index,
+    )
+    rank = np.empty(len(table), dtype=np.int64)
+    rank[np.argsort(-net_profit, kind="stable")] = np.arange(1, len(table) + 1)
+    table["rank"] = rank
+    return table
+
+
+# --- 1. BILL-ONLY SCREENING (same rules as calculate_solar_roi) ---
+def screen_bills(monthly_bills):
+    """
+    calculate_solar_roi() for a whole customer base. Accepts an array or a
+    Series of average monthly bills (the Series index is kept as customer id).
+    Only 1-D temporaries, so a million bills need no chunking.
+    """
+    bills = np.asarray(monthly_bills, dtype=float)
+    size_kw = np.ceil(bills / UNIT_RATE / 30 / UNITS_PER_KW_DAILY)
+    yearly_savings = size_kw * UNITS_PER_KW_DAILY * 30 * UNIT_RATE * 12
+    index = getattr(monthly_bills, "index", None)
+    return _finish_table(index, size_kw, yearly_savings)
+
+
+# --- 2. HOURLY-HISTORY SCREENING ---
+def weekly_profiles(df, customer_col="customer_id", usage_col="usage_kwh"):
+    """
+    Long (customer, timestamp, usage) history -> (customer_ids, float32
+    (n_customers, 168) mean usage per weekday-hour), like build_hourly_load
+    but for every customer in one bincount.
+    """
+    codes, customers = pd.factorize(df[customer_col], sort=True)
+    ts = pd.to_datetime(df["timestamp"])
+    slot = ts.dt.dayofweek.to_numpy() * 24 + ts.dt.hour.to_numpy()
+    key = codes * WEEK_SLOTS + slot
+
+    size = len(customers) * WEEK_SLOTS
+    sums = np.bincount(key, weights=df[usage_col].to_numpy(), minlength=size)
+    counts = np.bincount(key, minlength=size)
+    sums = sums.reshape(-1, 7, 24)
+    counts = counts.reshape(-1, 7, 24)
+
+    # Weekday-hours never seen fall back to the customer's mean for that hour
+    hourly_mean = sums.sum(axis=1) / np.maximum(counts.sum(axis=1), 1)
+    weekly = np.where(
+        counts > 0, sums / np.maximum(counts, 1), hourly_mean[:, None, :]
+    )
+    return customers, weekly.reshape(-1, WEEK_SLOTS).astype(np.float32)
+
+
+def _slot_generation(year):
+    """
+    Clear-sky output per kW grouped by weekly slot: each row holds the ~52
+    hours of the year that fall in that (weekday, hour), sorted ascending and
+    zero-padded, plus prefix sums. Lets min(generation, load) be summed
+    exactly with one searchsorted per slot instead of 8,760 hourly minimums.
+    """
+    calendar = pd.date_range(f"{year}-01-01", periods=HOURS_PER_YEAR, freq="h")
+    slot = calendar.dayofweek.to_numpy() * 24 + calendar.hour.to_numpy()
+    pv = clear_sky_profile()
+
+    order = np.argsort(slot, kind="stable")
+    counts = np.bincount(slot, minlength=WEEK_SLOTS)
+    width = counts.max()
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+
+    grouped = np.zeros((WEEK_SLOTS, width))
+    grouped[slot[order], np.arange(HOURS_PER_YEAR) - starts] = pv[order]
+    # Sorting moves the zero padding to the front of each row
+    sorted_pv = np.sort(grouped, axis=1)
+    prefix = np.concatenate(
+        [np.zeros((WEEK_SLOTS, 1)), np.cumsum(sorted_pv, axis=1)], axis=1
+    )
+    return sorted_pv, prefix, counts
+
+
+def screen_profiles(
+    weekly,
+    year=None,
+    customers=None,
+    export_rate=EXPORT_RATE,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Sizes every customer by calculate_solar_roi's rule (whole kW covering average
+    daily use), then values generation hour by hour against their own weekly
+    load: self-consumed units at the grid rate, exports at export_rate.
+    """
+    weekly = np.asarray(weekly, dtype=np.float32)
+    year = pd.Timestamp.now().year if year is None else year
+    sorted_pv, prefix, slot_hours = _slot_generation(year)
+    width = sorted_pv.shape[1]
+    pv_total = float(prefix[:, -1].sum())
+
+    # Rows offset by 2 (pv per kW < 1) so one flat searchsorted serves all slots
+    offsets = 2.0 * np.arange(WEEK_SLOTS)
+    flat_pv = (sorted_pv + offsets[:, None]).ravel()
+
+    n = len(weekly)
+    size_kw = np.empty(n)
+    self_consumed = np.empty(n)
+    annual_load = np.empty(n)
+    for start in range(0, n, chunk_size):
+        load = weekly[start : start + chunk_size].astype(float)
+        daily = load.sum(axis=1) / 7
+        size = np.ceil(daily / UNITS_PER_KW_DAILY)
+
+        # sum over hours of min(size * pv, load) = size * sum(pv below load/size)
+        #                                        + load * hours at or above it
+        with np.errstate(divide="ignore", invalid="ignore"):
+            threshold = np.where(size[:, None] > 0, load / size[:, None], np.inf)
+        query = np.minimum(threshold, 1.5) + offsets
+        below = np.searchsorted(flat_pv, query) - np.arange(WEEK_SLOTS) * width
+        solar_part = prefix[np.arange(WEEK_SLOTS), below].sum(axis=1) * size
+        # Zero padding is always "below" unless the threshold is 0
+        at_or_above = width - np.maximum(below, width - slot_hours)
+        load_part = np.einsum("ij,ij->i", load, at_or_above)
+
+        size_kw[start : start + chunk_size] = size
+        self_consumed[start : start + chunk_size] = solar_part + load_part
+        annual_load[start : start + chunk_size] = load @ slot_hours
+
+    exported = size_kw * pv_total - self_consumed
+    yearly_savings = self_consumed * UNIT_RATE + exported * export_rate
+    extra = {
+        "annual_load_kwh": annual_load,
+        "self_consumed_kwh": self_consumed,
+        "exported_kwh": exported,
+        "solar_fraction_pct": self_consumed / np.maximum(annual_load, 1e-9) * 100,
+    }
+    index = None if customers is None else pd.Index(customers, name="customer_id")
+    return _finish_table(index, size_kw, yearly_savings, extra)
@@ -0,0 +1,138 @@
+# src/solar_montecarlo.py
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.solar import calculate_solar_roi
+
+# --- UNCERTAINTY ASSUMPTIONS (yearly, Pakistani market) ---
+TARIFF_ESCALATION = (0.10, 0.04)  # Mean / std of yearly grid tariff growth
+DEGRADATION = (0.004, 0.008)  # Uniform range of yearly panel output loss
+COST_SPREAD = 0.10  # Std of installed cost around the quote (fraction)
+GENERATION_SPREAD = 0.05  # Std of year-to-year sunshine variation (fraction)
+
+YEARS = 10  # Horizon of the net-profit chart
+PAYBACK_HORIZON = 25  # Panel lifetime; payback beyond this counts as "never"
+CHUNK_SIZE = 25_000  # Scenarios per worker task (bounds per-task memory)
+PERCENTILES = (10, 50, 90)
+
+_POOL = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _shutdown_pool():
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pool)
+
+
+def _get_pool(n_workers):
+    """
+    One process pool per server process, reused across requests so workers
+    are started once, not on every click; rebuilt if n_workers changes.
+    'spawn' avoids forking the multi-threaded Streamlit server.
+    """
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_SIZE != n_workers:
+            _POOL.shutdown(wait=False)  # Work already submitted still finishes
+            _POOL = None
+        if _POOL is None:
+            _POOL_SIZE = n_workers
+            _POOL = ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _POOL
+
+
+def _simulate_chunk(seed, n, base_cost, base_savings):
+    """
+    Vectorized scenarios for one chunk. Returns (net_profit[n, YEARS + 1], payback[n]).
+    """
+    rng = np.random.default_rng(seed)
+    escalation = rng.normal(*TARIFF_ESCALATION, size=(n, 1))
+    degradation = rng.uniform(*DEGRADATION, size=(n, 1))
+    cost = base_cost * np.clip(rng.normal(1, COST_SPREAD, size=n), 0.5, None)
+    weather = rng.normal(1, GENERATION_SPREAD, size=(n, PAYBACK_HORIZON))
+
+    # Year index 0..24 -> savings in years 1..25
+    age = np.arange(PAYBACK_HORIZON)[None, :]
+    growth = (1 + escalation) ** age * (1 - degradation) ** age
+    yearly = base_savings * growth * weather
+    cumulative = np.cumsum(yearly, axis=1)
+
+    # Fractional payback year: linear interpolation inside the crossing year
+    crossed = cumulative >= cost[:, None]
+    year_idx = np.argmax(crossed, axis=1)
+    before = np.where(
+        year_idx > 0, cumulative[np.arange(n), np.maximum(year_idx - 1, 0)], 0
+    )
+    payback = year_idx + (cost - before) / yearly[np.arange(n), year_idx]
+    payback = np.where(crossed.any(axis=1), payback, np.inf)
+
+    net_profit = np.empty((n, YEARS + 1), dtype=np.float32)
+    net_profit[:, 0] = -cost
+    net_profit[:, 1:] = cumulative[:, :YEARS] - cost[:, None]
+    return net_profit, payback.astype(np.float32)
+
+
+def simulate_solar_roi(
+    avg_monthly_bill, n_scenarios=100_000, n_workers=None, seed=42
+):
+    """
+    Monte Carlo ROI around calculate_solar_roi(): samples tariff escalation,
+    degradation, system cost and generation, then returns percentile bands.
+
+    Chunks run on a process pool kept across calls when n_workers > 1
+    (default: all cores).
+    """
+    base = calculate_solar_roi(avg_monthly_bill)
+    base_cost = float(base["total_cost"])
+    base_savings = float(base["monthly_savings"]) * 12
+
+    sizes = [CHUNK_SIZE] * (n_scenarios // CHUNK_SIZE)
+    if n_scenarios % CHUNK_SIZE:
+        sizes.append(n_scenarios % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    args = [(s, n, base_cost, base_savings) for s, n in zip(seeds, sizes)]
+    if n_workers > 1 and len(args) > 1:
+        results = list(_get_pool(n_workers).map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*a) for a in args]
+
+    net_profit = np.concatenate([r[0] for r in results])
+    payback = np.concatenate([r[1] for r in results])
+
+    # --- PERCENTILE BANDS (plottable next to chart_data) ---
+    low, mid, high = np.percentile(net_profit, PERCENTILES, axis=0)
+    bands = pd.DataFrame(
+        {
+            "Year": np.arange(YEARS + 1),
+            f"P{PERCENTILES[0]} Net Profit (PKR)": low,
+            f"P{PERCENTILES[1]} Net Profit (PKR)": mid,
+            f"P{PERCENTILES[2]} Net Profit (PKR)": high,
+        }
+    )
+    return {
+        "bands": bands,
+        "payback_percentiles": dict(
+            zip(PERCENTILES, np.percentile(payback, PERCENTILES))
+        ),
+        "prob_payback_within_horizon": float((payback <= YEARS).mean()),
+        "net_profit_10y_percentiles": dict(
+            zip(PERCENTILES, (low[-1], mid[-1], high[-1]))
+        ),
+        "n_scenarios": n_scenarios,
+    }
@@ -0,0 +1,138 @@
+# src/solar_sim.py
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.solar import COST_PER_KW, UNIT_RATE, UNITS_PER_KW_DAILY
+
+# Karachi site (same coordinates as the weather service)
+SITE_LAT = 24.8607
+SITE_LON = 67.0011
+UTC_OFFSET_HOURS = 5  # Pakistan Standard Time
+
+HOURS_PER_YEAR = 8760
+PERFORMANCE_RATIO = 0.75  # Inverter, wiring, heat and soiling losses
+CLEAR_SKY_INDEX = 0.84  # Haze/dust/cloud derating (~4.2 kWh/kW/day, as in solar.py)
+EXPORT_RATE = 10  # Rs per unit credited for energy exported to the grid
+DISCOUNT_RATE = 0.15  # Cost of money, used to rank sizes by 10-year NPV
+
+
+@lru_cache(maxsize=8)
+def clear_sky_profile(lat=SITE_LAT, lon=SITE_LON, utc_offset=UTC_OFFSET_HOURS):
+    """
+    8760-hour AC output per 1 kW of panels (kWh per hour), from solar geometry
+    and the Haurwitz clear-sky irradiance model. Cached per site; do not modify
+    the returned array.
+    """
+    hours = np.arange(HOURS_PER_YEAR)
+    day_of_year = hours // 24 + 1
+    clock_hour = hours % 24 + 0.5  # Hour midpoints
+
+    # --- 1. SUN POSITION ---
+    b = np.radians(360 / 365 * (day_of_year - 81))
+    equation_of_time = 9.87 * np.sin(2 * b) - 7.53 * np.cos(b) - 1.5 * np.sin(b)
+    solar_time = clock_hour + (4 * (lon - 15 * utc_offset) + equation_of_time) / 60
+    declination = np.radians(23.45) * np.sin(
+        np.radians(360 / 365 * (284 + day_of_year))
+    )
+    hour_angle = np.radians(15 * (solar_time - 12))
+
+    phi = np.radians(lat)
+    cos_zenith = np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(
+        declination
+    ) * np.cos(hour_angle)
+
+    # --- 2. IRRADIANCE (W/m2) -> PANEL OUTPUT (kWh per kW per hour) ---
+    sun_up = cos_zenith > 0
+    safe_cos = np.where(sun_up, cos_zenith, 1.0)
+    ghi = np.where(sun_up, 1098 * safe_cos * np.exp(-0.057 / safe_cos), 0.0)
+    return ghi / 1000 * PERFORMANCE_RATIO * CLEAR_SKY_INDEX
+
+
+def build_hourly_load(df, usage_col="usage_kwh", year=None):
+    """
+    Expands an hourly history or forecast into an 8760-hour load profile by
+    averaging it per (weekday, hour) and laying that week onto a full year.
+    """
+    ts = pd.to_datetime(df["timestamp"])
+    slot = ts.dt.dayofweek.to_numpy() * 24 + ts.dt.hour.to_numpy()
+    weekly = np.bincount(slot, weights=df[usage_col].to_numpy(), minlength=168)
+    counts = np.bincount(slot, minlength=168)
+    weekly, counts = weekly.reshape(7, 24), counts.reshape(7, 24)
+
+    # Hours never seen fall back to the mean for that hour of day
+    hourly_mean = weekly.sum(axis=0) / np.maximum(counts.sum(axis=0), 1)
+    weekly = np.where(counts > 0, weekly / np.maximum(counts, 1), hourly_mean)
+
+    year = ts.dt.year.iloc[-1] if year is None else year
+    calendar = pd.date_range(f"{year}-01-01", periods=HOURS_PER_YEAR, freq="h")
+    return weekly[calendar.dayofweek, calendar.hour]
+
+
+def simulate_solar_sizes(
+    load_kwh,
+    sizes_kw,
+    pv_per_kw=None,
+    import_rate=UNIT_RATE,
+    export_rate=EXPORT_RATE,
+    cost_per_kw=COST_PER_KW,
+):
+    """
+    Nets hourly generation against hourly load for every candidate size in one
+    (n_sizes x 8760) pass. Self-consumed units save the grid rate, exported
+    units only earn the export rate.
+    """
+    pv_per_kw = clear_sky_profile() if pv_per_kw is None else pv_per_kw
+    load = np.asarray(load_kwh, dtype=float)
+    sizes = np.asarray(sizes_kw, dtype=float)
+
+    generation = sizes[:, None] * pv_per_kw[None, :]
+    self_consumed = np.minimum(generation, load[None, :]).sum(axis=1)
+    generated = sizes * pv_per_kw.sum()
+    exported = generated - self_consumed
+
+    annual_savings = self_consumed * import_rate + exported * export_rate
+    total_cost = sizes * cost_per_kw
+    annuity = (1 - (1 + DISCOUNT_RATE) ** -10) / DISCOUNT_RATE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback_years = np.where(
+            annual_savings > 0, total_cost / annual_savings, np.inf
+        )
+        self_consumption_pct = np.where(
+            generated > 0, self_consumed / generated * 100, 0
+        )
+        solar_fraction_pct = np.where(
+            load.sum() > 0, self_consumed / load.sum() * 100, 0
+        )
+
+    return pd.DataFrame(
+        {
+            "system_size_kw": sizes,
+            "total_cost": total_cost,
+            "annual_generation_kwh": generated,
+            "self_consumed_kwh": self_consumed,
+            "exported_kwh": exported,
+            "self_consumption_pct": self_consumption_pct,
+            "solar_fraction_pct": solar_fraction_pct,
+            "annual_savings": annual_savings,
+            "payback_years": payback_years,
+            "net_profit_10y": annual_savings * 10 - total_cost,
+            "npv_10y": annual_savings * annuity - total_cost,
+        }
+    )
+
+
+def recommend_solar_size(load_kwh, max_size_kw=None, n_sizes=100):
+    """
+    Evaluates n_sizes candidate systems (0.5 kW up to max_size_kw) and picks
+    the one with the best 10-year NPV (oversized systems mostly export cheap units).
+    Returns (best_row, full_table).
+    """
+    load = np.asarray(load_kwh, dtype=float)
+    if max_size_kw is None:
+        # Twice the size that would cover average daily use on paper
+        max_size_kw = max(2 * load.sum() / 365 / UNITS_PER_KW_DAILY, 1.0)
+    sizes = np.linspace(0.5, max_size_kw, n_sizes)
+    table = simulate_solar_sizes(load, sizes)
+    return table.loc[table["npv_10y"].idxmax()], table
@@ -0,0 +1,128 @@
+# src/stream_follower.py
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.ring_buffer import LIVE_CHANNELS, ring_extend
+
+STREAM_PATH = os.path.join("data", "live_stream.csv")  # Written by simulate_sensor.py
+STREAM_COLUMNS = ["timestamp", *LIVE_CHANNELS]
+BACKFILL_BYTES = 256 * 1024  # On attach, only the file's tail (~1 h at 1 Hz)
+MAX_POLL_BYTES = 8 * 1024 * 1024  # Per poll; a bigger backlog drains over polls
+
+
+def new_follower(path=STREAM_PATH, backfill_bytes=BACKFILL_BYTES):
+    """
+    State of a `tail -F` style reader: the open file, its identity
+    (device, inode), the byte offset read so far and any unfinished line.
+    """
+    return {
+        "path": path,
+        "backfill_bytes": backfill_bytes,
+        "file": None,
+        "inode": None,
+        "offset": 0,
+        "partial": b"",
+        "resets": 0,  # Truncations and rotations seen
+    }
+
+
+def _open(state):
+    """
+    (Re)opens the path. The first open starts near the end of the file, so
+    attaching to a huge stream stays cheap; a rotated-in file is read from
+    its first byte. Returns False while the file does not exist.
+    """
+    try:
+        f = open(state["path"], "rb")
+    except FileNotFoundError:
+        return False
+    info = os.fstat(f.fileno())
+
+    start = 0
+    if state["inode"] is None:
+        start = max(0, info.st_size - state["backfill_bytes"])
+    f.seek(start)
+    if start > 0:
+        f.readline()  # Skip the cut-off line we landed in
+
+    if state["file"] is not None:
+        state["file"].close()
+    state.update(
+        file=f, inode=(info.st_dev, info.st_ino), offset=f.tell(), partial=b""
+    )
+    return True
+
+
+def _parse(data):
+    """
+    Complete CSV lines -> (times[n], values[n, channels]). Header and
+    malformed lines are dropped.
+    """
+    if not data:
+        return np.empty(0, "datetime64[ns]"), np.empty((0, len(LIVE_CHANNELS)))
+    rows = pd.read_csv(
+        io.BytesIO(data),
+        header=None,
+        names=STREAM_COLUMNS,
+        dtype=str,
+        on_bad_lines="skip",
+    )
+    times = pd.to_datetime(rows["timestamp"], format="ISO8601", errors="coerce")
+    values = rows[list(LIVE_CHANNELS)].apply(pd.to_numeric, errors="coerce")
+    ok = times.notna().to_numpy() & values.notna().all(axis=1).to_numpy()
+    return times.to_numpy("datetime64[ns]")[ok], values.to_numpy(np.float64)[ok]
+
+
+def follow_poll(state, max_bytes=MAX_POLL_BYTES):
+    """
+    Reads only the bytes appended since the last poll and returns them parsed,
+    as (times, values). Cost is proportional to the new data, not the file.
+
+    - Truncation (file shorter than our offset): restart from byte 0.
+    - Rotation (path now names a different file): finish the old file,
+      then continue with the new one from its start.
+    """
+    if state["file"] is None and not _open(state):
+        return _parse(b"")
+
+    chunk = state["file"].read(max_bytes)
+    state["offset"] += len(chunk)
+    data = state["partial"] + chunk
+
+    if len(chunk) < max_bytes:  # Caught up: check what the path points at now
+        try:
+            info = os.stat(state["path"])
+        except FileNotFoundError:
+            info = None  # Mid-rotation; keep the old file for now
+        if info is not None and (info.st_dev, info.st_ino) != state["inode"]:
+            data += b"\n"  # The old file is finished, so is its last line
+            _open(state)
+            state["resets"] += 1
+        elif os.fstat(state["file"].fileno()).st_size < state["offset"]:
+            state["file"].seek(0)
+            state.update(offset=0, partial=b"")
+            state["resets"] += 1
+            return _parse(b"")
+
+    cut = data.rfind(b"\n") + 1
+    state["partial"] = data[cut:]
+    return _parse(data[:cut])
+
+
+def follow_into_buffer(state, buf, max_bytes=MAX_POLL_BYTES):
+    """
+    One poll straight into a ring buffer. Returns how many samples arrived.
+    """
+    times, values = follow_poll(state, max_bytes)
+    if len(times):
+        ring_extend(buf, times, values)
+    return len(times)
+
+
+def close_follower(state):
+    if state["file"] is not None:
+        state["file"].close()
+        state["file"] = None
@@ -0,0 +1,142 @@
+# src/tariff.py
+import numpy as np
+
+# Residential slab table: (slab width in units, Rs per unit).
+# The last slab must be open-ended (np.inf).
+DEFAULT_SLABS = [
+    (200, 18),
+    (100, 30),
+    (np.inf, 40),
+]
+
+
+def build_slab_table(slabs=None):
+    """
+    Pre-computes slab boundaries so forward and inverse billing are O(log slabs)
+    lookups per meter instead of if-chains.
+    """
+    slabs = DEFAULT_SLABS if slabs is None else slabs
+    widths = np.array([w for w, _ in slabs], dtype=float)
+    rates = np.array([r for _, r in slabs], dtype=float)
+
+    if not np.isinf(widths[-1]):
+        raise ValueError("❌ The last tariff slab must be open-ended (np.inf).")
+
+    # Units and cost at the start of each slab
+    unit_starts = np.concatenate(([0.0], np.cumsum(widths[:-1])))
+    cost_starts = np.concatenate(([0.0], np.cumsum(widths[:-1] * rates[:-1])))
+
+    return {
+        "rates": rates,
+        "unit_starts": unit_starts,
+        "cost_starts": cost_starts,
+        # Upper bounds (exclusive of the open-ended last slab) for searchsorted
+        "unit_bounds": unit_starts[1:],
+        "cost_bounds": cost_starts[1:],
+    }
+
+
+DEFAULT_TABLE = build_slab_table()
+
+
+def units_to_cost(units, table=None):
+    """
+    Vectorized units (kWh) -> bill (Rs) over any array shape.
+    Negative usage is billed at the first slab rate (same as the scalar code).
+    """
+    table = DEFAULT_TABLE if table is None else table
+    units = np.asarray(units, dtype=float)
+    slab = np.searchsorted(table["unit_bounds"], units, side="left")
+    return table["cost_starts"][slab] + (
+        units - table["unit_starts"][slab]
+    ) * table["rates"][slab]
+
+
+def cost_to_units(cost, table=None):
+    """
+    Vectorized bill (Rs) -> affordable units (kWh), the inverse of units_to_cost.
+    """
+    table = DEFAULT_TABLE if table is None else table
+    cost = np.asarray(cost, dtype=float)
+    slab = np.searchsorted(table["cost_bounds"], cost, side="right")
+    return table["unit_starts"][slab] + (
+        cost - table["cost_starts"][slab]
+    ) / table["rates"][slab]
+
+
+# ---------------------------------------------
+# TIME-OF-USE (TOU) BILLING
+# ---------------------------------------------
+PEAK_START = 7
+PEAK_END = 19
+PEAK_RATE = 48  # Rs per unit during peak hours
+OFF_PEAK_RATE = 36  # Rs per unit during off-peak hours
+
+
+def build_tou_matrix(
+    peak_rate=PEAK_RATE,
+    off_peak_rate=OFF_PEAK_RATE,
+    peak_start=PEAK_START,
+    peak_end=PEAK_END,
+    weekend_rate=None,
+):
+    """
+    Builds a 7 x 24 rate matrix (Rs/kWh) indexed [day_of_week, hour].
+    Monday = 0, as in pandas dt.dayofweek. 'weekend_rate' (optional) flattens
+    Saturday and Sunday to a single rate.
+    """
+    rates = np.full((7, 24), float(off_peak_rate))
+    rates[:, peak_start:peak_end] = peak_rate
+    if weekend_rate is not None:
+        rates[5:, :] = weekend_rate
+    return rates
+
+
+def tou_cost(usage_kwh, hours, days_of_week, rate_matrix=None):
+    """
+    Prices hourly usage against a day/hour rate matrix in one vectorized pass.
+
+    - usage_kwh: (n_hours,) for one household or (n_households, n_hours) for a batch
+      that shares the same forecast calendar.
+    - hours / days_of_week: (n_hours,) calendar of the usage columns.
+
+    Peak hours are the matrix's own highest-priced cells (none if it is flat),
+    so the peak totals always follow the window the matrix was built with.
+    Returns a dict of totals (scalars for 1-D input, arrays for batches).
+    """
+    rate_matrix = build_tou_matrix() if rate_matrix is None else rate_matrix
+    usage = np.asarray(usage_kwh, dtype=float)
+    hours = np.asarray(hours, dtype=int)
+    days_of_week = np.asarray(days_of_week, dtype=int)
+
+    peak_cells = (rate_matrix == rate_matrix.max()) & (rate_matrix > rate_matrix.min())
+    hourly_rates = rate_matrix[days_of_week, hours]
+    is_peak = peak_cells[days_of_week, hours].astype(float)
+
+    # Matrix-vector products price every household at once
+    total_cost = usage @ hourly_rates
+    peak_kwh = usage @ is_peak
+    peak_cost = usage @ (hourly_rates * is_peak)
+    total_kwh = usage.sum(axis=-1)
+
+    return {
+        "total_cost": total_cost,
+        "total_kwh": total_kwh,
+        "peak_kwh": peak_kwh,
+        "off_peak_kwh": total_kwh - peak_kwh,
+        "peak_cost": peak_cost,
+        "off_peak_cost": total_cost - peak_cost,
+    }
+
+
+def price_forecast_tou(future_df, rate_matrix=None, usage_col="predicted_usage_kwh"):
+    """
+    TOU bill for a forecast frame (needs 'hour' and 'day_of_week' columns,
+    which the forecaster already adds).
+    """
+    return tou_cost(
+        future_df[usage_col].to_numpy(),
+        future_df["hour"].to_numpy(),
+        future_df["day_of_week"].to_numpy(),
+        rate_matrix,
+    )
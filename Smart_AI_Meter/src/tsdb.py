@@ -0,0 +1,408 @@
+# src/tsdb.py
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.meter_simulator import SENSOR_RECORD_DTYPE
+
+TSDB_DIR = os.path.join("data", "tsdb")
+WAL_CAPACITY = 1_000_000  # Records in the memory-mapped log (24 MB)
+FLUSH_RECORDS = 100_000  # The log is flushed to segments at this many records
+WAL_HEADER = 8  # int64 slots, see _log_count()
+WAL_MAGIC = 0x314C41575254454D  # "METRWAL1"
+PARTITION_NS = 86_400 * 10**9  # Segments never span more than one day
+
+# Rollups of power_kw, finest first: level name -> bucket width (ns)
+ROLLUP_LEVELS = {"1s": 10**9, "1min": 60 * 10**9, "1h": 3600 * 10**9}
+RAW_COLUMNS = SENSOR_RECORD_DTYPE.names
+ROLLUP_COLUMNS = ("bucket_ns", "meter_id", "sum", "count", "max")
+MAX_QUERY_POINTS = 2000  # Per meter; picks the finest rollup under this
+MAX_OPEN_COLUMNS = 256  # Memory-mapped segment columns kept open
+COMPACT_LEVELS = ("1min", "1h")  # 1s segments are about as large as raw ones
+COMPACT_AFTER = 8  # Segments per day partition before they are merged into one
+
+_INT64 = np.iinfo(np.int64)
+
+# Storage layout under the root folder:
+#   wal.bin                                  header + fixed-size record log
+#   <level>/<YYYY-MM-DD>/<seq>_<t0>_<t1>/    one immutable columnar segment,
+#                                            a .npy file per column, sorted by time
+# <level> is "raw" or a ROLLUP_LEVELS name; seq is the flush that wrote it.
+# A compacted segment ends in "_merged" and lists the segments it replaces
+# in merged_from.txt.
+
+
+# ---------------------------------------------
+# 1. OPEN / RECOVER
+# ---------------------------------------------
+def _open_wal(path, capacity):
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.truncate(WAL_HEADER * 8 + capacity * SENSOR_RECORD_DTYPE.itemsize)
+        header = np.memmap(path, dtype="<i8", mode="r+", shape=(WAL_HEADER,))
+        header[:4] = (WAL_MAGIC, 0, 0, 0)
+        header.flush()
+    header = np.memmap(path, dtype="<i8", mode="r+", shape=(WAL_HEADER,))
+    if header[0] != WAL_MAGIC:
+        raise ValueError(f"❌ {path} is not a time-series write-ahead log.")
+    size = (os.path.getsize(path) - WAL_HEADER * 8) // SENSOR_RECORD_DTYPE.itemsize
+    records = np.memmap(
+        path, dtype=SENSOR_RECORD_DTYPE, mode="r+", offset=WAL_HEADER * 8, shape=(size,)
+    )
+    return header, records
+
+
+def _load_catalog(root, next_seq):
+    """
+    Lists every segment per level. Leftovers of an interrupted flush (temp
+    folders, or segments of the flush still pending in the log) are removed,
+    as the log is flushed again in full; so are inputs of a finished merge.
+    """
+    catalog = {level: [] for level in ("raw", *ROLLUP_LEVELS)}
+    for level, segments in catalog.items():
+        level_dir = os.path.join(root, level)
+        os.makedirs(level_dir, exist_ok=True)
+        for day in sorted(os.listdir(level_dir)):
+            day_dir = os.path.join(level_dir, day)
+            names = sorted(os.listdir(day_dir))
+            replaced = set()
+            for name in names:
+                merged_from = os.path.join(day_dir, name, "merged_from.txt")
+                if not name.endswith(".tmp") and os.path.exists(merged_from):
+                    with open(merged_from, encoding="utf-8") as f:
+                        replaced.update(f.read().split())
+
+            for name in names:
+                path = os.path.join(day_dir, name)
+                if (
+                    name.endswith(".tmp")
+                    or name in replaced
+                    or int(name.split("_")[0]) >= next_seq
+                ):
+                    shutil.rmtree(path)
+                    continue
+                seq, t_min, t_max = map(int, name.split("_")[:3])
+                segments.append(
+                    {"seq": seq, "t_min": t_min, "t_max": t_max, "path": path}
+                )
+    return catalog
+
+
+def open_tsdb(root=TSDB_DIR, wal_capacity=WAL_CAPACITY):
+    """
+    Opens (or creates) a store. Readings still in the write-ahead log from a
+    previous run are kept and reach segments with the next flush.
+    """
+    os.makedirs(root, exist_ok=True)
+    header, records = _open_wal(os.path.join(root, "wal.bin"), wal_capacity)
+    return {
+        "root": root,
+        "header": header,
+        "wal": records,
+        "catalog": _load_catalog(root, int(header[2])),
+        "columns": OrderedDict(),  # (segment path, column) -> mmap'd array, LRU
+        "lock": threading.RLock(),  # One writer; queries see consistent state
+    }
+
+
+def close_tsdb(db):
+    with db["lock"]:
+        db["wal"].flush()
+        db["header"].flush()
+        db["columns"].clear()
+
+
+# ---------------------------------------------
+# 2. WRITE PATH
+# ---------------------------------------------
+def _log_count(db):
+    """
+    Readings in the log. Header slots: [0] magic, [1] count, [2] next flush
+    sequence, [3] sequence the logged readings belong to. A flush commits
+    with the single write of [2], so a log whose [3] lags behind was already
+    flushed and is empty, whatever [1] says.
+    """
+    header = db["header"]
+    if header[3] != header[2]:
+        header[1] = 0
+        header[3] = header[2]
+    return int(header[1])
+
+
+def append_records(db, records, sync=False):
+    """
+    Appends SENSOR_RECORD_DTYPE readings to the write-ahead log. Records are
+    written before the count that makes them visible, so a crash never exposes
+    half a batch. sync=True also forces them to disk before returning.
+    """
+    records = np.asarray(records, dtype=SENSOR_RECORD_DTYPE)
+    capacity = len(db["wal"])
+    with db["lock"]:
+        for start in range(0, len(records), capacity):
+            chunk = records[start : start + capacity]
+            if _log_count(db) + len(chunk) > capacity:
+                flush(db)
+            count = _log_count(db)
+            db["wal"][count : count + len(chunk)] = chunk
+            if sync:
+                db["wal"].flush()
+            db["header"][1] = count + len(chunk)
+            if sync:
+                db["header"].flush()
+        if _log_count(db) >= FLUSH_RECORDS:
+            flush(db)
+
+
+def _rollup(cols, width_ns):
+    """
+    Re-buckets rollup rows (or raw rows shaped like them) to width_ns and
+    merges rows of the same (bucket, meter). Sorted by bucket, then meter.
+    """
+    bucket = cols["bucket_ns"] // width_ns * width_ns
+    if len(bucket) == 0:
+        return {**cols, "bucket_ns": bucket}
+    order = np.lexsort((cols["meter_id"], bucket))
+    bucket, meter = bucket[order], cols["meter_id"][order]
+    new_group = (bucket[1:] != bucket[:-1]) | (meter[1:] != meter[:-1])
+    starts = np.flatnonzero(np.concatenate(([True], new_group)))
+    return {
+        "bucket_ns": bucket[starts],
+        "meter_id": meter[starts],
+        "sum": np.add.reduceat(cols["sum"][order], starts),
+        "count": np.add.reduceat(cols["count"][order], starts),
+        "max": np.maximum.reduceat(cols["max"][order], starts),
+    }
+
+
+def _as_rollup_rows(records):
+    power = records["power_kw"]
+    return {
+        "bucket_ns": records["timestamp_ns"],
+        "meter_id": records["meter_id"],
+        "sum": power.astype(np.float64),
+        "count": np.ones(len(records), dtype=np.int64),
+        "max": power,
+    }
+
+
+def _save_segment(db, level, path, seq, cols, merged_from=()):
+    """
+    Writes a temp folder of .npy columns and renames it into place, so a
+    segment is either complete or absent.
+    """
+    os.makedirs(path + ".tmp")
+    for name, values in cols.items():
+        np.save(os.path.join(path + ".tmp", name + ".npy"), values)
+    if merged_from:
+        with open(os.path.join(path + ".tmp", "merged_from.txt"), "w") as f:
+            f.write("\n".join(merged_from))
+    os.replace(path + ".tmp", path)
+
+    times = cols["timestamp_ns" if level == "raw" else "bucket_ns"]
+    db["catalog"][level].append(
+        {"seq": seq, "t_min": int(times[0]), "t_max": int(times[-1]), "path": path}
+    )
+
+
+def _write_segments(db, level, seq, cols):
+    """
+    Writes cols as one time-sorted segment per day partition. Returns the
+    day folders written to.
+    """
+    time_col = "timestamp_ns" if level == "raw" else "bucket_ns"
+    order = np.argsort(cols[time_col], kind="stable")
+    times = cols[time_col][order]
+    cuts = np.flatnonzero(np.diff(times // PARTITION_NS)) + 1
+    day_dirs = []
+    for part in np.split(np.arange(len(times)), cuts):
+        if len(part) == 0:
+            continue
+        t_min, t_max = int(times[part[0]]), int(times[part[-1]])
+        day = np.datetime64(t_min, "ns").astype("datetime64[D]")
+        day_dirs.append(os.path.join(db["root"], level, str(day)))
+        path = os.path.join(day_dirs[-1], f"{seq}_{t_min}_{t_max}")
+        rows = {name: values[order[part]] for name, values in cols.items()}
+        _save_segment(db, level, path, seq, rows)
+    return day_dirs
+
+
+def _compact(db, level, day_dir, seq):
+    """
+    Merges a day's rollup segments into one once there are more than
+    COMPACT_AFTER, so long-range queries open a few files, not one per flush.
+    """
+    segments = [
+        s for s in db["catalog"][level] if os.path.dirname(s["path"]) == day_dir
+    ]
+    if len(segments) <= COMPACT_AFTER:
+        return
+    parts = [{n: _column(db, s["path"], n) for n in ROLLUP_COLUMNS} for s in segments]
+    cols = {n: np.concatenate([p[n] for p in parts]) for n in ROLLUP_COLUMNS}
+    cols = _rollup(cols, ROLLUP_LEVELS[level])
+
+    t_min, t_max = int(cols["bucket_ns"][0]), int(cols["bucket_ns"][-1])
+    path = os.path.join(day_dir, f"{seq}_{t_min}_{t_max}_merged")
+    names = [os.path.basename(s["path"]) for s in segments]
+    _save_segment(db, level, path, seq, cols, merged_from=names)
+
+    for seg in segments:
+        for name in ROLLUP_COLUMNS:
+            db["columns"].pop((seg["path"], name), None)
+        db["catalog"][level].remove(seg)
+        shutil.rmtree(seg["path"])
+
+
+def flush(db):
+    """
+    Moves the write-ahead log into raw segments and 1s -> 1min -> 1h rollups
+    (each level built from the one below), then empties the log.
+    Returns the number of readings flushed.
+    """
+    with db["lock"]:
+        count, seq = _log_count(db), int(db["header"][2])
+        if count == 0:
+            return 0
+        records = np.array(db["wal"][:count])
+        _write_segments(db, "raw", seq, {c: records[c] for c in RAW_COLUMNS})
+        rows = _as_rollup_rows(records)
+        day_dirs = {}
+        for level, width_ns in ROLLUP_LEVELS.items():
+            rows = _rollup(rows, width_ns)
+            day_dirs[level] = _write_segments(db, level, seq, rows)
+
+        db["header"][2] = seq + 1  # Commit point
+        db["header"].flush()
+        _log_count(db)
+
+        # After the commit, so a merge never mixes in uncommitted segments
+        for level in COMPACT_LEVELS:
+            for day_dir in day_dirs[level]:
+                _compact(db, level, day_dir, seq)
+        return count
+
+
+# ---------------------------------------------
+# 3. READ PATH
+# ---------------------------------------------
+def _to_ns(value, default):
+    return default if value is None else pd.Timestamp(value).value
+
+
+def _column(db, path, name):
+    columns, key = db["columns"], (path, name)
+    if key in columns:
+        columns.move_to_end(key)
+        return columns[key]
+    columns[key] = np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+    while len(columns) > MAX_OPEN_COLUMNS:
+        columns.popitem(last=False)
+    return columns[key]
+
+
+def _dtypes(level):
+    if level == "raw":
+        return {n: SENSOR_RECORD_DTYPE[n] for n in RAW_COLUMNS}
+    return dict(zip(ROLLUP_COLUMNS, ("<i8", "<u4", "<f8", "<i8", "<f4")))
+
+
+def _scan(db, level, start_ns, end_ns, meter_id):
+    """
+    Rows of [start_ns, end_ns) from the level's segments plus the unflushed
+    log. Only overlapping segments are opened; each is binary-searched.
+    """
+    names = RAW_COLUMNS if level == "raw" else ROLLUP_COLUMNS
+    time_col = names[0]
+    parts = []
+    for seg in db["catalog"][level]:
+        if seg["t_max"] < start_ns or seg["t_min"] >= end_ns:
+            continue
+        times = _column(db, seg["path"], time_col)
+        lo, hi = np.searchsorted(times, (start_ns, end_ns))
+        if hi > lo:
+            parts.append({n: _column(db, seg["path"], n)[lo:hi] for n in names})
+
+    pending = db["wal"][: _log_count(db)]
+    pending_ns = pending["timestamp_ns"]
+    in_range = (pending_ns >= start_ns) & (pending_ns < end_ns)
+    if in_range.any():
+        recent = pending[in_range]
+        if level == "raw":
+            parts.append({n: recent[n] for n in names})
+        else:
+            parts.append(_rollup(_as_rollup_rows(recent), ROLLUP_LEVELS[level]))
+
+    if not parts:
+        return {n: np.empty(0, dtype) for n, dtype in _dtypes(level).items()}
+    cols = {n: np.concatenate([p[n] for p in parts]) for n in names}
+    if meter_id is not None:
+        keep = cols["meter_id"] == meter_id
+        cols = {n: v[keep] for n, v in cols.items()}
+    return cols
+
+
+def pick_level(start_ns, end_ns, max_points=MAX_QUERY_POINTS):
+    """
+    Finest rollup level that returns at most max_points buckets per meter.
+    """
+    for level, width_ns in ROLLUP_LEVELS.items():
+        if (end_ns - start_ns) / width_ns <= max_points:
+            return level
+    return level
+
+
+def query_range(db, start=None, end=None, meter_id=None, level=None):
+    """
+    Readings in [start, end). level=None picks a rollup with at most
+    MAX_QUERY_POINTS buckets per meter; "raw" returns the readings themselves.
+    Rollup rows carry mean_kw, max_kw, sum_kw and count per (bucket, meter),
+    for the buckets that start inside the range.
+    """
+    with db["lock"]:
+        start_ns = _to_ns(start, _INT64.min)
+        end_ns = _to_ns(end, _INT64.max)
+        if level is None:
+            # Span of the data actually stored: segments plus the unflushed log
+            known = [s for segs in db["catalog"].values() for s in segs]
+            t_min = [s["t_min"] for s in known]
+            t_max = [s["t_max"] for s in known]
+            pending = db["wal"][: _log_count(db)]["timestamp_ns"]
+            if len(pending):
+                t_min.append(int(pending.min()))
+                t_max.append(int(pending.max()))
+            first = min(t_min, default=0)
+            last = max(t_max, default=0)
+            level = pick_level(max(start_ns, first), min(end_ns, last + 1))
+        cols = _scan(db, level, start_ns, end_ns, meter_id)
+
+    if level == "raw":
+        order = np.argsort(cols["timestamp_ns"], kind="stable")
+        df = pd.DataFrame({n: cols[n][order] for n in RAW_COLUMNS})
+        df.insert(0, "timestamp", df.pop("timestamp_ns").astype("datetime64[ns]"))
+        return df
+
+    cols = _rollup(cols, ROLLUP_LEVELS[level])  # Merge rows split across flushes
+    return pd.DataFrame(
+        {
+            "timestamp": cols["bucket_ns"].astype("datetime64[ns]"),
+            "meter_id": cols["meter_id"],
+            "mean_kw": cols["sum"] / cols["count"],
+            "max_kw": cols["max"],
+            "sum_kw": cols["sum"],
+            "count": cols["count"],
+        }
+    )
+
+
+def hourly_usage(db, meter_id=0, start=None, end=None):
+    """
+    One meter's hourly energy from the 1h rollup, shaped for clean_data():
+    timestamp + usage_kwh (mean kW over the hour x 1 h).
+    """
+    hourly = query_range(db, start, end, meter_id=meter_id, level="1h")
+    return pd.DataFrame(
+        {"timestamp": hourly["timestamp"], "usage_kwh": hourly["mean_kw"]}
+    )
@@ -1,4 +1,3 @@
-import requests
 import pandas as pd
 from datetime import datetime
 
@@ -7,6 +6,8 @@ def get_karachi_weather_forecast():
     Fetches REAL-TIME Hourly Temperature for Karachi from Open-Meteo.
     FILTERS out past hours so the data starts exactly from the Current Hour.
     """
+    import requests  # Lazy: only needed when a forecast is requested
+
     print("☁️ Connecting to Weather Satellite (Open-Meteo)...")
     
     # Karachi Coordinates